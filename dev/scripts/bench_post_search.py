@@ -0,0 +1,92 @@
+"""Benchmark post search: per-row to_tsvector() versus the stored, GIN-indexed search_vector.
+
+Seeds a temporary copy of app.posts (same columns, generated column and
+indexes) inside a transaction that is rolled back, so the real tables are
+never touched.
+
+    PYTHONPATH=. python dev/scripts/bench_post_search.py --rows 100000 --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import psycopg
+
+from src.backend.app.core.config import get_settings
+
+OLD_VECTOR = "to_tsvector('simple', coalesce(p.title,'') || ' ' || coalesce(p.body_md,''))"
+NEW_VECTOR = "p.search_vector"
+
+PAGE_SQL = """
+  SELECT p.id, ts_rank_cd({vector}, plainto_tsquery('simple', %s)) AS search_rank
+  FROM bench_posts p
+  WHERE p.deleted_at IS NULL AND {vector} @@ plainto_tsquery('simple', %s)
+  ORDER BY search_rank DESC, p.created_at DESC, p.id DESC
+  LIMIT 20
+"""
+COUNT_SQL = """
+  SELECT COUNT(*) FROM bench_posts p
+  WHERE p.deleted_at IS NULL AND {vector} @@ plainto_tsquery('simple', %s)
+"""
+
+# Terms seeded at roughly 10%, 1% and 0.1% of posts.
+QUERIES = {"common (10%)": "topic3", "medium (1%)": "subject42", "rare (0.1%)": "needle417"}
+
+
+def seed(cur, rows: int) -> None:
+    cur.execute("CREATE TEMP TABLE bench_posts (LIKE app.posts INCLUDING ALL) ON COMMIT DROP")
+    cur.execute(
+        """
+        INSERT INTO bench_posts (title, body_md, created_at)
+        SELECT
+          'Post ' || i || ' topic' || (i % 10),
+          'subject' || (i % 100) || ' needle' || (i % 1000) || ' ' ||
+            (SELECT string_agg(substr(md5(i::text || '-' || g), 1, 3 + g % 6), ' ')
+             FROM generate_series(1, 80) g),
+          now() - (i || ' minutes')::interval
+        FROM generate_series(1, %s) i
+        """,
+        (rows,),
+    )
+    cur.execute("ANALYZE bench_posts")
+
+
+def time_query(cur, sql: str, params: tuple, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        cur.execute(sql, params)
+        cur.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Posts to seed (default 100000)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per query; the median is reported")
+    parser.add_argument("--dsn", default=None, help="Database URL (default: DATABASE_URL from settings)")
+    args = parser.parse_args()
+
+    dsn = args.dsn or get_settings().database_url
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            started = time.perf_counter()
+            seed(cur, args.rows)
+            print(f"Seeded {args.rows} posts in {time.perf_counter() - started:.1f}s\n")
+            print(f"{'query':<16} {'kind':<6} {'to_tsvector ms':>15} {'search_vector ms':>17} {'speed-up':>9}")
+            for label, term in QUERIES.items():
+                for kind, template, params in (
+                    ("page", PAGE_SQL, (term, term)),
+                    ("count", COUNT_SQL, (term,)),
+                ):
+                    old_ms = time_query(cur, template.format(vector=OLD_VECTOR), params, args.runs)
+                    new_ms = time_query(cur, template.format(vector=NEW_VECTOR), params, args.runs)
+                    print(f"{label:<16} {kind:<6} {old_ms:>15.1f} {new_ms:>17.1f} {old_ms / max(new_ms, 0.001):>8.1f}x")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
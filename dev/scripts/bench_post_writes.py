@@ -0,0 +1,145 @@
+"""Benchmark post creation: the former statement-per-step write path versus the single CTE.
+
+Creates a throw-away account (with a high daily limit) and inserts posts
+inside a transaction that is rolled back, so nothing is kept. Commit cost is
+left out; it is the same for both paths. Run it against a database across
+the network to see the round-trip saving, e.g.
+
+    PYTHONPATH=. python dev/scripts/bench_post_writes.py --posts 200 --locale de
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+
+import psycopg
+
+from src.backend.app.api.posts import CREATE_POST_SQL, LANGUAGE_TAG_NAMES
+from src.backend.app.api.tags import make_slug
+from src.backend.app.core.config import get_settings
+
+TAG_UPSERT_SQL = """
+  INSERT INTO app.tags (id, slug, label, domain, is_restricted, created_by_admin)
+  VALUES (gen_random_uuid(), %s, %s, %s, false, false)
+  ON CONFLICT (slug) DO NOTHING
+  RETURNING id
+"""
+
+
+def sequential_create(cur, account_id: str, default_max: int, title: str, body: str) -> int:
+    """The write path before the CTE; returns the number of statements sent."""
+    statements = 0
+
+    def run(sql: str, params: tuple):
+        nonlocal statements
+        statements += 1
+        cur.execute(sql, params)
+        return cur.fetchone() if cur.description else None
+
+    handle, locale = run("SELECT handle, locale FROM app.accounts WHERE id=%s", (account_id,))
+    locale = locale or "en"
+    max_posts, used = run(
+        """
+        SELECT COALESCE((SELECT max_posts_per_day FROM app.user_limits WHERE account_id = %s), %s),
+               COALESCE((SELECT posts_count FROM app.rate_limits
+                         WHERE account_id = %s AND day_utc = (now() at time zone 'UTC')::date), 0)
+        """,
+        (account_id, default_max, account_id),
+    )
+    if used >= max_posts:
+        raise RuntimeError("daily post limit reached; raise the bench account's limit")
+    (post_id,) = run(
+        """
+        INSERT INTO app.posts (id, author_id, title, body_md, lang, visibility)
+        VALUES (gen_random_uuid(), %s, %s, %s, 'en', 'logged_in')
+        RETURNING id
+        """,
+        (account_id, title, body),
+    )
+    tags = [(make_slug(handle), handle, "user_handle")]
+    if locale != "en":
+        tags.append((make_slug(locale), LANGUAGE_TAG_NAMES.get(locale, locale.upper()), "language"))
+    for slug, label, domain in tags:
+        row = run(TAG_UPSERT_SQL, (slug, label, domain))
+        if not row:
+            row = run("SELECT id FROM app.tags WHERE slug=%s", (slug,))
+        run("INSERT INTO app.post_tags (post_id, tag_id) VALUES (%s, %s) ON CONFLICT DO NOTHING", (post_id, row[0]))
+    run(
+        """
+        INSERT INTO app.rate_limits (account_id, day_utc, posts_count, replies_count)
+        VALUES (%s, (now() at time zone 'UTC')::date, 1, 0)
+        ON CONFLICT (account_id, day_utc)
+        DO UPDATE SET posts_count = app.rate_limits.posts_count + 1
+        """,
+        (account_id,),
+    )
+    return statements
+
+
+def cte_create(cur, account_id: str, default_max: int, title: str, body: str) -> int:
+    cur.execute(
+        CREATE_POST_SQL,
+        {
+            "account_id": account_id,
+            "default_max": default_max,
+            "title": title,
+            "body_md": body,
+            "lang": "en",
+            "visibility": "logged_in",
+            "language_names": json.dumps(LANGUAGE_TAG_NAMES),
+            "check_quota": True,
+        },
+    )
+    handle, post_id, _missing_slugs = cur.fetchone()
+    if handle is None or post_id is None:
+        raise RuntimeError("CTE refused the post")
+    return 1
+
+
+def time_path(cur, create, account_id: str, default_max: int, posts: int) -> tuple[float, float, int]:
+    timings = []
+    statements = 0
+    for i in range(posts):
+        started = time.perf_counter()
+        statements = create(cur, account_id, default_max, f"Bench post {i}", f"Body of bench post {i}")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1], statements
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200, help="Posts to create per path (default 200)")
+    parser.add_argument("--locale", default="de", help="Locale of the bench account; 'en' skips the language tag")
+    parser.add_argument("--dsn", default=None, help="Database URL (default: DATABASE_URL from settings)")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    dsn = args.dsn or settings.database_url
+    with psycopg.connect(dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO app.accounts (handle, display_name, email, locale)
+                VALUES ('bench-writer', 'Bench writer', 'bench-writer@example.invalid', %s)
+                RETURNING id::text
+                """,
+                (args.locale,),
+            )
+            (account_id,) = cur.fetchone()
+            cur.execute(
+                "INSERT INTO app.user_limits (account_id, max_posts_per_day) VALUES (%s, %s)",
+                (account_id, 10 * args.posts + 10),
+            )
+            print(f"{'path':<12} {'statements':>10} {'median ms':>10} {'p95 ms':>8}")
+            for label, create in (("sequential", sequential_create), ("cte", cte_create)):
+                median_ms, p95_ms, statements = time_path(
+                    cur, create, account_id, settings.default_max_posts_per_day, args.posts
+                )
+                print(f"{label:<12} {statements:>10} {median_ms:>10.2f} {p95_ms:>8.2f}")
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from src.backend.app.main import app
+from src.backend.app.core.db import POOL_KEY
+from src.backend.app.workers.content_import import run_import
+
+pytestmark = pytest.mark.asyncio
+
+
+def _write_ndjson(path, records):
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8")
+    return path
+
+
+def _import_files(tmp_path):
+    return {
+        "tags": _write_ndjson(tmp_path / "tags.ndjson", [{"slug": "history", "label": "History"}]),
+        "posts": _write_ndjson(tmp_path / "posts.ndjson", [
+            {"id": "p1", "author": "alice", "title": "Old thread", "body_md": "First post",
+             "created_at": "2020-05-01T10:00:00Z", "tags": ["history"]},
+            {"id": "p2", "author": "alice", "title": "Bad date", "body_md": "Skipped", "created_at": "not a date"},
+        ]),
+        # Children come before their parents; the last reply's parent is unknown.
+        "replies": _write_ndjson(tmp_path / "replies.ndjson", [
+            {"id": "r3", "post_id": "p1", "parent_id": "r2", "author": "alice", "body_md": "third"},
+            {"id": "r2", "post_id": "p1", "parent_id": "r1", "author": "bob", "body_md": "second"},
+            {"id": "r1", "post_id": "p1", "author": "bob", "body_md": "first"},
+            {"id": "r4", "post_id": "p1", "parent_id": "missing", "author": "bob", "body_md": "orphan"},
+        ]),
+        "votes": _write_ndjson(tmp_path / "votes.ndjson", [
+            {"voter": "bob", "target_type": "post", "target_id": "p1", "value": 1},
+            {"voter": "alice", "target_type": "reply", "target_id": "r1", "value": -1},
+        ]),
+    }
+
+
+async def _import(files, suspend_triggers):
+    pool = getattr(app.state, POOL_KEY)
+    async with pool.connection() as conn:
+        return await run_import(
+            conn, files, source="oldforum", create_accounts=True, suspend_triggers=suspend_triggers, dry_run=False
+        )
+
+
+@pytest.mark.parametrize("suspend_triggers", [False, True])
+async def test_import_resolves_reply_chains_and_recounts(tmp_path, suspend_triggers):
+    files = _import_files(tmp_path)
+    counts = await _import(files, suspend_triggers)
+    assert counts["accounts_created"] == 2
+    assert counts["posts_bad_timestamps"] == 1
+    assert counts["posts_inserted"] == 1
+    assert counts["replies_inserted"] == 3
+    assert counts["votes_inserted"] == 2
+
+    pool = getattr(app.state, POOL_KEY)
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT id, reply_count, score, tag_ids, created_at FROM app.posts WHERE title = 'Old thread'"
+            )
+            post_id, reply_count, score, tag_ids, created_at = await cur.fetchone()
+            assert reply_count == 3
+            assert score == 1
+            assert created_at.year == 2020
+            await cur.execute("SELECT id FROM app.tags WHERE slug IN ('history', 'alice') ORDER BY slug")
+            assert sorted(tag_ids) == sorted(row[0] for row in await cur.fetchall())
+            assert len(tag_ids) == 2
+
+            await cur.execute("SELECT count(*) FROM app.posts WHERE title = 'Bad date'")
+            assert (await cur.fetchone())[0] == 0
+
+            await cur.execute(
+                """
+                SELECT r.body_md, p.body_md FROM app.replies r
+                LEFT JOIN app.replies p ON p.id = r.parent_id
+                WHERE r.post_id = %s ORDER BY r.body_md
+                """,
+                (post_id,),
+            )
+            assert await cur.fetchall() == [("first", None), ("second", "first"), ("third", "second")]
+            await cur.execute("SELECT score FROM app.replies WHERE body_md = 'first'")
+            assert (await cur.fetchone())[0] == -1
+
+
+@pytest.mark.parametrize("suspend_triggers", [False, True])
+async def test_import_rerun_is_idempotent(tmp_path, suspend_triggers):
+    files = _import_files(tmp_path)
+    await _import(files, suspend_triggers)
+    counts = await _import(files, suspend_triggers)
+    assert counts["accounts_created"] == 0
+    assert counts["posts_inserted"] == 0
+    assert counts["post_tags_inserted"] == 0
+    assert counts["replies_inserted"] == 0
+    assert counts["votes_inserted"] == 0
+
+    pool = getattr(app.state, POOL_KEY)
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT count(*), sum(reply_count) FROM app.posts")
+            assert await cur.fetchone() == (1, 3)
+            await cur.execute("SELECT count(*) FROM app.replies")
+            assert (await cur.fetchone())[0] == 3
+            await cur.execute("SELECT count(*) FROM app.votes")
+            assert (await cur.fetchone())[0] == 2
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.backend.app.services.llm_backends import Backend, BackendPool, parse_backends
+
+
+class _StandIn:
+    """Tiny local LLM stand-in whose health endpoint status can be flipped."""
+
+    def __init__(self):
+        self.status = 200
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                self.send_response(stand_in.status)
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_ins():
+    servers = [_StandIn(), _StandIn()]
+    yield servers
+    for server in servers:
+        server.close()
+
+
+def test_parse_backends_accepts_urls_and_weights():
+    backends = parse_backends('["http://a:11434/", {"url": "http://b:11434", "weight": 3}]', "http://default")
+    assert [(b.url, b.weight) for b in backends] == [("http://a:11434", 1.0), ("http://b:11434", 3.0)]
+    assert [b.url for b in parse_backends("", "http://default/")] == ["http://default"]
+    with pytest.raises(ValueError):
+        parse_backends('[{"url": "http://a", "weight": 0}]')
+
+
+@pytest.mark.asyncio
+async def test_weighted_least_outstanding_selection():
+    pool = BackendPool([Backend(url="http://a"), Backend(url="http://b", weight=2)])
+    picked = []
+
+    async def hold():
+        async with pool.acquire() as backend:
+            picked.append(backend.url)
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(hold() for _ in range(3)))
+    # b has twice the weight, so it takes two of three concurrent requests.
+    assert sorted(picked) == ["http://a", "http://b", "http://b"]
+    assert all(b.outstanding == 0 for b in pool.backends)
+    assert sum(s["requests"] for s in pool.stats()) == 3
+
+
+@pytest.mark.asyncio
+async def test_health_check_ejects_and_restores_backend(stand_ins):
+    healthy, flaky = stand_ins
+    pool = BackendPool([Backend(url=healthy.url), Backend(url=flaky.url)])
+
+    flaky.status = 503
+    for _ in range(3):
+        await pool.check()
+    stats = {s["url"]: s for s in pool.stats()}
+    assert stats[healthy.url]["healthy"] is True
+    assert stats[flaky.url]["healthy"] is False
+    assert all(pool.pick().url == healthy.url for _ in range(5))
+
+    flaky.status = 200
+    await pool.check()
+    assert all(b.healthy for b in pool.backends)
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_take_backend_out_of_rotation():
+    pool = BackendPool([Backend(url="http://a"), Backend(url="http://b")])
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            async with pool.acquire_backend(pool.backends[0]):
+                raise RuntimeError("connection refused")
+    assert pool.backends[0].healthy is False
+    assert pool.pick().url == "http://b"
+    assert pool.attempts() == 1
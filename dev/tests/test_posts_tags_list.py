@@ -129,3 +129,150 @@ async def test_posts_include_tags_and_filtering():
         items = page.get("items", []) if isinstance(page, dict) else page
         assert any(p["id"] == post1 for p in items)
         assert not any(p["id"] == post2 for p in items)
+
+
+async def _collect_pages(client, query: str) -> list[str]:
+    seen: list[str] = []
+    cursor = None
+    for _ in range(10):
+        url = f"/posts?limit=2&{query}" + (f"&cursor={cursor}" if cursor else "")
+        r = await client.get(url)
+        assert r.status_code == 200, r.text
+        page = r.json()
+        seen.extend(p["id"] for p in page["items"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            break
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_posts_keyset_cursor_pages_every_sort():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.post("/auth/register", json={
+            "handle": "pageuser",
+            "email": "pageuser@intxtonic.net",
+            "password": "PageUser123"
+        })
+        assert r.status_code == 200, r.text
+        r = await client.post("/auth/login", json={
+            "handle_or_email": "pageuser",
+            "password": "PageUser123"
+        })
+        assert r.status_code == 200
+        token = r.json()["access_token"]
+
+        created: list[str] = []
+        for idx in range(5):
+            r = await client.post(
+                "/posts",
+                headers=auth_headers(client, token),
+                json={
+                    "title": f"Paged {idx}",
+                    "body_md": f"keyset pagination body {idx}",
+                    "lang": "en",
+                    "visibility": "logged_in",
+                },
+            )
+            assert r.status_code == 200, r.text
+            created.append(r.json()["id"])
+
+        newest = await _collect_pages(client, "sort=newest")
+        assert newest == list(reversed(created))
+
+        # All scores tie at 0, so the cursor has to fall back to created_at and id.
+        top = await _collect_pages(client, "sort=top")
+        assert sorted(top) == sorted(created)
+        assert len(top) == len(set(top))
+
+        # Equal scores: hot_rank follows created_at.
+        hot = await _collect_pages(client, "sort=hot")
+        assert hot == list(reversed(created))
+        assert sorted(await _collect_pages(client, "sort=top&window=day")) == sorted(created)
+
+        searched = await _collect_pages(client, "sort=newest&q=pagination")
+        assert sorted(searched) == sorted(created)
+        assert len(searched) == len(set(searched))
+
+        # A cursor issued for another sort is ignored rather than misapplied.
+        r = await client.get("/posts?limit=2&sort=newest")
+        cursor = r.json()["next_cursor"]
+        r = await client.get(f"/posts?limit=2&sort=top&cursor={cursor}")
+        assert r.status_code == 200
+        assert len(r.json()["items"]) == 2
+
+        # Totals are optional; next_cursor comes from the LIMIT+1 probe either way.
+        r = await client.get("/posts?limit=2&include_total=false")
+        assert r.status_code == 200
+        page = r.json()
+        assert page["total"] is None
+        assert page["next_cursor"]
+        r = await client.get("/posts?limit=2&total_mode=exact")
+        assert r.json()["total"] == 5
+        r = await client.get("/posts?limit=10&total_mode=estimated")
+        page = r.json()
+        assert page["total"] == 5 and page["total_estimated"] is False
+        assert page["next_cursor"] is None
+        # An offset past the end still reports the real total.
+        r = await client.get("/posts?limit=10&offset=100&total_mode=exact")
+        page = r.json()
+        assert page["items"] == []
+        assert page["total"] == 5
+
+        # Compact items carry the stored excerpt instead of the body.
+        r = await client.get("/posts?limit=1&view=compact")
+        item = r.json()["items"][0]
+        assert "body_md" not in item
+        assert item["excerpt"] == "keyset pagination body 4"
+        r = await client.get("/posts?limit=1&fields=title,score")
+        assert set(r.json()["items"][0]) == {"id", "title", "score"}
+        r = await client.get("/posts?fields=nope")
+        assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_restricted_tag_hides_post_until_unrestricted():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        tokens = {}
+        for handle, password in (("visadmin", "VisAdmin123"), ("visreader", "VisReader123")):
+            r = await client.post("/auth/register", json={
+                "handle": handle,
+                "email": f"{handle}@intxtonic.net",
+                "password": password
+            })
+            assert r.status_code == 200, r.text
+            if handle == "visadmin":
+                await promote_to_admin(handle)
+            r = await client.post("/auth/login", json={"handle_or_email": handle, "password": password})
+            assert r.status_code == 200
+            tokens[handle] = r.json()["access_token"]
+        admin = auth_headers(client, tokens["visadmin"])
+
+        # Admin-created tags start restricted.
+        r = await client.post("/tags", headers=admin, json={"label": "Internal"})
+        assert r.status_code in (200, 201), r.text
+        tag = r.json()
+        r = await client.post(
+            "/posts",
+            headers=admin,
+            json={"title": "Internal news", "body_md": "only for staff", "lang": "en", "visibility": "logged_in"},
+        )
+        assert r.status_code == 200, r.text
+        post_id = r.json()["id"]
+        r = await client.post(f"/posts/{post_id}/tags", headers=admin, json={"slug": tag["slug"]})
+        assert r.status_code == 200, r.text
+
+        async def reader_feed_ids() -> list[str]:
+            r = await client.get("/posts?limit=50", headers={"Authorization": f"Bearer {tokens['visreader']}"})
+            assert r.status_code == 200, r.text
+            return [p["id"] for p in r.json()["items"]]
+
+        # The post_tags trigger filled posts.restricted_tag_ids, hiding the post.
+        assert post_id not in await reader_feed_ids()
+
+        # Unrestricting the tag refreshes every post carrying it.
+        r = await client.post(f"/tags/{tag['id']}/unrestrict", headers=admin)
+        assert r.status_code == 200, r.text
+        assert post_id in await reader_feed_ids()
@@ -0,0 +1,89 @@
+import pytest
+
+from src.backend.app.main import app
+from src.backend.app.core.db import POOL_KEY
+from src.backend.app.workers.retention_maintenance import run_pass
+
+pytestmark = pytest.mark.asyncio
+
+OLD = "now() - interval '60 days'"
+RECENT = "now() - interval '1 day'"
+
+
+async def _insert_reply(cur, post_id, author_id, body, parent_id=None, deleted_at="NULL"):
+    await cur.execute(
+        f"""
+        INSERT INTO app.replies (post_id, author_id, parent_id, body_md, deleted_at)
+        VALUES (%s, %s, %s, %s, {deleted_at}) RETURNING id
+        """,
+        (post_id, author_id, parent_id, body),
+    )
+    return (await cur.fetchone())[0]
+
+
+async def test_purge_pass_removes_leaf_replies_first_with_dependents():
+    pool = getattr(app.state, POOL_KEY)
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "INSERT INTO app.accounts (handle, display_name) VALUES ('purger', 'purger') RETURNING id"
+            )
+            account_id = (await cur.fetchone())[0]
+            await cur.execute(
+                "INSERT INTO app.posts (author_id, title, body_md) VALUES (%s, 'Live', 'live') RETURNING id",
+                (account_id,),
+            )
+            live_post = (await cur.fetchone())[0]
+            await cur.execute(
+                f"INSERT INTO app.posts (author_id, title, body_md, deleted_at) VALUES (%s, 'Gone', 'gone', {OLD}) RETURNING id",
+                (account_id,),
+            )
+            gone_post = (await cur.fetchone())[0]
+
+            # old_parent -> old_child: both expired, the child goes first.
+            old_parent = await _insert_reply(cur, live_post, account_id, "old parent", deleted_at=OLD)
+            old_child = await _insert_reply(cur, live_post, account_id, "old child", old_parent, deleted_at=OLD)
+            # An expired reply with a live child must stay, or the child would cascade.
+            kept_parent = await _insert_reply(cur, live_post, account_id, "kept parent", deleted_at=OLD)
+            live_child = await _insert_reply(cur, live_post, account_id, "live child", kept_parent)
+            await _insert_reply(cur, live_post, account_id, "recent", deleted_at=RECENT)
+            gone_post_reply = await _insert_reply(cur, gone_post, account_id, "on gone post")
+
+            for target_type, target_id in (
+                ("reply", old_child),
+                ("post", gone_post),
+                ("reply", gone_post_reply),
+                ("reply", live_child),
+            ):
+                await cur.execute(
+                    "INSERT INTO app.votes (account_id, target_type, target_id, value) VALUES (%s, %s, %s, 1)",
+                    (account_id, target_type, target_id),
+                )
+                await cur.execute(
+                    "INSERT INTO app.bookmarks (account_id, target_type, target_id) VALUES (%s, %s, %s)",
+                    (account_id, target_type, target_id),
+                )
+        await conn.commit()
+
+    await run_pass(
+        pool,
+        None,
+        months_ahead=1,
+        retention_months=0,
+        drop_expired=False,
+        purge_after_days=30,
+        batch_size=1,
+    )
+
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT id FROM app.posts")
+            assert [row[0] for row in await cur.fetchall()] == [live_post]
+            await cur.execute("SELECT body_md FROM app.replies ORDER BY body_md")
+            assert [row[0] for row in await cur.fetchall()] == ["kept parent", "live child", "recent"]
+            await cur.execute("SELECT reply_count FROM app.posts WHERE id = %s", (live_post,))
+            assert (await cur.fetchone())[0] == 3
+            await cur.execute("SELECT target_type, target_id FROM app.votes")
+            assert await cur.fetchall() == [("reply", live_child)]
+            await cur.execute("SELECT target_type, target_id FROM app.bookmarks")
+            assert await cur.fetchall() == [("reply", live_child)]
@@ -86,6 +86,12 @@ async def test_tags_admin_and_replies_flow():
         assert matching, rows
         assert matching[0]["is_restricted"] is False
 
+        # Trigram similarity tolerates a typo and ranks the closest tag first
+        r = await client.get("/tags?query=anouncements")
+        assert r.status_code == 200
+        rows = r.json()
+        assert rows and rows[0]["id"] == tag["id"], rows
+
         # Ban/unban
         r = await client.post(
             f"/tags/{tag['id']}/ban",
@@ -126,6 +132,14 @@ async def test_tags_admin_and_replies_flow():
         assert r.status_code == 200, r.text
         post_id = r.json()["id"]
 
+        # Landing list: new post listed, strong ETag revalidates to 304
+        r = await client.get("/posts/public/latest")
+        assert r.status_code == 200, r.text
+        assert r.json()[0]["id"] == post_id
+        assert r.headers["cache-control"].startswith("public")
+        r = await client.get("/posts/public/latest", headers={"If-None-Match": r.headers["etag"]})
+        assert r.status_code == 304
+
         # Create a reply
         r = await client.post(
             "/posts/reply",
@@ -145,6 +159,43 @@ async def test_tags_admin_and_replies_flow():
         replies = r.json()
         assert any(x["id"] == reply_id for x in replies)
 
+        # Aggregated post page: post, replies and own vote in one response
+        r = await client.get(f"/posts/{post_id}/full", headers=auth_headers(client, bob_token))
+        assert r.status_code == 200, r.text
+        page = r.json()
+        assert page["post"]["id"] == post_id
+        assert any(x["id"] == reply_id for x in page["replies"])
+        assert page["my_vote"] == {"voted": False, "value": None}
+        assert page["bookmark"] is None
+        # One pipelined batch plus its commit
+        assert int(r.headers["x-db-round-trips"]) <= 3
+        etag = r.headers["etag"]
+        r = await client.get(
+            f"/posts/{post_id}/full",
+            headers={**auth_headers(client, bob_token), "If-None-Match": etag},
+        )
+        assert r.status_code == 304
+
+        # Nested reply shows up in tree mode; depth=1 collapses it into a count
+        r = await client.post(
+            "/posts/reply",
+            headers=auth_headers(client, bob_token),
+            json={"post_id": post_id, "parent_id": reply_id, "body_md": "Nested", "lang": "en"},
+        )
+        assert r.status_code == 200, r.text
+        child_id = r.json()["id"]
+        r = await client.get(f"/posts/{post_id}/replies/tree")
+        assert r.status_code == 200, r.text
+        root = next(x for x in r.json()["items"] if x["id"] == reply_id)
+        assert [x["id"] for x in root["children"]] == [child_id]
+        assert root["more_replies"] == 0
+        r = await client.get(f"/posts/{post_id}/replies/tree", params={"depth": 1})
+        root = next(x for x in r.json()["items"] if x["id"] == reply_id)
+        assert root["children"] == [] and root["more_replies"] == 1
+        r = await client.get(f"/posts/{post_id}/replies/{reply_id}/children")
+        assert r.status_code == 200, r.text
+        assert [x["id"] for x in r.json()["items"]] == [child_id]
+
         # Vote reply
         r = await client.post(
             "/posts/vote",
@@ -157,6 +208,23 @@ async def test_tags_admin_and_replies_flow():
         )
         assert r.status_code == 200
 
+        # The vote trigger adds exactly the vote's value; a second vote is rejected
+        r = await client.get(f"/posts/{post_id}/replies")
+        assert next(x for x in r.json() if x["id"] == reply_id)["score"] == 1
+        r = await client.get(
+            "/posts/my-votes",
+            headers=auth_headers(client, bob_token),
+            params={"ids": f"{reply_id},{child_id}", "target_type": "reply"},
+        )
+        assert r.status_code == 200, r.text
+        assert r.json()["items"] == [{"target_id": reply_id, "value": 1}]
+        r = await client.post(
+            "/posts/vote",
+            headers=auth_headers(client, bob_token),
+            json={"target_type": "reply", "target_id": reply_id, "value": -1},
+        )
+        assert r.status_code == 409
+
 
 @pytest.mark.asyncio
 async def test_language_tags_visible_to_guests():
@@ -136,3 +136,36 @@ async def test_change_password_missing_hash():
         # Existing password no longer works because hash is missing
         login = await _login(client, handle, password)
         assert login.status_code == 401
+
+
+async def test_delete_account_removes_posts_from_feed():
+    client = await _get_client()
+    async with client:
+        _, author_token, _ = await _register_user(client, "Author123!")
+        _, reader_token, _ = await _register_user(client, "Reader123!")
+        author_headers = {
+            "Authorization": f"Bearer {author_token}",
+            "X-CSRF-Token": client.cookies.get("csrf_token", ""),
+        }
+        reader_headers = {"Authorization": f"Bearer {reader_token}"}
+
+        response = await client.post(
+            "/posts",
+            headers=author_headers,
+            json={"title": "Soon gone", "body_md": "Deleted with the account", "lang": "en", "visibility": "logged_in"},
+        )
+        assert response.status_code == 200, response.text
+        post_id = response.json()["id"]
+
+        response = await client.get("/posts", headers=reader_headers, params={"limit": 50})
+        assert response.status_code == 200, response.text
+        assert any(item["id"] == post_id for item in response.json()["items"])
+
+        response = await client.delete("/users/me", headers=author_headers)
+        assert response.status_code == 204, response.text
+
+        response = await client.get("/posts", headers=reader_headers, params={"limit": 50})
+        assert response.status_code == 200, response.text
+        assert all(item["id"] != post_id for item in response.json()["items"])
+        response = await client.get("/posts/public/latest", params={"limit": 10})
+        assert all(item["id"] != post_id for item in response.json())
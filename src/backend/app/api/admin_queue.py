@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from ..core.cache import get_redis
 from ..core.deps import require_admin_or_moderator
+from ..services.feed_cache import get_feed_cache_metrics
+from ..services.translation_metrics import get_metrics
 from ..services.translation_queue import list_queue_jobs
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -18,3 +20,25 @@ async def get_translation_queue(
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis unavailable")
     jobs = await list_queue_jobs(redis, limit=limit)
     return {"jobs": jobs}
+
+
+@router.get("/queue/metrics")
+async def get_translation_worker_metrics(
+    request: Request,
+    _: None = Depends(require_admin_or_moderator),
+):
+    redis = get_redis(request)
+    if redis is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis unavailable")
+    return {"metrics": await get_metrics(redis)}
+
+
+@router.get("/feed-cache/metrics")
+async def get_feed_cache_stats(
+    request: Request,
+    _: None = Depends(require_admin_or_moderator),
+):
+    redis = get_redis(request)
+    if redis is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis unavailable")
+    return {"metrics": await get_feed_cache_metrics(redis)}
@@ -1,5 +1,10 @@
+import asyncio
+import json
+from typing import AsyncGenerator
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from starlette.responses import StreamingResponse
 
 from ..core.db import get_pool
 from ..core.deps import get_current_account_id
@@ -12,7 +17,7 @@ from ..schemas.ai import (
 from ..services.translation_cache import fetch_translation
 from ..services.ai_service import split_text_into_chunks
 from ..core.cache import get_redis
-from ..services.translation_queue import JOB_HASH_PREFIX, enqueue_translation_job
+from ..services.translation_queue import JOB_HASH_PREFIX, enqueue_translation_job, job_events_channel
 
 ai_route = APIRouter(prefix='/api', tags=['ai'])
 
@@ -52,6 +57,50 @@ async def get_job_status(job_id: str, request: Request):
     return data
 
 
+_FINAL_JOB_STATUSES = {'completed', 'failed'}
+
+
+async def _job_event_stream(redis, job_id: str, request: Request) -> AsyncGenerator[bytes, None]:
+    pubsub = redis.pubsub()
+    # Subscribe before reading the hash so no delta between the two is lost.
+    await pubsub.subscribe(job_events_channel(job_id))
+    try:
+        snapshot = await redis.hgetall(f"{JOB_HASH_PREFIX}{job_id}")
+        yield f"data: {json.dumps({'type': 'snapshot', **snapshot}, ensure_ascii=False)}\n\n".encode("utf-8")
+        if snapshot.get('status') in _FINAL_JOB_STATUSES:
+            return
+        while not await request.is_disconnected():
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+            if message is None:
+                yield b":keepalive\n\n"
+                continue
+            yield f"data: {message['data']}\n\n".encode("utf-8")
+            try:
+                event = json.loads(message['data'])
+            except (TypeError, ValueError):
+                continue
+            if event.get('type') == 'status' and event.get('status') in _FINAL_JOB_STATUSES:
+                return
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+
+
+@ai_route.get('/jobs/{job_id}/events')
+async def stream_job_events(job_id: str, request: Request):
+    """Server-Sent Events for one job: a ``snapshot`` of the job hash, then
+    ``delta`` events with streamed text and ``status`` events until it finishes.
+    """
+    redis = get_redis(request)
+    if redis is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='Job tracking unavailable')
+    if not await redis.exists(f"{JOB_HASH_PREFIX}{job_id}"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Job not found')
+    return StreamingResponse(_job_event_stream(redis, job_id, request), media_type="text/event-stream")
+
+
 @ai_route.post('/posts/{post_id}/translate', response_model=TranslationResponse)
 async def translate_post(
     post_id: str,
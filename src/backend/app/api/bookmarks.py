@@ -364,6 +364,7 @@ async def lookup_bookmarks(
                 GROUP BY b.id
                 """,
                 (account_id, target_type_norm, uuid_strings),
+                prepare=True,
             )
             rows = await cur.fetchall()
     items = [
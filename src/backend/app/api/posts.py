@@ -1,15 +1,40 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import uuid
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
 
-from ..core.db import get_pool
+from ..core.db import fetch_pipelined, get_pool
 from ..core.config import get_settings
 from ..core.deps import get_current_account_id, require_role, require_admin, is_admin_account
-from ..core.tag_access import build_access_clause, fetch_accessible_tag_sets, tag_visibility_available
+from ..core.cache import get_redis
+from ..core.tag_access import (
+    access_fingerprint,
+    build_access_clause,
+    fetch_accessible_restricted_tag_ids,
+    fetch_accessible_tag_sets,
+    tag_visibility_available,
+)
 from ..core.notify import publish
+from ..core.pagination import POST_SORT_KEYS, REPLY_TREE_KEY, TOP_WINDOWS, decode_cursor, encode_cursor, keyset_condition, parse_legacy_cursor
+from ..services.feed_cache import (
+    bump_feed_generation,
+    feed_cache_key,
+    feed_generation,
+    public_latest_cache_key,
+    read_feed_page,
+    read_public_latest,
+    store_feed_page,
+    store_public_latest,
+)
+from ..services.post_counts import posts_count_cache_key, resolve_posts_total
+from ..services.rate_limits import consume_daily_quota, release_daily_quota
+from ..services.vote_buffer import buffer_vote, pending_vote_value, pending_vote_values
 from .auth import csrf_validate
 import logging
 logger = logging.getLogger(__name__)
@@ -41,12 +66,36 @@ class PostOut(BaseModel):
     highlight: Optional[str] = None
 
 
+class PostListItemOut(BaseModel):
+    """Feed item; every field but ``id`` may be left out of a response."""
+    id: str
+    title: Optional[str] = None
+    body_md: Optional[str] = None
+    lang: Optional[str] = None
+    visibility: Optional[str] = None
+    score: Optional[int] = None
+    reply_count: Optional[int] = None
+    created_at: Optional[str] = None
+    author_id: Optional[str] = None
+    author: Optional[str] = None
+    tags: Optional[List[PostTagOut]] = None
+    highlight: Optional[str] = None
+    excerpt: Optional[str] = None
+
+
+# view=full keeps the historical item shape; view=compact swaps the body for
+# the stored excerpt. fields= picks any subset of PostListItemOut (id always).
+FULL_POST_FIELDS = frozenset(PostListItemOut.model_fields) - {"excerpt"}
+COMPACT_POST_FIELDS = frozenset(PostListItemOut.model_fields) - {"body_md"}
+
+
 class PostsPage(BaseModel):
-    items: List[PostOut]
+    items: List[PostListItemOut]
     limit: int
     offset: int
     sort: str
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = False
     next_cursor: Optional[str] = None
 
 
@@ -66,14 +115,21 @@ class PostCreateIn(BaseModel):
     visibility: str = "logged_in"
 
 
-@router.get("", response_model=PostsPage)
+@router.get("", response_model=PostsPage, response_model_exclude_unset=True)
 async def list_posts(
+    request: Request,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     cursor: Optional[str] = Query(None),
     sort: str = Query("newest"),
+    window: Optional[str] = Query(None, pattern="^(day|week|month)$"),
     tag: Optional[List[str]] = Query(None),
     q: Optional[str] = Query(None),
+    fuzzy: bool = Query(False),
+    view: str = Query("full", pattern="^(full|compact)$"),
+    fields: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    total_mode: str = Query("cached", pattern="^(exact|cached|estimated)$"),
     account_id: str = Depends(get_current_account_id),
     pool = Depends(get_pool),
 ):
@@ -90,20 +146,17 @@ async def list_posts(
     #     },
     # )
     
-    # Validate/normalize cursor if provided; be lenient and ignore invalid
-    if cursor:
-        try:
-            # Normalize 'Z' to '+00:00' then parse
-            c = cursor.strip()
-            if c.endswith('Z'):
-                c = c[:-1] + '+00:00'
-            cursor_dt = datetime.fromisoformat(c)
-            # Use ISO string with offset preserved
-            cursor = cursor_dt.isoformat()
-        except Exception as e:
-            logger.warning(f"Cursor parsing failed, ignoring cursor: value='{cursor}', err={e}")
-            cursor = None
-    
+    redis = get_redis(request)
+
+    if fields:
+        feed_fields = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(feed_fields - set(PostListItemOut.model_fields))
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+        feed_fields = frozenset(feed_fields | {"id"})
+    else:
+        feed_fields = COMPACT_POST_FIELDS if view == "compact" else FULL_POST_FIELDS
+
     # Validate tags if provided and check existence
     search_query: Optional[str] = None
     if q:
@@ -111,20 +164,38 @@ async def list_posts(
         if sq:
             search_query = sq
 
-    search_vector = "to_tsvector('simple', coalesce(p.title,'') || ' ' || coalesce(p.body_md,''))"
+    # Stored, weighted and GIN-indexed (see db/patches/20261019_search_vectors.sql)
+    search_vector = "p.search_vector"
     highlight_select = "NULL::text AS highlight"
     rank_select = "0::float AS search_rank"
     search_condition = ""
     count_search_condition = ""
+    # Bodies are only read when returned or needed for the search highlight.
+    body_select = "p.body_md"
+    if "body_md" not in feed_fields and not search_query:
+        body_select = "NULL::text AS body_md"
     if search_query:
         highlight_select = (
             "ts_headline('simple', p.body_md, plainto_tsquery('simple', %s), "
             "'MaxFragments=1, ShortWord=0, MaxWords=35, MinWords=10, FragmentDelimiter=…') AS highlight"
         )
-        rank_select = f"ts_rank_cd({search_vector}, plainto_tsquery('simple', %s)) AS search_rank"
-        search_condition = f" AND {search_vector} @@ plainto_tsquery('simple', %s)"
-        count_search_condition = f" AND {search_vector} @@ plainto_tsquery('simple', %s)"
-        cursor = None  # disable cursor pagination when searching
+        if fuzzy:
+            # Typo-tolerant title match via pg_trgm word similarity (GIN trigram index).
+            rank_expr = "word_similarity(%s, p.title)"
+            match_condition = " AND %s <%% p.title"
+        else:
+            rank_expr = f"ts_rank_cd({search_vector}, plainto_tsquery('simple', %s))"
+            match_condition = f" AND {search_vector} @@ plainto_tsquery('simple', %s)"
+        rank_select = f"{rank_expr} AS search_rank"
+        search_condition = match_condition
+        count_search_condition = match_condition
+    # top&window=... only considers recent posts; the interval is a fixed literal.
+    if sort == "top" and window:
+        window_condition = f" AND p.created_at >= now() - interval '{TOP_WINDOWS[window]}'"
+        search_condition += window_condition
+        count_search_condition += window_condition
+    else:
+        window = None
 
     tag_alias = "t"
     tag_list: Optional[list[str]] = None
@@ -159,32 +230,82 @@ async def list_posts(
         if inaccessible:
             raise HTTPException(status_code=403, detail=f"Tag access forbidden: {', '.join(inaccessible)}")
 
-    order_clause = "p.created_at DESC"
-    if sort == "top":
-        order_clause = "p.score DESC, p.created_at DESC"
+    # Keyset pagination: the cursor carries the full sort key of the last row,
+    # so any page is read straight off the matching index instead of OFFSET.
+    cursor_kind = sort if sort in POST_SORT_KEYS else "newest"
+    sort_key = POST_SORT_KEYS[cursor_kind]
+    order_clause = ", ".join(f"{expr} DESC" for expr, _ in sort_key)
     if search_query:
+        sort_key = ((rank_expr, "real"),) + sort_key
         order_clause = f"search_rank DESC, {order_clause}"
+        cursor_kind = f"{'fuzzy' if fuzzy else 'search'}:{cursor_kind}"
 
     params: list[object] = []
     cursor_condition = ""
+    cursor_params: list[object] = []
     if cursor and not offset:
-        cursor_condition = " AND p.created_at < %s::timestamptz"
+        cursor_values = decode_cursor(cursor, cursor_kind, len(sort_key))
+        if cursor_values is not None:
+            cursor_condition = keyset_condition(sort_key)
+            cursor_params = ([search_query] if search_query else []) + cursor_values
+        elif cursor_kind == "newest" and (legacy := parse_legacy_cursor(cursor)):
+            cursor_condition = " AND p.created_at < %s::timestamptz"
+            cursor_params = [legacy]
+        else:
+            logger.warning(f"Cursor parsing failed, ignoring cursor: value='{cursor}', sort='{cursor_kind}'")
 
+    # None means the viewer may see every tag.
+    accessible_restricted: Optional[List[str]] = None
     if is_admin or not visibility_enabled:
         access_clause_tag, access_params_tag = "TRUE", []
         access_clause_any, access_params_any = "TRUE", []
     else:
         access_clause_tag, access_params_tag = build_access_clause(tag_alias, account_id)
-        access_clause_any, access_params_any = build_access_clause("t2", account_id)
+        accessible_restricted = await fetch_accessible_restricted_tag_ids(pool, account_id)
+        # posts.restricted_tag_ids is maintained by triggers; unrestricted posts
+        # match the first branch via posts_public_newest_idx.
+        if accessible_restricted:
+            access_clause_any = "(p.restricted_tag_ids = '{}' OR p.restricted_tag_ids <@ %s::uuid[])"
+            access_params_any = [accessible_restricted]
+        else:
+            access_clause_any, access_params_any = "p.restricted_tag_ids = '{}'", []
+
+    # First pages of shared feeds are cached per access fingerprint; writes
+    # bump the feed generation instead of deleting keys (services/feed_cache.py).
+    feed_key: Optional[str] = None
+    if redis is not None and not cursor and not offset and not has_bookmarked_filter:
+        try:
+            generation = await feed_generation(redis)
+        except Exception:  # pylint: disable=broad-except
+            generation = None
+        if generation is not None:
+            feed_key = feed_cache_key(
+                generation,
+                {
+                    "sort": sort,
+                    "window": window,
+                    "limit": limit,
+                    "tags": sorted(tag_list or []),
+                    "q": search_query,
+                    "fuzzy": bool(fuzzy and search_query),
+                    "total": total_mode if include_total else None,
+                    "fields": sorted(feed_fields),
+                },
+                access_fingerprint(accessible_restricted),
+            )
+            cached_page = await read_feed_page(redis, feed_key)
+            if cached_page is not None:
+                return cached_page
 
     try:
         if has_bookmarked_filter and not tag_list:
             sql = f"""
-              SELECT p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count,
+              SELECT p.id, p.title, {body_select}, p.lang, p.visibility, p.score, p.reply_count,
                      p.created_at, a.handle AS author,
                      '[]'::jsonb AS tags,
                      {highlight_select},
-                     {rank_select}
+                     {rank_select},
+                     p.hot_rank, p.excerpt, p.author_id
               FROM app.bookmarks b
               JOIN app.posts p ON p.id = b.target_id
               LEFT JOIN app.accounts a ON a.id = p.author_id
@@ -201,15 +322,15 @@ async def list_posts(
             params.append(account_id)       # for b.account_id = %s
             if search_query:
                 params.append(search_query)  # for search_condition
-            if cursor and not offset:
-                params.append(cursor)
+            if cursor_condition:
+                params.extend(cursor_params)
                 offset_to_use = 0
             else:
                 offset_to_use = offset
-            params.extend([limit, offset_to_use])
+            params.extend([limit + 1, offset_to_use])
 
-            count_sql = f"""
-              SELECT COUNT(*)
+            count_inner_sql = f"""
+              SELECT p.id
               FROM app.bookmarks b
               JOIN app.posts p ON p.id = b.target_id
               WHERE b.account_id = %s AND b.target_type = 'post' AND p.deleted_at IS NULL
@@ -219,140 +340,128 @@ async def list_posts(
             if search_query:
                 count_params.append(search_query)
 
-        elif tag_list:
+        else:
+            if tag_list:
+                # Resolve slugs once; posts must carry every tag, which the GIN
+                # index on the trigger-maintained posts.tag_ids answers directly.
+                async with pool.connection() as conn:
+                    async with conn.cursor() as cur:
+                        await cur.execute(
+                            f"SELECT t.id::text FROM app.tags t WHERE t.slug = ANY(%s::text[]) AND {access_clause_tag}",
+                            (list(tag_list), *access_params_tag),
+                        )
+                        tag_ids = [row[0] for row in await cur.fetchall()]
+                if len(tag_ids) < len(tag_list):
+                    feed_condition, feed_params = "AND FALSE", []
+                else:
+                    feed_condition, feed_params = "AND p.tag_ids @> %s::uuid[]", [tag_ids]
+            else:
+                feed_condition, feed_params = f"AND {access_clause_any}", list(access_params_any)
+
+            # Only restricted tags the viewer may see are listed on each post.
+            if accessible_restricted is None:
+                tag_json_access, tag_json_params = "TRUE", []
+            else:
+                tag_json_access = "(NOT t.is_restricted OR t.id = ANY(%s::uuid[]))"
+                tag_json_params = [accessible_restricted]
+
+            # The page is chosen from app.posts alone; author, tag JSON and the
+            # search highlight are computed for the final page rows only.
             sql = f"""
+              WITH page AS (
+                SELECT p.id, p.title, {body_select}, p.lang, p.visibility, p.score, p.reply_count,
+                       p.created_at, p.author_id, p.hot_rank, p.excerpt,
+                       {rank_select}
+                FROM app.posts p
+                WHERE p.deleted_at IS NULL
+                {feed_condition}
+                {search_condition}
+                {cursor_condition}
+                ORDER BY {order_clause}
+                LIMIT %s OFFSET %s
+              )
               SELECT p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count,
                      p.created_at, a.handle AS author,
-                     COALESCE(
-                       json_agg(DISTINCT jsonb_build_object('id', t.id, 'slug', t.slug, 'label', t.label, 'domain', t.domain))
-                       FILTER (WHERE t.id IS NOT NULL), '[]') AS tags,
+                     COALESCE(tag_json.tags, '[]') AS tags,
                      {highlight_select},
-                     {rank_select}
-              FROM app.posts p
+                     p.search_rank,
+                     p.hot_rank, p.excerpt, p.author_id
+              FROM page p
               LEFT JOIN app.accounts a ON a.id = p.author_id
-              JOIN app.post_tags pt ON pt.post_id = p.id
-              JOIN app.tags t ON t.id = pt.tag_id
-              WHERE p.deleted_at IS NULL AND t.slug = ANY(%s::text[])
-              {search_condition}
-              AND {access_clause_tag}
-              {cursor_condition}
-              GROUP BY p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count, p.created_at, a.handle
-              HAVING COUNT(DISTINCT t.slug) = %s
+              LEFT JOIN LATERAL (
+                SELECT json_agg(
+                         json_build_object('id', t.id, 'slug', t.slug, 'label', t.label, 'domain', t.domain)
+                         ORDER BY t.slug
+                       ) AS tags
+                FROM app.post_tags pt
+                JOIN app.tags t ON t.id = pt.tag_id
+                WHERE pt.post_id = p.id AND {tag_json_access}
+              ) tag_json ON TRUE
               ORDER BY {order_clause}
-              LIMIT %s OFFSET %s
             """
 
             if search_query:
-                params.append(search_query)  # for highlight_select
                 params.append(search_query)  # for rank_select
-            params.append(list(tag_list))
+            params.extend(feed_params)
             if search_query:
-                params.append(search_query)
-            params.extend(access_params_tag)
-            if cursor and not offset:
-                params.append(cursor)
+                params.append(search_query)  # for search_condition
+            if cursor_condition:
+                params.extend(cursor_params)
                 offset_to_use = 0
             else:
                 offset_to_use = offset
-            params.append(len(tag_list))
-            params.extend([limit, offset_to_use])
-
-            count_sql = f"""
-              SELECT COUNT(*) FROM (
-                SELECT p.id
-                FROM app.posts p
-                JOIN app.post_tags pt ON pt.post_id = p.id
-                JOIN app.tags t ON t.id = pt.tag_id
-                WHERE p.deleted_at IS NULL AND t.slug = ANY(%s::text[])
-                {count_search_condition}
-                AND {access_clause_tag}
-                GROUP BY p.id
-                HAVING COUNT(DISTINCT t.slug) = %s
-              ) x
-            """
-            count_params = [list(tag_list)]
+            params.extend([limit + 1, offset_to_use])
             if search_query:
-                count_params.append(search_query)
-            count_params.extend(access_params_tag)
-            count_params.append(len(tag_list))
-        else:
-            sql = f"""
-              SELECT p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count,
-                     p.created_at, a.handle AS author,
-                     COALESCE(
-                       json_agg(DISTINCT jsonb_build_object('id', t.id, 'slug', t.slug, 'label', t.label, 'domain', t.domain))
-                       FILTER (WHERE t.id IS NOT NULL), '[]') AS tags,
-                     {highlight_select},
-                     {rank_select}
+                params.append(search_query)  # for highlight_select
+            params.extend(tag_json_params)
+
+            count_inner_sql = f"""
+              SELECT p.id
               FROM app.posts p
-              LEFT JOIN app.accounts a ON a.id = p.author_id
-              LEFT JOIN app.post_tags pt ON pt.post_id = p.id
-              LEFT JOIN app.tags t ON t.id = pt.tag_id
               WHERE p.deleted_at IS NULL
-              {search_condition}
-              AND (
-                NOT EXISTS (
-                  SELECT 1 FROM app.post_tags pt2
-                  JOIN app.tags t2 ON t2.id = pt2.tag_id
-                  WHERE pt2.post_id = p.id AND NOT ({access_clause_any})
-                )
-              )
-              {cursor_condition}
-              GROUP BY p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count, p.created_at, a.handle
-              ORDER BY {order_clause}
-              LIMIT %s OFFSET %s
-            """
-
-            if search_query:
-                params.extend([search_query, search_query])
-                params.append(search_query)
-                params.extend(access_params_any)
-                if cursor and not offset:
-                    params.append(cursor)
-                    offset_to_use = 0
-                else:
-                    offset_to_use = offset
-                params.extend([limit, offset_to_use])
-            else:
-                params.extend(access_params_any)
-                if cursor and not offset:
-                    params.append(cursor)
-                    offset_to_use = 0
-                else:
-                    offset_to_use = offset
-                params.extend([limit, offset_to_use])
-
-            count_sql = f"""
-              SELECT COUNT(*) FROM (
-                SELECT p.id
-                FROM app.posts p
-                WHERE p.deleted_at IS NULL
-                {count_search_condition}
-                AND (
-                  NOT EXISTS (
-                    SELECT 1 FROM app.post_tags pt2
-                    JOIN app.tags t2 ON t2.id = pt2.tag_id
-                    WHERE pt2.post_id = p.id AND NOT ({access_clause_any})
-                  )
-                )
-                GROUP BY p.id
-              ) x
+              {feed_condition}
+              {count_search_condition}
             """
-            count_params = []
+            count_params = list(feed_params)
             if search_query:
                 count_params.append(search_query)
-            count_params.extend(access_params_any)
 
         async with pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute(count_sql, tuple(count_params))
-                    total = (await cur.fetchone())[0]
                     await cur.execute(sql, tuple(params))
                     rows = await cur.fetchall()
                 except Exception as db_err:
                     logger.error(f"Database error in list_posts: query={sql}, params={params}, error={str(db_err)}")
                     raise HTTPException(status_code=500, detail="Database query failed: check server logs")
+        # The extra probe row tells whether another page exists without counting.
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        total: Optional[int] = None
+        total_estimated = False
+        if include_total:
+            # An empty page past the end says nothing about where the results end.
+            if not has_more and not cursor_condition and (rows or offset == 0):
+                total = offset + len(rows)
+            else:
+                count_key: Optional[str] = None
+                if total_mode == "cached" and redis is not None:
+                    fingerprint = access_fingerprint(accessible_restricted)
+                    count_key = posts_count_cache_key(
+                        tags=tag_list,
+                        bookmarked_by=account_id if has_bookmarked_filter else None,
+                        query=f"fuzzy:{search_query}" if fuzzy and search_query else search_query,
+                        fingerprint=fingerprint,
+                        window=window,
+                    )
+                try:
+                    total, total_estimated = await resolve_posts_total(
+                        pool, redis, count_inner_sql, tuple(count_params), mode=total_mode, cache_key=count_key
+                    )
+                except Exception as db_err:
+                    logger.error(f"Count query failed in list_posts: error={str(db_err)}")
+                    raise HTTPException(status_code=500, detail="Database query failed: check server logs")
         items = [
             {
                 "id": str(r[0]),
@@ -366,16 +475,35 @@ async def list_posts(
                 "author": r[8],
                 "tags": r[9] or [],
                 "highlight": r[10] if r[10] else None,
+                "excerpt": r[13],
+                "author_id": str(r[14]) if r[14] is not None else None,
             }
             for r in rows
         ]
+        items = [{key: value for key, value in item.items() if key in feed_fields} for item in items]
         next_cursor = None
-        if search_query:
-            next_cursor = None
-        elif len(items) == limit and total > (offset + limit):
-            # created_at in items is already an ISO string
-            next_cursor = items[-1]["created_at"] if items else None
-        return {"items": items, "limit": limit, "offset": offset, "sort": sort, "total": total, "next_cursor": next_cursor}
+        if has_more:
+            last = rows[-1]
+            key_values: list[object] = [last[7], str(last[0])]
+            if cursor_kind.endswith("top"):
+                key_values.insert(0, last[5])
+            elif cursor_kind.endswith("hot"):
+                key_values.insert(0, last[12])
+            if search_query:
+                key_values.insert(0, last[11])
+            next_cursor = encode_cursor(cursor_kind, key_values)
+        page = {
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "sort": sort,
+            "total": total,
+            "total_estimated": total_estimated,
+            "next_cursor": next_cursor,
+        }
+        if feed_key:
+            await store_feed_page(redis, feed_key, page)
+        return page
     except HTTPException as he:
         raise he  # Re-raise HTTP exceptions for FastAPI to handle
     except Exception as e:
@@ -383,37 +511,62 @@ async def list_posts(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+# Browsers and proxies may reuse the landing list this long before revalidating.
+PUBLIC_LATEST_MAX_AGE_SECONDS = 30
+
+PUBLIC_LATEST_SQL = """
+  SELECT p.id, p.title, p.excerpt, p.created_at, a.handle, p.lang
+  FROM app.posts p
+  LEFT JOIN app.accounts a ON a.id = p.author_id
+  WHERE p.deleted_at IS NULL AND p.visibility IN ('logged_in', 'public')
+  ORDER BY p.created_at DESC
+  LIMIT %s
+"""
+
+
+def _etag_response(request: Request, body: str, headers: dict[str, str]) -> Response:
+    """Send a JSON body with a strong ETag (sha1 of the body); 304 when If-None-Match has it."""
+    etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+    headers = {"ETag": etag, **headers}
+    if etag in {tag.strip() for tag in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/public/latest", response_model=list[PostPreviewOut])
-async def list_public_latest_posts(limit: int = Query(5, ge=1, le=10), pool = Depends(get_pool)):
-    sql = """
-      SELECT p.id, p.title, p.body_md, p.created_at, a.handle, p.lang
-      FROM app.posts p
-      LEFT JOIN app.accounts a ON a.id = p.author_id
-      WHERE p.deleted_at IS NULL AND p.visibility IN ('logged_in', 'public')
-      ORDER BY p.created_at DESC
-      LIMIT %s
+async def list_public_latest_posts(request: Request, limit: int = Query(5, ge=1, le=10), pool = Depends(get_pool)):
+    """Newest public posts for the anonymous landing page.
+
+    The serialized body is cached in Redis until a post is created or deleted,
+    so repeat views and 304 revalidations do not touch the database.
     """
+    headers = {"Cache-Control": f"public, max-age={PUBLIC_LATEST_MAX_AGE_SECONDS}, must-revalidate"}
+    redis = get_redis(request)
+    cache_key = await public_latest_cache_key(redis, limit) if redis else None
+    if cache_key:
+        cached = await read_public_latest(redis, cache_key)
+        if cached is not None:
+            return _etag_response(request, cached, headers)
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
-            await cur.execute(sql, (limit,))
+            await cur.execute(PUBLIC_LATEST_SQL, (limit,), prepare=True)
             rows = await cur.fetchall()
     previews: list[PostPreviewOut] = []
     for row in rows:
-        body_raw = row[2] or ""
-        excerpt = " ".join(body_raw.split())
-        if len(excerpt) > 180:
-            excerpt = excerpt[:180].rstrip() + "…"
         previews.append(
             PostPreviewOut(
                 id=str(row[0]),
                 title=row[1] or "Untitled",
-                excerpt=excerpt,
+                excerpt=row[2] or "",
                 created_at=row[3].isoformat() if row[3] else None,
                 author=row[4],
                 lang=row[5],
             )
         )
-    return previews
+    body = json.dumps(jsonable_encoder(previews), separators=(",", ":"), ensure_ascii=False)
+    if cache_key:
+        await store_public_latest(redis, cache_key, body)
+    return _etag_response(request, body, headers)
 
 
 class IdOut(BaseModel):
@@ -424,8 +577,92 @@ class OkOut(BaseModel):
     ok: bool = True
 
 
+# Label of the language auto-tag per locale; other locales use the upper-cased code.
+LANGUAGE_TAG_NAMES = {
+    'de': 'German', 'fr': 'French', 'es': 'Spanish', 'it': 'Italian',
+    'pt': 'Portuguese', 'nl': 'Dutch', 'pl': 'Polish', 'ru': 'Russian',
+    'ja': 'Japanese', 'ko': 'Korean', 'zh': 'Chinese', 'ar': 'Arabic',
+    'hi': 'Hindi', 'tr': 'Turkish', 'sv': 'Swedish', 'no': 'Norwegian',
+    'da': 'Danish', 'fi': 'Finnish', 'cs': 'Czech', 'sk': 'Slovak',
+    'hu': 'Hungarian', 'ro': 'Romanian', 'bg': 'Bulgarian', 'hr': 'Croatian',
+    'sr': 'Serbian', 'sl': 'Slovenian', 'et': 'Estonian', 'lv': 'Latvian',
+    'lt': 'Lithuanian', 'el': 'Greek', 'he': 'Hebrew', 'th': 'Thai',
+    'vi': 'Vietnamese', 'uk': 'Ukrainian', 'be': 'Belarusian'
+}
+_LANGUAGE_TAG_NAMES_JSON = json.dumps(LANGUAGE_TAG_NAMES)
+
+# The whole create_post write path as one statement: quota check, post insert,
+# handle/language auto-tags (created when missing), post_tags and the daily
+# counter. Nothing is written unless the account exists and is under its
+# limit; the last SELECT tells the two refusals apart. With check_quota false
+# the quota was already taken in Redis and app.rate_limits is left alone.
+# A slug inserted by a concurrent transaction after this statement's snapshot
+# is neither created nor visible here; such slugs come back in the third
+# column and are attached by ATTACH_MISSING_TAGS_SQL.
+CREATE_POST_SQL = """
+  WITH acct AS (
+    SELECT a.id, a.handle::text AS handle, COALESCE(NULLIF(a.locale, ''), 'en') AS locale
+    FROM app.accounts a
+    WHERE a.id = %(account_id)s::uuid
+  ), quota AS (
+    SELECT COALESCE((SELECT ul.max_posts_per_day FROM app.user_limits ul WHERE ul.account_id = %(account_id)s::uuid),
+                    %(default_max)s) AS max_posts,
+           COALESCE((SELECT rl.posts_count FROM app.rate_limits rl
+                     WHERE rl.account_id = %(account_id)s::uuid AND rl.day_utc = (now() at time zone 'UTC')::date), 0) AS used
+  ), new_post AS (
+    INSERT INTO app.posts (id, author_id, title, body_md, lang, visibility)
+    SELECT gen_random_uuid(), acct.id, %(title)s, %(body_md)s, %(lang)s, %(visibility)s
+    FROM acct, quota
+    WHERE NOT %(check_quota)s OR quota.used < quota.max_posts
+    RETURNING id
+  ), wanted_tags AS (
+    SELECT DISTINCT ON (slug) slug, label, domain
+    FROM (
+      SELECT app.make_slug(acct.handle) AS slug, acct.handle AS label, 'user_handle' AS domain, 0 AS priority
+      FROM acct
+      UNION ALL
+      SELECT app.make_slug(acct.locale), COALESCE(%(language_names)s::jsonb ->> acct.locale, upper(acct.locale)),
+             'language', 1
+      FROM acct
+      WHERE acct.locale <> 'en'
+    ) candidates
+    WHERE slug <> '' AND EXISTS (SELECT 1 FROM new_post)
+    ORDER BY slug, priority
+  ), created_tags AS (
+    INSERT INTO app.tags (id, slug, label, domain, is_restricted, created_by_admin)
+    SELECT gen_random_uuid(), slug, label, domain, false, false FROM wanted_tags
+    ON CONFLICT (slug) DO NOTHING
+    RETURNING id, slug::text AS slug
+  ), auto_tags AS (
+    SELECT id, slug FROM created_tags
+    UNION
+    SELECT t.id, w.slug FROM app.tags t JOIN wanted_tags w ON w.slug = t.slug
+  ), tagged AS (
+    INSERT INTO app.post_tags (post_id, tag_id)
+    SELECT new_post.id, auto_tags.id FROM new_post, auto_tags
+    ON CONFLICT DO NOTHING
+  ), counted AS (
+    INSERT INTO app.rate_limits (account_id, day_utc, posts_count, replies_count)
+    SELECT %(account_id)s::uuid, (now() at time zone 'UTC')::date, 1, 0 FROM new_post
+    WHERE %(check_quota)s
+    ON CONFLICT (account_id, day_utc)
+    DO UPDATE SET posts_count = app.rate_limits.posts_count + 1
+  )
+  SELECT (SELECT handle FROM acct), (SELECT id FROM new_post),
+         ARRAY(SELECT w.slug FROM wanted_tags w WHERE NOT EXISTS (SELECT 1 FROM auto_tags a WHERE a.slug = w.slug))
+"""
+
+# Second statement, new snapshot: sees tags committed while CREATE_POST_SQL
+# waited on their slug.
+ATTACH_MISSING_TAGS_SQL = """
+  INSERT INTO app.post_tags (post_id, tag_id)
+  SELECT %s, t.id FROM app.tags t WHERE t.slug = ANY(%s::citext[])
+  ON CONFLICT DO NOTHING
+"""
+
+
 @router.post("", response_model=IdOut)
-async def create_post(body: PostCreateIn, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool), csrf: bool = Depends(csrf_validate)):
+async def create_post(request: Request, body: PostCreateIn, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool), csrf: bool = Depends(csrf_validate)):
     title = (body.title or "").strip()
     text = (body.body_md or "").strip()
     if not title or not text:
@@ -435,131 +672,39 @@ async def create_post(body: PostCreateIn, account_id: str = Depends(get_current_
     if body.visibility not in ("logged_in", "private", "unlisted"):
         raise HTTPException(status_code=422, detail="invalid visibility")
 
-    async with pool.connection() as conn:
-        async with conn.cursor() as cur:
-            # Get user info for auto-tagging and notification
-            await cur.execute(
-                "SELECT handle, locale FROM app.accounts WHERE id=%s",
-                (account_id,)
-            )
-            user_row = await cur.fetchone()
-            if not user_row:
-                raise HTTPException(status_code=404, detail="User not found")
-            author_handle, user_locale = user_row[0], user_row[1] or "en"
-            
-            # Rate limit check (posts/day)
-            settings = get_settings()
-            await cur.execute(
-                """
-                WITH lim AS (
-                  SELECT COALESCE(ul.max_posts_per_day, %s) AS max_posts,
-                         COALESCE(ul.max_replies_per_day, %s) AS max_replies
-                  FROM app.user_limits ul
-                  WHERE ul.account_id = %s
-                ), c AS (
-                  SELECT posts_count, replies_count
-                  FROM app.rate_limits
-                  WHERE account_id = %s AND day_utc = (now() at time zone 'UTC')::date
-                )
-                SELECT COALESCE((SELECT max_posts FROM lim), %s) AS max_posts,
-                       COALESCE((SELECT posts_count FROM c), 0) AS posts_count
-                """,
-                (
-                    settings.default_max_posts_per_day,
-                    settings.default_max_replies_per_day,
-                    account_id,
-                    account_id,
-                    settings.default_max_posts_per_day,
-                ),
-            )
-            row = await cur.fetchone()
-            max_posts, posts_count = row[0], row[1]
-            if posts_count >= max_posts:
-                raise HTTPException(status_code=429, detail="Daily post limit reached")
-            await cur.execute(
-                """
-                INSERT INTO app.posts (id, author_id, title, body_md, lang, visibility)
-                VALUES (gen_random_uuid(), %s, %s, %s, %s, %s)
-                RETURNING id
-                """,
-                (account_id, title, text, body.lang if body.lang else "en", body.visibility),
-            )
-            new_id = (await cur.fetchone())[0]
-            
-            # Auto-tag: user handle tag
-            handle_slug = make_slug(author_handle)
-            if handle_slug:
-                await cur.execute(
-                    """
-                    INSERT INTO app.tags (id, slug, label, domain, is_restricted, created_by_admin)
-                    VALUES (gen_random_uuid(), %s, %s, 'user_handle', false, false)
-                    ON CONFLICT (slug) DO NOTHING
-                    RETURNING id
-                    """,
-                    (handle_slug, author_handle),
-                )
-                tag_row = await cur.fetchone()
-                if tag_row:
-                    handle_tag_id = tag_row[0]
-                else:
-                    await cur.execute("SELECT id FROM app.tags WHERE slug=%s", (handle_slug,))
-                    handle_tag_id = (await cur.fetchone())[0]
-                
+    redis = get_redis(request)
+    default_max = get_settings().default_max_posts_per_day
+    quota = await consume_daily_quota(redis, pool, account_id, "posts", default_max)
+    if quota is False:
+        raise HTTPException(status_code=429, detail="Daily post limit reached")
+    author_handle = new_id = None
+    try:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
                 await cur.execute(
-                    "INSERT INTO app.post_tags (post_id, tag_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                    (new_id, handle_tag_id),
+                    CREATE_POST_SQL,
+                    {
+                        "account_id": account_id,
+                        "default_max": default_max,
+                        "check_quota": quota is None,
+                        "title": title,
+                        "body_md": text,
+                        "lang": body.lang if body.lang else "en",
+                        "visibility": body.visibility,
+                        "language_names": _LANGUAGE_TAG_NAMES_JSON,
+                    },
                 )
-            
-            # Auto-tag: user default language tag
-            if user_locale and user_locale != "en":
-                lang_slug = make_slug(user_locale)
-                if lang_slug:
-                    lang_name = user_locale.upper()
-                    # Map common language codes to names
-                    lang_names = {
-                        'de': 'German', 'fr': 'French', 'es': 'Spanish', 'it': 'Italian',
-                        'pt': 'Portuguese', 'nl': 'Dutch', 'pl': 'Polish', 'ru': 'Russian',
-                        'ja': 'Japanese', 'ko': 'Korean', 'zh': 'Chinese', 'ar': 'Arabic',
-                        'hi': 'Hindi', 'tr': 'Turkish', 'sv': 'Swedish', 'no': 'Norwegian',
-                        'da': 'Danish', 'fi': 'Finnish', 'cs': 'Czech', 'sk': 'Slovak',
-                        'hu': 'Hungarian', 'ro': 'Romanian', 'bg': 'Bulgarian', 'hr': 'Croatian',
-                        'sr': 'Serbian', 'sl': 'Slovenian', 'et': 'Estonian', 'lv': 'Latvian',
-                        'lt': 'Lithuanian', 'el': 'Greek', 'he': 'Hebrew', 'th': 'Thai',
-                        'vi': 'Vietnamese', 'uk': 'Ukrainian', 'be': 'Belarusian'
-                    }
-                    lang_name = lang_names.get(user_locale, lang_name)
-                    
-                    await cur.execute(
-                        """
-                        INSERT INTO app.tags (id, slug, label, domain, is_restricted, created_by_admin)
-                        VALUES (gen_random_uuid(), %s, %s, 'language', false, false)
-                        ON CONFLICT (slug) DO NOTHING
-                        RETURNING id
-                        """,
-                        (lang_slug, lang_name),
-                    )
-                    tag_row = await cur.fetchone()
-                    if tag_row:
-                        lang_tag_id = tag_row[0]
-                    else:
-                        await cur.execute("SELECT id FROM app.tags WHERE slug=%s", (lang_slug,))
-                        lang_tag_id = (await cur.fetchone())[0]
-                    
-                    await cur.execute(
-                        "INSERT INTO app.post_tags (post_id, tag_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                        (new_id, lang_tag_id),
-                    )
-            
-            # Bump posts_count
-            await cur.execute(
-                """
-                INSERT INTO app.rate_limits (account_id, day_utc, posts_count, replies_count)
-                VALUES (%s, (now() at time zone 'UTC')::date, 1, 0)
-                ON CONFLICT (account_id, day_utc)
-                DO UPDATE SET posts_count = app.rate_limits.posts_count + 1
-                """,
-                (account_id,),
-            )
+                author_handle, new_id, missing_slugs = await cur.fetchone()
+                if new_id is not None and missing_slugs:
+                    await cur.execute(ATTACH_MISSING_TAGS_SQL, (new_id, missing_slugs))
+    finally:
+        if quota and new_id is None:
+            await release_daily_quota(redis, account_id, "posts")
+    if author_handle is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if new_id is None:
+        raise HTTPException(status_code=429, detail="Daily post limit reached")
+    await bump_feed_generation(redis, "post_created")
     # Fire-and-forget notification (no await needed here but we keep async)
     try:
         await publish({
@@ -574,7 +719,7 @@ async def create_post(body: PostCreateIn, account_id: str = Depends(get_current_
 
 
 @router.delete("/{post_id}", response_model=OkOut)
-async def delete_post(post_id: str, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
+async def delete_post(request: Request, post_id: str, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
@@ -595,6 +740,7 @@ async def delete_post(post_id: str, account_id: str = Depends(get_current_accoun
                 "DELETE FROM app.translations WHERE source_type = 'post' AND source_id = %s",
                 (post_id,),
             )
+    await bump_feed_generation(get_redis(request), "post_deleted")
     return OkOut()
 
 
@@ -641,8 +787,35 @@ class ReplyOut(BaseModel):
     created_at: Optional[str] = None
 
 
+# Quota check, reply insert and the daily counter in one statement; no row
+# comes back when the account is at its reply limit. check_quota as in
+# CREATE_POST_SQL.
+CREATE_REPLY_SQL = """
+  WITH quota AS (
+    SELECT COALESCE((SELECT ul.max_replies_per_day FROM app.user_limits ul WHERE ul.account_id = %(account_id)s::uuid),
+                    %(default_max)s) AS max_replies,
+           COALESCE((SELECT rl.replies_count FROM app.rate_limits rl
+                     WHERE rl.account_id = %(account_id)s::uuid AND rl.day_utc = (now() at time zone 'UTC')::date), 0) AS used
+  ), new_reply AS (
+    INSERT INTO app.replies (id, post_id, parent_id, author_id, body_md, lang)
+    SELECT gen_random_uuid(), %(post_id)s::uuid, %(parent_id)s::uuid, %(account_id)s::uuid, %(body_md)s, %(lang)s
+    FROM quota
+    WHERE NOT %(check_quota)s OR quota.used < quota.max_replies
+    RETURNING id
+  ), counted AS (
+    INSERT INTO app.rate_limits (account_id, day_utc, posts_count, replies_count)
+    SELECT %(account_id)s::uuid, (now() at time zone 'UTC')::date, 0, 1 FROM new_reply
+    WHERE %(check_quota)s
+    ON CONFLICT (account_id, day_utc)
+    DO UPDATE SET replies_count = app.rate_limits.replies_count + 1
+  )
+  SELECT (SELECT id FROM new_reply)
+"""
+
+
 @router.post("/reply", response_model=ReplyOut)
 async def create_reply(
+    request: Request,
     body: ReplyCreateIn,
     account_id: str = Depends(get_current_account_id),
     pool = Depends(get_pool),
@@ -652,56 +825,35 @@ async def create_reply(
     if not text:
         raise HTTPException(status_code=400, detail="body_md required")
 
-    async with pool.connection() as conn:
-        async with conn.cursor() as cur:
-            settings = get_settings()
-            await cur.execute(
-                """
-                WITH lim AS (
-                  SELECT COALESCE(ul.max_posts_per_day, %s) AS max_posts,
-                         COALESCE(ul.max_replies_per_day, %s) AS max_replies
-                  FROM app.user_limits ul
-                  WHERE ul.account_id = %s
-                ), c AS (
-                  SELECT posts_count, replies_count
-                  FROM app.rate_limits
-                  WHERE account_id = %s AND day_utc = (now() at time zone 'UTC')::date
+    redis = get_redis(request)
+    default_max = get_settings().default_max_replies_per_day
+    quota = await consume_daily_quota(redis, pool, account_id, "replies", default_max)
+    if quota is False:
+        raise HTTPException(status_code=429, detail="Daily reply limit reached")
+    new_id = None
+    try:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    CREATE_REPLY_SQL,
+                    {
+                        "account_id": account_id,
+                        "default_max": default_max,
+                        "check_quota": quota is None,
+                        "post_id": body.post_id,
+                        "parent_id": body.parent_id,
+                        "body_md": text,
+                        "lang": body.lang or "en",
+                    },
                 )
-                SELECT COALESCE((SELECT max_replies FROM lim), %s) AS max_replies,
-                       COALESCE((SELECT replies_count FROM c), 0) AS replies_count
-                """,
-                (
-                    settings.default_max_posts_per_day,
-                    settings.default_max_replies_per_day,
-                    account_id,
-                    account_id,
-                    settings.default_max_replies_per_day,
-                ),
-            )
-            row = await cur.fetchone()
-            max_replies, replies_count = row[0], row[1]
-            if replies_count >= max_replies:
-                raise HTTPException(status_code=429, detail="Daily reply limit reached")
-
-            await cur.execute(
-                """
-                INSERT INTO app.replies (id, post_id, parent_id, author_id, body_md, lang)
-                VALUES (gen_random_uuid(), %s, %s, %s, %s, %s)
-                RETURNING id
-                """,
-                (body.post_id, body.parent_id, account_id, text, body.lang or "en"),
-            )
-            new_id = (await cur.fetchone())[0]
-
-            await cur.execute(
-                """
-                INSERT INTO app.rate_limits (account_id, day_utc, posts_count, replies_count)
-                VALUES (%s, (now() at time zone 'UTC')::date, 0, 1)
-                ON CONFLICT (account_id, day_utc)
-                DO UPDATE SET replies_count = app.rate_limits.replies_count + 1
-                """,
-                (account_id,),
-            )
+                new_id = (await cur.fetchone())[0]
+    finally:
+        if quota and new_id is None:
+            await release_daily_quota(redis, account_id, "replies")
+    if new_id is None:
+        raise HTTPException(status_code=429, detail="Daily reply limit reached")
+    # The reply_count trigger changed the post as shown in feeds.
+    await bump_feed_generation(redis, "reply_created")
 
     return ReplyOut(
         id=str(new_id),
@@ -723,6 +875,7 @@ class VoteIn(BaseModel):
 
 @router.post("/vote", response_model=OkOut)
 async def cast_vote(
+    request: Request,
     body: VoteIn,
     account_id: str = Depends(get_current_account_id),
     pool = Depends(get_pool),
@@ -732,61 +885,54 @@ async def cast_vote(
         raise HTTPException(status_code=422, detail="invalid target_type")
     if body.value not in (-1, 1):
         raise HTTPException(status_code=422, detail="invalid value")
-    # logger.info(
-    #     f"Vote attempt: account_id={account_id}, target_type={body.target_type}, target_id={body.target_id}, value={body.value}"
-    # )
-    async with pool.connection() as conn:
-        async with conn.cursor() as cur:
-            if body.target_type == "post":
-                await cur.execute(
-                    """
-                    SELECT value FROM app.votes
-                    WHERE account_id=%s AND target_type='post' AND target_id=%s
-                    LIMIT 1
-                    """,
-                    (account_id, body.target_id),
-                )
-                existing = await cur.fetchone()
-                if existing:
-                    # logger.info(
-                    #     f"Existing vote found for account_id={account_id}, target_type={body.target_type}, target_id={body.target_id}"
-                    # )
-                    raise HTTPException(status_code=409, detail="already voted on this post")
-                await cur.execute(
-                    """
-                    INSERT INTO app.votes (account_id, target_type, target_id, value)
-                    VALUES (%s, 'post', %s, %s)
-                    ON CONFLICT DO NOTHING
-                    """,
-                    (account_id, body.target_id, body.value),
-                )
-                await cur.execute(
-                    "UPDATE app.posts SET score = COALESCE(score,0) + %s WHERE id=%s",
-                    (body.value, body.target_id),
-                )
-            else:
-                await cur.execute(
-                    """
-                    SELECT value FROM app.votes
-                    WHERE account_id=%s AND target_type='reply' AND target_id=%s
-                    LIMIT 1
-                    """,
-                    (account_id, body.target_id),
-                )
-                existing = await cur.fetchone()
-                if existing:
-                    raise HTTPException(status_code=409, detail="already voted on this reply")
+    if get_settings().vote_buffer_enabled and get_redis(request) is not None:
+        try:
+            uuid.UUID(body.target_id)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="invalid target_id")
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
                 await cur.execute(
                     """
-                    INSERT INTO app.votes (account_id, target_type, target_id, value)
-                    VALUES (%s, 'reply', %s, %s)
+                    SELECT 1 FROM app.votes
+                    WHERE account_id=%s AND target_type=%s AND target_id=%s
                     """,
-                    (account_id, body.target_id, body.value),
-                )
-                await cur.execute(
-                    "UPDATE app.replies SET score = COALESCE(score,0) + %s WHERE id=%s",
-                    (body.value, body.target_id),
+                    (account_id, body.target_type, body.target_id),
+                    prepare=True,
                 )
+                if await cur.fetchone():
+                    raise HTTPException(status_code=409, detail=f"already voted on this {body.target_type}")
+        buffered = await buffer_vote(
+            get_redis(request),
+            account_id,
+            body.target_type,
+            body.target_id,
+            body.value,
+            datetime.now(timezone.utc).isoformat(),
+        )
+        if buffered is False:
+            raise HTTPException(status_code=409, detail=f"already voted on this {body.target_type}")
+        if buffered:
+            # The flusher applies the score and bumps the feed generation.
+            return {"ok": True}
+    # The vote triggers add the value to the target's score.
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO app.votes (account_id, target_type, target_id, value)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+                """,
+                (account_id, body.target_type, body.target_id, body.value),
+                prepare=True,
+            )
+            if await cur.fetchone() is None:
+                raise HTTPException(status_code=409, detail=f"already voted on this {body.target_type}")
+    # Reply scores never appear in feeds.
+    if body.target_type == "post":
+        await bump_feed_generation(get_redis(request), "post_voted")
     return {"ok": True}
 
 
@@ -796,7 +942,12 @@ class MyVoteOut(BaseModel):
 
 
 @router.get("/{post_id}/my-vote", response_model=MyVoteOut)
-async def get_my_vote(post_id: str, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
+async def get_my_vote(
+    post_id: str,
+    request: Request,
+    account_id: str = Depends(get_current_account_id),
+    pool = Depends(get_pool),
+):
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
@@ -806,13 +957,73 @@ async def get_my_vote(post_id: str, account_id: str = Depends(get_current_accoun
                 LIMIT 1
                 """,
                 (account_id, post_id),
+                prepare=True,
             )
             row = await cur.fetchone()
     if row:
         return {"voted": True, "value": int(row[0])}
+    return await _pending_my_vote(request, post_id, account_id)
+
+
+async def _pending_my_vote(request: Request, post_id: str, account_id: str) -> dict:
+    """A vote still waiting in the Redis buffer counts as cast."""
+    if get_settings().vote_buffer_enabled:
+        value = await pending_vote_value(get_redis(request), "post", post_id, account_id)
+        if value is not None:
+            return {"voted": True, "value": value}
     return {"voted": False, "value": None}
 
 
+class MyVotesItem(BaseModel):
+    target_id: str
+    value: int
+
+
+class MyVotesOut(BaseModel):
+    items: List[MyVotesItem]
+
+
+MY_VOTES_MAX_IDS = 200
+
+
+@router.get("/my-votes", response_model=MyVotesOut)
+async def get_my_votes(
+    request: Request,
+    ids: str = Query(...),
+    target_type: str = Query("post", pattern="^(post|reply)$"),
+    account_id: str = Depends(get_current_account_id),
+    pool = Depends(get_pool),
+):
+    """The caller's votes on a page of posts or replies, as one primary-key lookup.
+
+    ``ids`` is comma-separated; targets without a vote are left out.
+    """
+    raw_ids = [t.strip() for t in ids.split(",") if t.strip()]
+    if len(raw_ids) > MY_VOTES_MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"at most {MY_VOTES_MAX_IDS} ids")
+    try:
+        target_ids = list(dict.fromkeys(str(uuid.UUID(t)) for t in raw_ids))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="invalid ids")
+    if not target_ids:
+        return {"items": []}
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                SELECT target_id, value FROM app.votes
+                WHERE account_id = %s AND target_type = %s AND target_id = ANY(%s::uuid[])
+                """,
+                (account_id, target_type, target_ids),
+                prepare=True,
+            )
+            rows = await cur.fetchall()
+    votes = {str(r[0]): int(r[1]) for r in rows}
+    if get_settings().vote_buffer_enabled:
+        missing = [t for t in target_ids if t not in votes]
+        votes.update(await pending_vote_values(get_redis(request), target_type, missing, account_id))
+    return {"items": [{"target_id": t, "value": votes[t]} for t in target_ids if t in votes]}
+
 class TagAttachIn(BaseModel):
     slug: str
     label: Optional[str] = None
@@ -820,6 +1031,7 @@ class TagAttachIn(BaseModel):
 
 @router.post("/{post_id}/tags", response_model=OkOut)
 async def attach_tag(
+    request: Request,
     post_id: str,
     body: TagAttachIn,
     account_id: str = Depends(get_current_account_id),
@@ -856,7 +1068,7 @@ async def attach_tag(
                     VALUES (gen_random_uuid(), %s, %s, 'user_created', false, false)
                     ON CONFLICT (slug) DO NOTHING
                     RETURNING id, is_banned, is_restricted
-                    """
+                    """,
                     (slug, label),
                 )
                 row = await cur.fetchone()
@@ -888,11 +1100,15 @@ async def attach_tag(
                 """,
                 (post_id, tag_id),
             )
+            attached = cur.rowcount > 0
+    if attached:
+        await bump_feed_generation(get_redis(request), "tag_attached")
     return {"ok": True}
 
 
 @router.delete("/{post_id}/tags/{tag_id}", response_model=OkOut)
 async def detach_tag(
+    request: Request,
     post_id: str,
     tag_id: str,
     account_id: str = Depends(get_current_account_id),
@@ -927,11 +1143,15 @@ async def detach_tag(
                 raise HTTPException(status_code=403, detail=f"Cannot remove {tag_domain} tags")
             
             await cur.execute("DELETE FROM app.post_tags WHERE post_id=%s AND tag_id=%s", (post_id, tag_id))
+            detached = cur.rowcount > 0
+    if detached:
+        await bump_feed_generation(get_redis(request), "tag_detached")
     return {"ok": True}
 
 
 @router.delete("/{post_id}", response_model=OkOut)
 async def delete_post(
+    request: Request,
     post_id: str,
     account_id: str = Depends(get_current_account_id),
     pool = Depends(get_pool),
@@ -957,49 +1177,56 @@ async def delete_post(
                 "UPDATE app.posts SET deleted_at = NOW() WHERE id=%s",
                 (post_id,),
             )
+    await bump_feed_generation(get_redis(request), "post_deleted")
     return {"ok": True}
 
 
-@router.get("/{post_id}", response_model=PostOut)
-async def get_post(post_id: str, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
-    async with pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                SELECT p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count,
-                       p.created_at, p.author_id, a.handle AS author
-                FROM app.posts p
-                LEFT JOIN app.accounts a ON a.id = p.author_id
-                WHERE p.id = %s AND p.deleted_at IS NULL
-                LIMIT 1
-                """,
-                (post_id,),
-            )
-            row = await cur.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Post not found")
+def _post_query(access_clause: str) -> str:
+    """Post, author, tags, the viewer's admin flag and the access verdict for
+    this post's own tags in one statement.
 
-            # Ensure viewer has access to all tags attached to this post
-            await cur.execute(
-                """
-                SELECT t.id, t.slug, t.domain
-                FROM app.post_tags pt
-                JOIN app.tags t ON t.id = pt.tag_id
-                WHERE pt.post_id = %s
-                """,
-                (post_id,),
-            )
-            tags = await cur.fetchall()
+    Parameters: viewer account id, ``access_clause`` params, post id.
+    """
+    return f"""
+      SELECT p.id, p.title, p.body_md, p.lang, p.visibility, p.score, p.reply_count,
+             p.created_at, p.author_id, a.handle AS author,
+             COALESCE(post_tags.tags, '[]') AS tags,
+             COALESCE(post_tags.denied, false) AS denied,
+             EXISTS (
+               SELECT 1
+               FROM app.account_roles ar
+               JOIN app.roles r ON r.id = ar.role_id
+               WHERE ar.account_id = %s AND r.name = 'admin'
+             ) AS is_admin
+      FROM app.posts p
+      LEFT JOIN app.accounts a ON a.id = p.author_id
+      LEFT JOIN LATERAL (
+        SELECT json_agg(
+                 json_build_object('id', t.id, 'slug', t.slug, 'label', t.label, 'domain', t.domain)
+                 ORDER BY t.slug
+               ) AS tags,
+               bool_or(NOT {access_clause}) AS denied
+        FROM app.post_tags pt
+        JOIN app.tags t ON t.id = pt.tag_id
+        WHERE pt.post_id = p.id
+      ) post_tags ON TRUE
+      WHERE p.id = %s AND p.deleted_at IS NULL
+    """
 
-    is_admin = await is_admin_account(pool, account_id)
 
-    if tags and not is_admin:
-        _, accessible_slugs = await fetch_accessible_tag_sets(pool, account_id)
-        for tag_row in tags:
-            tag_slug = tag_row[1]
-            if tag_slug and tag_slug.lower() not in {slug.lower() for slug in accessible_slugs}:
-                raise HTTPException(status_code=403, detail="Forbidden")
+async def _post_access_clause(pool, account_id: Optional[str]) -> tuple[str, list[object]]:
+    if await tag_visibility_available(pool):
+        return build_access_clause("t", account_id)
+    return "TRUE", []
+
 
+def _post_from_row(row) -> dict:
+    """Build the PostOut payload, raising 404/403 like every post endpoint."""
+    if not row:
+        raise HTTPException(status_code=404, detail="Post not found")
+    denied, is_admin = row[11], row[12]
+    if denied and not is_admin:
+        raise HTTPException(status_code=403, detail="Forbidden")
     return {
         "id": str(row[0]),
         "title": row[1],
@@ -1011,9 +1238,20 @@ async def get_post(post_id: str, account_id: str = Depends(get_current_account_i
         "created_at": row[7].isoformat() if row[7] else None,
         "author_id": str(row[8]) if row[8] else None,
         "author": row[9],
+        "tags": row[10] or [],
     }
 
 
+@router.get("/{post_id}", response_model=PostOut)
+async def get_post(post_id: str, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
+    access_clause, access_params = await _post_access_clause(pool, account_id)
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(_post_query(access_clause), (account_id, *access_params, post_id), prepare=True)
+            row = await cur.fetchone()
+    return _post_from_row(row)
+
+
 @router.get("/{post_id}/tags", response_model=List[PostTagOut])
 async def list_post_tags(post_id: str, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
     sql = """
@@ -1040,43 +1278,277 @@ async def list_post_tags(post_id: str, account_id: str = Depends(get_current_acc
     ]
 
 
+POST_EXISTS_SQL = "SELECT 1 FROM app.posts WHERE id = %s AND deleted_at IS NULL LIMIT 1"
+
+REPLIES_SQL = """
+  SELECT r.id, r.parent_id, r.author_id, a.handle AS author, r.body_md, r.lang, r.score, r.created_at
+  FROM app.replies r
+  LEFT JOIN app.accounts a ON a.id = r.author_id
+  WHERE r.post_id = %s AND r.deleted_at IS NULL
+  ORDER BY r.created_at ASC
+  LIMIT %s OFFSET %s
+"""
+
+
+def _reply_from_row(r) -> dict:
+    return {
+        "id": str(r[0]),
+        "parent_id": (str(r[1]) if r[1] else None),
+        "author_id": (str(r[2]) if r[2] else None),
+        "author": r[3],
+        "body_md": r[4],
+        "lang": r[5],
+        "score": r[6],
+        "created_at": r[7].isoformat() if r[7] else None,
+    }
+
+
 @router.get("/{post_id}/replies", response_model=List[ReplyOut])
 async def list_replies(post_id: str, limit: int = 100, offset: int = 0, account_id: str = Depends(get_current_account_id), pool = Depends(get_pool)):
     # logger.info(f"Fetching replies for post_id={post_id}, user={account_id}, limit={limit}, offset={offset}")
     try:
-        # Check if post exists first
-        async with pool.connection() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("SELECT 1 FROM app.posts WHERE id = %s AND deleted_at IS NULL LIMIT 1", (post_id,))
-                if not await cur.fetchone():
-                    raise HTTPException(status_code=404, detail="Post not found")
-        # Proceed with replies query
-        sql = """
-          SELECT r.id, r.parent_id, r.author_id, a.handle AS author, r.body_md, r.lang, r.score, r.created_at
-          FROM app.replies r
-          LEFT JOIN app.accounts a ON a.id = r.author_id
-          WHERE r.post_id = %s AND r.deleted_at IS NULL
-          ORDER BY r.created_at ASC
-          LIMIT %s OFFSET %s
-        """
+        # Existence check and replies go out together in one pipeline
         async with pool.connection() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(sql, (post_id, limit, offset))
-                rows = await cur.fetchall()
-                # logger.info(f"Replies query returned {len(rows)} rows for post_id={post_id}")
-        return [
-            {
-                "id": str(r[0]),
-                "parent_id": (str(r[1]) if r[1] else None),
-                "author_id": (str(r[2]) if r[2] else None),
-                "author": r[3],
-                "body_md": r[4],
-                "lang": r[5],
-                "score": r[6],
-                "created_at": r[7].isoformat() if r[7] else None,
-            }
-            for r in rows
-        ]
+            exists, rows = await fetch_pipelined(
+                conn,
+                [(POST_EXISTS_SQL, (post_id,)), (REPLIES_SQL, (post_id, limit, offset))],
+                prepare=True,
+            )
+        if not exists:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return [_reply_from_row(r) for r in rows]
     except Exception as e:
         logger.error(f"Error loading replies for post_id={post_id}: {str(e)}")
         raise
+
+
+class ReplyNodeOut(ReplyOut):
+    depth: int
+    child_count: int = 0
+    more_replies: int = 0
+    children: List["ReplyNodeOut"] = []
+
+
+class ReplyTreePage(BaseModel):
+    items: List[ReplyNodeOut]
+    next_cursor: Optional[str] = None
+
+
+ReplyNodeOut.model_rebuild()
+
+# The roots are paged by keyset; below them the recursive step keeps the first
+# ``child_limit`` live children of every reply until ``depth`` levels are built.
+# Children beyond either limit only show up as ``more_replies`` on their parent.
+REPLY_TREE_SQL = """
+  WITH RECURSIVE roots AS (
+    SELECT r.id, r.parent_id, r.author_id, r.body_md, r.lang, r.score, r.created_at
+    FROM app.replies r
+    WHERE r.post_id = %s AND r.deleted_at IS NULL AND {root_condition}{cursor_condition}
+    ORDER BY r.created_at, r.id
+    LIMIT %s
+  ), tree AS (
+    SELECT page.*, 1 AS depth
+    FROM (SELECT * FROM roots ORDER BY created_at, id LIMIT %s) page
+    UNION ALL
+    SELECT c.id, c.parent_id, c.author_id, c.body_md, c.lang, c.score, c.created_at, t.depth + 1
+    FROM tree t
+    CROSS JOIN LATERAL (
+      SELECT r.id, r.parent_id, r.author_id, r.body_md, r.lang, r.score, r.created_at
+      FROM app.replies r
+      WHERE r.parent_id = t.id AND r.deleted_at IS NULL
+      ORDER BY r.created_at, r.id
+      LIMIT %s
+    ) c
+    WHERE t.depth < %s
+  )
+  SELECT t.id, t.parent_id, t.author_id, a.handle AS author, t.body_md, t.lang, t.score, t.created_at,
+         t.depth,
+         (SELECT COUNT(*) FROM app.replies c WHERE c.parent_id = t.id AND c.deleted_at IS NULL) AS child_count,
+         (SELECT COUNT(*) FROM roots) AS root_count
+  FROM tree t
+  LEFT JOIN app.accounts a ON a.id = t.author_id
+  ORDER BY t.depth, t.created_at, t.id
+"""
+
+
+async def _reply_tree_page(
+    pool,
+    post_id: str,
+    parent_id: Optional[str],
+    *,
+    depth: int,
+    limit: int,
+    child_limit: int,
+    cursor: Optional[str],
+) -> dict:
+    """One page of replies under ``parent_id`` (top level when ``None``) as nested nodes.
+
+    Raises 404 when the post, or the parent reply within it, does not exist.
+    """
+    params: list[object] = [post_id]
+    if parent_id is None:
+        root_condition = "r.parent_id IS NULL"
+        exists_check = (POST_EXISTS_SQL, (post_id,))
+        missing_detail = "Post not found"
+    else:
+        root_condition = "r.parent_id = %s::uuid"
+        params.append(parent_id)
+        exists_check = (
+            "SELECT 1 FROM app.replies WHERE id = %s AND post_id = %s AND deleted_at IS NULL LIMIT 1",
+            (parent_id, post_id),
+        )
+        missing_detail = "Reply not found"
+    cursor_condition = ""
+    if cursor:
+        cursor_values = decode_cursor(cursor, "replies", len(REPLY_TREE_KEY))
+        if cursor_values is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        cursor_condition = keyset_condition(REPLY_TREE_KEY, ascending=True)
+        params.extend(cursor_values)
+    params.extend([limit + 1, limit, child_limit, depth])
+    sql = REPLY_TREE_SQL.format(root_condition=root_condition, cursor_condition=cursor_condition)
+    async with pool.connection() as conn:
+        exists, rows = await fetch_pipelined(conn, [exists_check, (sql, tuple(params))])
+    if not exists:
+        raise HTTPException(status_code=404, detail=missing_detail)
+
+    nodes: dict[str, dict] = {}
+    items: List[dict] = []
+    last_root = None
+    for r in rows:
+        node = _reply_from_row(r)
+        node.update(depth=int(r[8]), child_count=int(r[9]), more_replies=int(r[9]), children=[])
+        nodes[node["id"]] = node
+        if r[8] == 1:
+            items.append(node)
+            last_root = r
+            continue
+        parent = nodes.get(node["parent_id"])
+        if parent is not None:
+            parent["children"].append(node)
+            parent["more_replies"] -= 1
+    has_more = bool(rows) and int(rows[0][10]) > limit
+    next_cursor = encode_cursor("replies", [last_root[7], str(last_root[0])]) if has_more and last_root else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/{post_id}/replies/tree", response_model=ReplyTreePage)
+async def list_reply_tree(
+    post_id: str,
+    depth: int = Query(3, ge=1, le=10),
+    limit: int = Query(20, ge=1, le=100),
+    child_limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = None,
+    account_id: str = Depends(get_current_account_id),
+    pool = Depends(get_pool),
+):
+    """Top-level replies with up to ``depth`` levels of children nested below them.
+
+    ``next_cursor`` pages through the top level only; a node whose children were
+    cut off reports how many in ``more_replies`` and can be expanded with
+    ``GET /posts/{post_id}/replies/{reply_id}/children``.
+    """
+    return await _reply_tree_page(
+        pool, post_id, None, depth=depth, limit=limit, child_limit=child_limit, cursor=cursor
+    )
+
+
+@router.get("/{post_id}/replies/{reply_id}/children", response_model=ReplyTreePage)
+async def list_reply_children(
+    post_id: str,
+    reply_id: str,
+    depth: int = Query(3, ge=1, le=10),
+    limit: int = Query(20, ge=1, le=100),
+    child_limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = None,
+    account_id: str = Depends(get_current_account_id),
+    pool = Depends(get_pool),
+):
+    """Expand one branch: the children of ``reply_id`` as a tree page, depths relative to it."""
+    return await _reply_tree_page(
+        pool, post_id, reply_id, depth=depth, limit=limit, child_limit=child_limit, cursor=cursor
+    )
+
+class PostBookmarkOut(BaseModel):
+    bookmark_id: str
+    tags: List[str] = []
+    created_at: Optional[str] = None
+
+
+class PostPageOut(BaseModel):
+    post: PostOut
+    replies: List[ReplyOut]
+    my_vote: MyVoteOut
+    bookmark: Optional[PostBookmarkOut] = None
+
+
+POST_PAGE_REPLY_LIMIT = 100
+
+
+@router.get("/{post_id}/full", response_model=PostPageOut)
+async def get_post_page(
+    post_id: str,
+    request: Request,
+    account_id: str = Depends(get_current_account_id),
+    pool = Depends(get_pool),
+):
+    """Everything the post page renders, built on one connection.
+
+    The four statements are sent as one pipeline, so the page costs a single
+    network round trip to the database. The body is per viewer (vote and
+    bookmark state); a matching If-None-Match gets an empty 304.
+    """
+    access_clause, access_params = await _post_access_clause(pool, account_id)
+    async with pool.connection() as conn:
+        post_rows, reply_rows, vote_rows, bookmark_rows = await fetch_pipelined(
+            conn,
+            [
+                (_post_query(access_clause), (account_id, *access_params, post_id)),
+                (REPLIES_SQL, (post_id, POST_PAGE_REPLY_LIMIT, 0)),
+                (
+                    """
+                    SELECT value FROM app.votes
+                    WHERE account_id=%s AND target_type='post' AND target_id=%s
+                    LIMIT 1
+                    """,
+                    (account_id, post_id),
+                ),
+                (
+                    """
+                    SELECT b.id, b.created_at,
+                           COALESCE(array_agg(bt.tag_slug ORDER BY bt.tag_slug)
+                                    FILTER (WHERE bt.tag_slug IS NOT NULL), ARRAY[]::text[]) AS tags
+                    FROM app.bookmarks b
+                    LEFT JOIN app.bookmark_tags bt ON bt.bookmark_id = b.id
+                    WHERE b.account_id = %s AND b.target_type = 'post' AND b.target_id = %s
+                    GROUP BY b.id
+                    """,
+                    (account_id, post_id),
+                ),
+            ],
+            prepare=True,
+        )
+    post_row = post_rows[0] if post_rows else None
+    vote_row = vote_rows[0] if vote_rows else None
+    bookmark_row = bookmark_rows[0] if bookmark_rows else None
+
+    page = {
+        "post": _post_from_row(post_row),
+        "replies": [_reply_from_row(r) for r in reply_rows],
+        "my_vote": (
+            {"voted": True, "value": int(vote_row[0])}
+            if vote_row
+            else await _pending_my_vote(request, post_id, account_id)
+        ),
+        "bookmark": (
+            {
+                "bookmark_id": str(bookmark_row[0]),
+                "tags": list(bookmark_row[2]),
+                "created_at": bookmark_row[1].isoformat() if bookmark_row[1] else None,
+            }
+            if bookmark_row
+            else None
+        ),
+    }
+    body = json.dumps(jsonable_encoder(PostPageOut(**page)), separators=(",", ":"), ensure_ascii=False)
+    return _etag_response(request, body, {"Cache-Control": "private, no-cache", "Vary": "Authorization, Cookie"})
@@ -21,6 +21,7 @@ from ..core.tag_access import (
 )
 from .auth import csrf_validate
 from ..core.cache import get_redis
+from ..services.feed_cache import bump_feed_generation
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
@@ -37,6 +38,8 @@ async def invalidate_tag_cache(request: Request) -> None:
             await redis.delete(*keys)
     except Exception:
         pass
+    # Restriction and ban changes alter which posts feeds show.
+    await bump_feed_generation(redis, "tag_changed")
 
 
 def make_slug(label: str) -> str:
@@ -127,17 +130,25 @@ async def list_tags(
     """
     params: list[object] = []
     conditions: list[str] = []
+    order_clause = "t.created_at DESC"
     if query:
+        # Substring or trigram word-similarity match (typo tolerant); both are
+        # served by the gin_trgm_ops indexes on slug and label.
         like = f"%{query}%"
-        conditions.append("(t.slug ILIKE %s OR t.label ILIKE %s)")
-        params.extend([like, like])
+        conditions.append(
+            "(t.slug::text ILIKE %s OR t.label ILIKE %s OR %s <%% t.slug::text OR %s <%% t.label)"
+        )
+        params.extend([like, like, query, query])
     if not is_admin and visibility_enabled:
         clause, clause_params = build_access_clause("t", account_id)
         conditions.append(clause)
         params.extend(clause_params)
     if conditions:
         sql += " WHERE " + " AND ".join(conditions)
-    sql += " ORDER BY t.created_at DESC LIMIT %s OFFSET %s"
+    if query:
+        order_clause = "GREATEST(word_similarity(%s, t.slug::text), word_similarity(%s, t.label)) DESC, t.created_at DESC"
+        params.extend([query, query])
+    sql += f" ORDER BY {order_clause} LIMIT %s OFFSET %s"
     params.extend([limit, offset])
 
     redis = get_redis(request)
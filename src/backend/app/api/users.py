@@ -8,9 +8,11 @@ import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+from ..core.cache import get_redis
 from ..core.db import get_pool
 from ..core.deps import get_current_account_id, require_admin
 from ..core.security import verify_password, get_password_hash
+from ..services.feed_cache import bump_feed_generation
 
 router = APIRouter(prefix="/users", tags=["users"]) 
 
@@ -248,6 +250,8 @@ async def delete_account(req: Request, account_id: str = Depends(get_current_acc
                 """,
                 (now, now, recycled_handle, account_id),
             )
+    # The account's posts left every feed; retire cached pages and the public latest list.
+    await bump_feed_generation(get_redis(req), "post_deleted")
     return Response(status_code=204)
 
 
@@ -261,8 +265,12 @@ async def admin_list_users(
 ):
     pool = get_pool(req)
     q_like = None
-    if q:
-        q_like = f"%{q.lower().strip()}%"
+    q_term = None
+    if q and q.strip():
+        # Substring matches plus trigram word similarity for typos, ranked by
+        # similarity; both use the gin_trgm_ops indexes on handle and email.
+        q_term = q.lower().strip()
+        q_like = f"%{q_term}%"
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
             if q_like:
@@ -272,11 +280,11 @@ async def admin_list_users(
                     FROM app.accounts a
                     WHERE a.deleted_at IS NULL
                       AND (
-                        lower(a.handle) LIKE %s OR
-                        lower(COALESCE(a.email, '')) LIKE %s
+                        a.handle::text ILIKE %s OR a.email::text ILIKE %s OR
+                        %s <%% a.handle::text OR %s <%% a.email::text
                       )
                     """,
-                    (q_like, q_like),
+                    (q_like, q_like, q_term, q_term),
                 )
             else:
                 await cur.execute(
@@ -297,13 +305,17 @@ async def admin_list_users(
                     FROM app.accounts a
                     WHERE a.deleted_at IS NULL
                       AND (
-                        lower(a.handle) LIKE %s OR
-                        lower(COALESCE(a.email, '')) LIKE %s
+                        a.handle::text ILIKE %s OR a.email::text ILIKE %s OR
+                        %s <%% a.handle::text OR %s <%% a.email::text
                       )
-                    ORDER BY a.created_at DESC
+                    ORDER BY GREATEST(
+                               word_similarity(%s, a.handle::text),
+                               COALESCE(word_similarity(%s, a.email::text), 0)
+                             ) DESC,
+                             a.created_at DESC
                     LIMIT %s OFFSET %s
                     """,
-                    (q_like, q_like, limit, offset),
+                    (q_like, q_like, q_term, q_term, q_term, q_term, limit, offset),
                 )
             else:
                 await cur.execute(
@@ -17,6 +17,12 @@ class Settings(BaseSettings):
     ollama_base_url: str = ""
     ollama_api_key: str = ""
     ollama_model: str = ""
+    ollama_model_routes: str = ""
+    ollama_backends: str = ""
+    ollama_health_path: str = "/"
+    ollama_health_interval_seconds: int = 15
+    ollama_keep_warm_seconds: int = 240
+    ollama_keep_warm_idle_seconds: int = 900
     default_max_posts_per_day: int
     default_max_replies_per_day: int
     app_env: str
@@ -31,6 +37,7 @@ class Settings(BaseSettings):
     smtp_user: str = ""
     smtp_password: str = ""
     redis_url: str
+    vote_buffer_enabled: bool = False
 
 
 @lru_cache()
@@ -58,6 +65,7 @@ def get_settings() -> Settings:
     redis_url = os.getenv('REDIS_URL')
     if not redis_url:
         raise RuntimeError('REDIS_URL must be set in environment (see .env)')
+    vote_buffer_enabled = os.getenv('VOTE_BUFFER_ENABLED', 'false').lower() in ('1','true','yes')
 
     # Secrets and service endpoints
     secret_key = os.getenv('APP_SECRET', '')
@@ -77,6 +85,17 @@ def get_settings() -> Settings:
     ollama_api_key = os.getenv('OPENWEBUI_API_KEY', os.getenv('OLLAMA_API_KEY', ''))
     ollama_model = os.getenv('OPENWEBUI_MODEL_TRANSLATE',
                              os.getenv('OPENWEBUI_MODEL_SUMMARY', os.getenv('OLLAMA_MODEL', '')))
+    ollama_model_routes = os.getenv('OLLAMA_MODEL_ROUTES', '')
+    ollama_backends = os.getenv('OLLAMA_BACKENDS', '')
+    ollama_health_path = os.getenv('OLLAMA_HEALTH_PATH', '/')
+    try:
+        ollama_keep_warm_seconds = int(os.getenv('OLLAMA_KEEP_WARM_SECONDS', '240'))
+        ollama_keep_warm_idle_seconds = int(os.getenv('OLLAMA_KEEP_WARM_IDLE_SECONDS', '900'))
+        ollama_health_interval_seconds = int(os.getenv('OLLAMA_HEALTH_INTERVAL_SECONDS', '15'))
+    except ValueError as exc:
+        raise RuntimeError(
+            'OLLAMA_KEEP_WARM_SECONDS, OLLAMA_KEEP_WARM_IDLE_SECONDS and OLLAMA_HEALTH_INTERVAL_SECONDS must be integers'
+        ) from exc
 
     cors_origins = os.getenv('CORS_ALLOW_ORIGINS')
     if cors_origins:
@@ -113,6 +132,12 @@ def get_settings() -> Settings:
         ollama_base_url=ollama_base_url,
         ollama_api_key=ollama_api_key,
         ollama_model=ollama_model,
+        ollama_model_routes=ollama_model_routes,
+        ollama_backends=ollama_backends,
+        ollama_health_path=ollama_health_path,
+        ollama_health_interval_seconds=ollama_health_interval_seconds,
+        ollama_keep_warm_seconds=ollama_keep_warm_seconds,
+        ollama_keep_warm_idle_seconds=ollama_keep_warm_idle_seconds,
         app_env=app_env,
         cors_allow_origins=cors_allow_origins,
         default_max_posts_per_day=default_max_posts_per_day,
@@ -126,5 +151,6 @@ def get_settings() -> Settings:
         smtp_use_ssl=smtp_use_ssl,
         smtp_user=smtp_user,
         smtp_password=smtp_password,
-        redis_url=redis_url
+        redis_url=redis_url,
+        vote_buffer_enabled=vote_buffer_enabled,
     )
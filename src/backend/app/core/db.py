@@ -1,17 +1,106 @@
 from __future__ import annotations
 
-from typing import Optional
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Sequence
 
+from psycopg import AsyncConnection, AsyncCursor
+from psycopg.pq import TransactionStatus
 from psycopg_pool import AsyncConnectionPool
 from fastapi import FastAPI, Request
 
 
 POOL_KEY = "db_pool"
 
+# Session settings applied to every pooled connection. The pg_trgm thresholds
+# are the cut-offs behind the `%` and `<%` operators used by fuzzy search.
+SESSION_SETTINGS = {
+    "pg_trgm.similarity_threshold": "0.3",
+    "pg_trgm.word_similarity_threshold": "0.45",
+}
+
+
+# Round trips of the current request: a one-element counter set by
+# track_round_trips(), None outside of a tracked request.
+_round_trips: ContextVar[Optional[list[int]]] = ContextVar("db_round_trips", default=None)
+_pipelined: ContextVar[bool] = ContextVar("db_pipelined", default=False)
+
+
+def _count_round_trip() -> None:
+    counter = _round_trips.get()
+    if counter is not None and not _pipelined.get():
+        counter[0] += 1
+
+
+@contextmanager
+def track_round_trips() -> Iterator[list[int]]:
+    """Count database round trips made inside the block (see X-DB-Round-Trips)."""
+    counter = [0]
+    token = _round_trips.set(counter)
+    try:
+        yield counter
+    finally:
+        _round_trips.reset(token)
+
+
+class CountingCursor(AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        _count_round_trip()
+        return await super().execute(query, params, **kwargs)
+
+    async def executemany(self, query, params_seq, **kwargs):
+        _count_round_trip()
+        return await super().executemany(query, params_seq, **kwargs)
+
+
+class CountingConnection(AsyncConnection):
+    async def commit(self) -> None:
+        # Leaving pool.connection() commits; that only costs a trip when a
+        # transaction is open.
+        if self.pgconn.transaction_status != TransactionStatus.IDLE:
+            _count_round_trip()
+        await super().commit()
+
+
+async def fetch_pipelined(
+    conn, statements: Sequence[tuple[str, Any]], *, prepare: Optional[bool] = None
+) -> list[list[tuple]]:
+    """Run independent statements in one pipeline and return the rows of each.
+
+    All statements are sent before any result is read, so the batch costs a
+    single network round trip. Statements without a result set give ``[]``.
+    """
+    async with AsyncExitStack() as stack:
+        cursors = [await stack.enter_async_context(conn.cursor()) for _ in statements]
+        token = _pipelined.set(True)
+        try:
+            async with conn.pipeline():
+                for cur, (query, params) in zip(cursors, statements):
+                    await cur.execute(query, params, prepare=prepare)
+        finally:
+            _pipelined.reset(token)
+        _count_round_trip()
+        return [await cur.fetchall() if cur.description else [] for cur in cursors]
+
+
+async def configure_connection(conn) -> None:
+    async with conn.cursor() as cur:
+        for name, value in SESSION_SETTINGS.items():
+            await cur.execute("SELECT set_config(%s, %s, false)", (name, value))
+    await conn.commit()
+
 
 async def init_pool(app: FastAPI, dsn: str) -> None:
     # Create a global async connection pool stored in app.state
-    pool = AsyncConnectionPool(conninfo=dsn, max_size=10, num_workers=3, open=False)
+    pool = AsyncConnectionPool(
+        conninfo=dsn,
+        connection_class=CountingConnection,
+        kwargs={"cursor_factory": CountingCursor},
+        max_size=10,
+        num_workers=3,
+        open=False,
+        configure=configure_connection,
+    )
     await pool.open()
     app.state.__setattr__(POOL_KEY, pool)
 
@@ -109,6 +109,7 @@ async def is_admin_account(pool, account_id: Optional[str]) -> bool:
                 LIMIT 1
                 """,
                 (account_id,),
+                prepare=True,
             )
             row = await cur.fetchone()
     return bool(row)
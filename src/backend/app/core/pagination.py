@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+# Columns (in ORDER BY order, all descending) and their SQL types per feed sort.
+# Every key ends in the primary key so that ties never repeat or skip rows.
+POST_SORT_KEYS: dict[str, tuple[tuple[str, str], ...]] = {
+    "newest": (("p.created_at", "timestamptz"), ("p.id", "uuid")),
+    "top": (("p.score", "integer"), ("p.created_at", "timestamptz"), ("p.id", "uuid")),
+    "hot": (("p.hot_rank", "double precision"), ("p.created_at", "timestamptz"), ("p.id", "uuid")),
+}
+
+# Reply trees page through siblings oldest first.
+REPLY_TREE_KEY: tuple[tuple[str, str], ...] = (("r.created_at", "timestamptz"), ("r.id", "uuid"))
+
+# Look-back windows accepted by ``sort=top&window=...``.
+TOP_WINDOWS: dict[str, str] = {"day": "1 day", "week": "7 days", "month": "30 days"}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    """Serialize a sort key into an opaque, URL-safe cursor."""
+    raw = json.dumps({"k": kind, "v": list(values)}, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, size: int) -> Optional[list[Any]]:
+    """Return the key values of ``cursor``, or ``None`` if it is malformed or
+    was issued for a different sort."""
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        return None
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def parse_legacy_cursor(cursor: str) -> Optional[str]:
+    """Older clients send a bare ISO ``created_at`` timestamp as the cursor."""
+    value = cursor.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        return None
+
+
+def keyset_condition(columns: Sequence[tuple[str, str]], ascending: bool = False) -> str:
+    """Row-value comparison selecting rows strictly after the cursor in a
+    descending (or, with ``ascending``, ascending) ordering over ``columns``."""
+    left = ", ".join(expr for expr, _ in columns)
+    right = ", ".join(f"%s::{sql_type}" for _, sql_type in columns)
+    return f" AND ({left}) {'>' if ascending else '<'} ({right})"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Optional, Tuple, Set, List
 
 LANGUAGE_TAG_SLUGS: Tuple[str, ...] = (
@@ -127,3 +128,30 @@ async def fetch_accessible_tag_sets(
             await cur.execute(query, params)
             rows = await cur.fetchall()
     return _rows_to_sets(rows)
+
+
+async def fetch_accessible_restricted_tag_ids(pool, account_id: Optional[str]) -> List[str]:
+    """Ids of the restricted tags ``account_id`` may see, sorted."""
+    clause, params = build_access_clause("t", account_id)
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                f"SELECT t.id::text FROM app.tags t WHERE t.is_restricted AND {clause} ORDER BY t.id",
+                tuple(params),
+            )
+            rows = await cur.fetchall()
+    return [row[0] for row in rows]
+
+
+def access_fingerprint(restricted_tag_ids: Optional[List[str]]) -> str:
+    """Short hash of the restricted tags a viewer may see; ``None`` means all tags.
+
+    Viewers with equal fingerprints see exactly the same posts, so results
+    that depend on tag access can be cached per fingerprint instead of per account.
+    """
+    if restricted_tag_ids is None:
+        return "all"
+    if not restricted_tag_ids:
+        return "public"
+    return hashlib.sha1(",".join(sorted(restricted_tag_ids)).encode("ascii")).hexdigest()[:16]
+
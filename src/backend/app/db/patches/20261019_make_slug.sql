@@ -0,0 +1,9 @@
+BEGIN;
+
+-- SQL twin of api.tags.make_slug, so create_post can derive the handle and
+-- language auto-tags inside its single write statement.
+CREATE OR REPLACE FUNCTION app.make_slug(label text) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+  SELECT btrim(regexp_replace(lower(btrim(coalesce(label, ''), E' \t\n\r\f\v')), '[^[:alnum:]_.-]', '-', 'g'), '-')
+$$;
+
+COMMIT;
@@ -0,0 +1,18 @@
+BEGIN;
+
+-- Feed preview text, stored so list endpoints can skip body_md entirely.
+-- Whitespace is collapsed and the text cut at 220 characters with an ellipsis;
+-- as a generated column it is rewritten whenever body_md changes.
+CREATE OR REPLACE FUNCTION app.post_excerpt(body text)
+RETURNS text
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE WHEN length(b) > 220 THEN rtrim(left(b, 220)) || '…' ELSE b END
+  FROM (SELECT btrim(regexp_replace(coalesce(body, ''), '\s+', ' ', 'g')) AS b) collapsed
+$$;
+
+ALTER TABLE app.posts
+  ADD COLUMN IF NOT EXISTS excerpt text GENERATED ALWAYS AS (app.post_excerpt(body_md)) STORED;
+
+COMMIT;
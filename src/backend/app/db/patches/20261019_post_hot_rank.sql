@@ -0,0 +1,43 @@
+BEGIN;
+
+-- Hot feed rank. Log-scaled engagement plus a creation-time term, so a post
+-- needs 10x the score + replies of a post 12.5 hours newer to rank level with
+-- it. The time term never changes, which makes the ordering equivalent to an
+-- exponential decay without rewriting every row as posts age; a rank only
+-- moves when score or reply_count does.
+CREATE OR REPLACE FUNCTION app.post_hot_rank(score integer, reply_count integer, created_at timestamptz)
+RETURNS double precision
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT sign(score + reply_count)::double precision
+           * log(greatest(abs(score + reply_count), 1)::double precision)
+         + (extract(epoch FROM created_at)::double precision - 1704067200) / 45000
+$$;
+
+ALTER TABLE app.posts
+  ADD COLUMN IF NOT EXISTS hot_rank double precision NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION app.posts_set_hot_rank()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.hot_rank := app.post_hot_rank(NEW.score, NEW.reply_count, NEW.created_at);
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS posts_set_hot_rank ON app.posts;
+CREATE TRIGGER posts_set_hot_rank
+  BEFORE INSERT OR UPDATE OF score, reply_count, created_at ON app.posts
+  FOR EACH ROW EXECUTE FUNCTION app.posts_set_hot_rank();
+
+UPDATE app.posts
+SET hot_rank = app.post_hot_rank(score, reply_count, created_at)
+WHERE hot_rank IS DISTINCT FROM app.post_hot_rank(score, reply_count, created_at);
+
+CREATE INDEX IF NOT EXISTS posts_hot_keyset_idx
+  ON app.posts (hot_rank DESC, created_at DESC, id DESC) WHERE deleted_at IS NULL;
+
+COMMIT;
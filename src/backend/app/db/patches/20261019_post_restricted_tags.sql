@@ -0,0 +1,82 @@
+BEGIN;
+
+-- Restricted tags on each post, denormalized so the feed access check is a
+-- plain array comparison instead of a correlated NOT EXISTS over post_tags,
+-- tags and tag_visibility. Posts without restricted tags (almost all of
+-- them) carry '{}' and are served straight from posts_public_newest_idx.
+ALTER TABLE app.posts
+  ADD COLUMN IF NOT EXISTS restricted_tag_ids uuid[] NOT NULL DEFAULT '{}';
+
+CREATE OR REPLACE FUNCTION app.refresh_post_tag_arrays(target_post_ids uuid[])
+RETURNS void
+LANGUAGE sql
+AS $$
+  UPDATE app.posts p
+  SET restricted_tag_ids = agg.restricted_tag_ids
+  FROM (
+    SELECT p2.id,
+           COALESCE(array_agg(t.id ORDER BY t.id) FILTER (WHERE t.is_restricted), '{}') AS restricted_tag_ids
+    FROM app.posts p2
+    LEFT JOIN app.post_tags pt ON pt.post_id = p2.id
+    LEFT JOIN app.tags t ON t.id = pt.tag_id
+    WHERE p2.id = ANY(target_post_ids)
+    GROUP BY p2.id
+  ) agg
+  WHERE p.id = agg.id
+    AND p.restricted_tag_ids IS DISTINCT FROM agg.restricted_tag_ids;
+$$;
+
+CREATE OR REPLACE FUNCTION app.post_tags_refresh_arrays()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    PERFORM app.refresh_post_tag_arrays(ARRAY[OLD.post_id]);
+  ELSE
+    PERFORM app.refresh_post_tag_arrays(ARRAY[NEW.post_id]);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS post_tags_refresh_arrays ON app.post_tags;
+CREATE TRIGGER post_tags_refresh_arrays
+  AFTER INSERT OR DELETE ON app.post_tags
+  FOR EACH ROW EXECUTE FUNCTION app.post_tags_refresh_arrays();
+
+CREATE OR REPLACE FUNCTION app.tags_refresh_post_arrays()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF NEW.is_restricted IS DISTINCT FROM OLD.is_restricted THEN
+    PERFORM app.refresh_post_tag_arrays(
+      ARRAY(SELECT pt.post_id FROM app.post_tags pt WHERE pt.tag_id = NEW.id)
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS tags_refresh_post_arrays ON app.tags;
+CREATE TRIGGER tags_refresh_post_arrays
+  AFTER UPDATE OF is_restricted ON app.tags
+  FOR EACH ROW EXECUTE FUNCTION app.tags_refresh_post_arrays();
+
+-- Backfill posts that already carry restricted tags.
+SELECT app.refresh_post_tag_arrays(ARRAY(
+  SELECT DISTINCT pt.post_id
+  FROM app.post_tags pt
+  JOIN app.tags t ON t.id = pt.tag_id
+  WHERE t.is_restricted
+));
+
+CREATE INDEX IF NOT EXISTS posts_public_newest_idx
+  ON app.posts (created_at DESC, id DESC)
+  WHERE deleted_at IS NULL AND restricted_tag_ids = '{}';
+CREATE INDEX IF NOT EXISTS posts_restricted_tags_idx
+  ON app.posts USING gin (restricted_tag_ids)
+  WHERE deleted_at IS NULL AND restricted_tag_ids <> '{}';
+
+COMMIT;
@@ -0,0 +1,37 @@
+BEGIN;
+
+-- All tag ids of each post, maintained next to restricted_tag_ids by the
+-- post_tags trigger, so multi-tag feeds are one GIN containment lookup
+-- (tag_ids @> ARRAY[...]) instead of a join + GROUP BY/HAVING per candidate.
+ALTER TABLE app.posts
+  ADD COLUMN IF NOT EXISTS tag_ids uuid[] NOT NULL DEFAULT '{}';
+
+CREATE OR REPLACE FUNCTION app.refresh_post_tag_arrays(target_post_ids uuid[])
+RETURNS void
+LANGUAGE sql
+AS $$
+  UPDATE app.posts p
+  SET tag_ids = agg.tag_ids,
+      restricted_tag_ids = agg.restricted_tag_ids
+  FROM (
+    SELECT p2.id,
+           COALESCE(array_agg(t.id ORDER BY t.id) FILTER (WHERE t.id IS NOT NULL), '{}') AS tag_ids,
+           COALESCE(array_agg(t.id ORDER BY t.id) FILTER (WHERE t.is_restricted), '{}') AS restricted_tag_ids
+    FROM app.posts p2
+    LEFT JOIN app.post_tags pt ON pt.post_id = p2.id
+    LEFT JOIN app.tags t ON t.id = pt.tag_id
+    WHERE p2.id = ANY(target_post_ids)
+    GROUP BY p2.id
+  ) agg
+  WHERE p.id = agg.id
+    AND (p.tag_ids IS DISTINCT FROM agg.tag_ids
+         OR p.restricted_tag_ids IS DISTINCT FROM agg.restricted_tag_ids);
+$$;
+
+-- Backfill every tagged post.
+SELECT app.refresh_post_tag_arrays(ARRAY(SELECT DISTINCT post_id FROM app.post_tags));
+
+CREATE INDEX IF NOT EXISTS posts_tag_ids_idx
+  ON app.posts USING gin (tag_ids) WHERE deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,14 @@
+BEGIN;
+
+-- Keyset pagination for /posts: one index per sort key, ending in id so ties
+-- are ordered deterministically. The newest index supersedes posts_active_idx.
+CREATE INDEX IF NOT EXISTS posts_newest_keyset_idx
+  ON app.posts (created_at DESC, id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_top_keyset_idx
+  ON app.posts (score DESC, created_at DESC, id DESC) WHERE deleted_at IS NULL;
+DROP INDEX IF EXISTS app.posts_active_idx;
+
+-- Tag feeds start from the tag side of post_tags.
+CREATE INDEX IF NOT EXISTS post_tags_tag_idx ON app.post_tags (tag_id, post_id);
+
+COMMIT;
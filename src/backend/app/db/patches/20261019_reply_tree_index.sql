@@ -0,0 +1,10 @@
+BEGIN;
+
+-- Reply trees: the recursive step of GET /posts/{id}/replies/tree reads the
+-- first N live children of each reply in (created_at, id) order, and the
+-- "n more replies" counts are per-parent counts. Top-level replies keep
+-- using replies_post_created.
+CREATE INDEX IF NOT EXISTS replies_parent_created
+  ON app.replies (parent_id, created_at, id) WHERE deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,145 @@
+BEGIN;
+
+-- Monthly range partitions, created ahead and retired by
+-- workers/retention_maintenance.py. Partitions are named <table>_pYYYY_MM
+-- and cover one UTC month of the partition key. Rows of a missing month that
+-- already landed in the default partition (e.g. the job did not run for a
+-- while) are moved into the new partition.
+CREATE OR REPLACE FUNCTION app.ensure_month_partitions(p_parent regclass, p_from date, p_months_ahead int)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  parent_schema text;
+  parent_name text;
+  part_key text := substring(pg_get_partkeydef(p_parent) from '\((.*)\)');
+  default_part regclass;
+  month_start date := date_trunc('month', p_from)::date;
+  last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => p_months_ahead))::date;
+  range_start timestamptz;
+  range_end timestamptz;
+  part_name text;
+  stranded boolean;
+  created int := 0;
+BEGIN
+  SELECT n.nspname, c.relname INTO parent_schema, parent_name
+  FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+  WHERE c.oid = p_parent;
+  SELECT c.oid::regclass INTO default_part
+  FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+  WHERE i.inhparent = p_parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+  WHILE month_start <= last_month LOOP
+    part_name := parent_name || '_p' || to_char(month_start, 'YYYY_MM');
+    IF to_regclass(format('%I.%I', parent_schema, part_name)) IS NULL THEN
+      range_start := month_start::timestamp AT TIME ZONE 'UTC';
+      range_end := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+      stranded := false;
+      IF default_part IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE %I >= %L AND %I < %L)',
+                       default_part, part_key, range_start, part_key, range_end)
+          INTO stranded;
+      END IF;
+      IF stranded THEN
+        -- Creating the partition fails while the default partition holds rows
+        -- of its range: park them, create the partition, put them back.
+        EXECUTE format('CREATE TEMP TABLE partition_move (LIKE %s) ON COMMIT DROP', p_parent);
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM %s WHERE %I >= %L AND %I < %L RETURNING *) INSERT INTO partition_move SELECT * FROM moved',
+          default_part, part_key, range_start, part_key, range_end
+        );
+      END IF;
+      EXECUTE format(
+        'CREATE TABLE %I.%I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+        parent_schema, part_name, p_parent, range_start, range_end
+      );
+      IF stranded THEN
+        EXECUTE format('INSERT INTO %s SELECT * FROM partition_move', p_parent);
+        DROP TABLE partition_move;
+      END IF;
+      created := created + 1;
+    END IF;
+    month_start := (month_start + interval '1 month')::date;
+  END LOOP;
+  RETURN created;
+END;
+$$;
+
+-- Detach (and with p_drop, drop) the month partitions that ended more than
+-- p_keep_months before the current month; returns their names. Detached
+-- partitions stay as plain tables for archiving.
+CREATE OR REPLACE FUNCTION app.retire_month_partitions(p_parent regclass, p_keep_months int, p_drop boolean)
+RETURNS SETOF text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  cutoff date := (date_trunc('month', now() AT TIME ZONE 'UTC') - make_interval(months => p_keep_months))::date;
+  part_name text;
+BEGIN
+  FOR part_name IN
+    SELECT c.oid::regclass::text
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = p_parent
+      AND c.relname ~ '_p[0-9]{4}_[0-9]{2}$'
+      AND to_date(right(c.relname, 7), 'YYYY_MM') < cutoff
+    ORDER BY c.relname
+  LOOP
+    EXECUTE format('ALTER TABLE %s DETACH PARTITION %s', p_parent, part_name);
+    IF p_drop THEN
+      EXECUTE format('DROP TABLE %s', part_name);
+    END IF;
+    RETURN NEXT part_name;
+  END LOOP;
+END;
+$$;
+
+-- Notifications: rebuild as a partitioned table. Nothing references
+-- notifications, so the primary key can include the partition key. Skipped
+-- when the table is already partitioned (re-run, or created by schema.sql).
+DO $$
+BEGIN
+  IF (SELECT c.relkind FROM pg_class c WHERE c.oid = 'app.notifications'::regclass) = 'p' THEN
+    RETURN;
+  END IF;
+
+  ALTER TABLE app.notifications RENAME TO notifications_unpartitioned;
+  ALTER TABLE app.notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey;
+  DROP INDEX IF EXISTS app.notifications_idx;
+
+  CREATE TABLE app.notifications (
+    id            uuid NOT NULL DEFAULT gen_random_uuid(),
+    recipient_id  uuid NOT NULL REFERENCES app.accounts(id) ON DELETE CASCADE,
+    kind          text NOT NULL,
+    ref_type      text NOT NULL,
+    ref_id        uuid,
+    payload       jsonb NOT NULL DEFAULT '{}'::jsonb,
+    is_read       boolean NOT NULL DEFAULT false,
+    created_at    timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+  ) PARTITION BY RANGE (created_at);
+  -- Safety net only; the maintenance job keeps months ahead, so it stays empty.
+  CREATE TABLE app.notifications_default PARTITION OF app.notifications DEFAULT;
+
+  PERFORM app.ensure_month_partitions(
+    'app.notifications',
+    COALESCE((SELECT min(created_at) AT TIME ZONE 'UTC' FROM app.notifications_unpartitioned)::date, now()::date),
+    3
+  );
+  INSERT INTO app.notifications (id, recipient_id, kind, ref_type, ref_id, payload, is_read, created_at)
+  SELECT id, recipient_id, kind, ref_type, ref_id, payload, is_read, created_at FROM app.notifications_unpartitioned;
+  DROP TABLE app.notifications_unpartitioned;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS notifications_idx ON app.notifications (recipient_id, is_read);
+CREATE INDEX IF NOT EXISTS notifications_recipient_created_idx ON app.notifications (recipient_id, created_at DESC);
+
+-- Hard purge of long soft-deleted content: find candidates by deleted_at, and
+-- give the cascades and polymorphic cleanups an index to use (the existing
+-- reply indexes are partial on live rows).
+CREATE INDEX IF NOT EXISTS posts_deleted_at_idx ON app.posts (deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS replies_deleted_at_idx ON app.replies (deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS replies_post_idx ON app.replies (post_id);
+CREATE INDEX IF NOT EXISTS replies_parent_idx ON app.replies (parent_id);
+CREATE INDEX IF NOT EXISTS bookmarks_target_idx ON app.bookmarks (target_type, target_id);
+
+COMMIT;
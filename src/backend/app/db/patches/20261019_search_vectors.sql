@@ -0,0 +1,20 @@
+BEGIN;
+
+-- Stored, weighted full-text vectors (title above body) so searches can use a
+-- GIN index instead of tokenizing every row. Adding a stored generated column
+-- rewrites the table once.
+ALTER TABLE app.posts
+  ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(body_md, '')), 'B')
+  ) STORED;
+
+ALTER TABLE app.replies
+  ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    to_tsvector('simple', coalesce(body_md, ''))
+  ) STORED;
+
+CREATE INDEX IF NOT EXISTS posts_search_idx ON app.posts USING gin (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS replies_search_idx ON app.replies USING gin (search_vector) WHERE deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,17 @@
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Trigram indexes behind fuzzy search: ILIKE '%q%' and the similarity
+-- operators (% and <%) on post titles, tag slug/label and account handle/email.
+-- citext columns are indexed as text, which is how the queries compare them.
+CREATE INDEX IF NOT EXISTS posts_title_trgm_idx
+  ON app.posts USING gin (title gin_trgm_ops) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS tags_slug_trgm_idx ON app.tags USING gin ((slug::text) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS tags_label_trgm_idx ON app.tags USING gin (label gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS accounts_handle_trgm_idx
+  ON app.accounts USING gin ((handle::text) gin_trgm_ops) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS accounts_email_trgm_idx
+  ON app.accounts USING gin ((email::text) gin_trgm_ops) WHERE deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,91 @@
+BEGIN;
+
+-- Vote triggers apply deltas instead of re-summing every vote of the target.
+-- Statement-level triggers with transition tables aggregate a whole batch
+-- (e.g. a flush of buffered votes) into one UPDATE per target, and a single
+-- vote touches the target row once.
+CREATE OR REPLACE FUNCTION app.apply_vote_deltas(p_types text[], p_ids uuid[], p_deltas int[])
+RETURNS void
+LANGUAGE sql
+AS $$
+  UPDATE app.posts p
+     SET score = p.score + d.delta, updated_at = now()
+    FROM unnest(p_types, p_ids, p_deltas) AS d(target_type, target_id, delta)
+   WHERE d.target_type = 'post' AND p.id = d.target_id AND d.delta <> 0;
+  UPDATE app.replies r
+     SET score = r.score + d.delta, updated_at = now()
+    FROM unnest(p_types, p_ids, p_deltas) AS d(target_type, target_id, delta)
+   WHERE d.target_type = 'reply' AND r.id = d.target_id AND d.delta <> 0;
+$$;
+
+CREATE OR REPLACE FUNCTION app.votes_apply_deltas() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+  v_types text[];
+  v_ids uuid[];
+  v_deltas int[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT array_agg(target_type), array_agg(target_id), array_agg(delta)
+      INTO v_types, v_ids, v_deltas
+      FROM (SELECT target_type, target_id, SUM(value)::int AS delta
+              FROM new_votes GROUP BY target_type, target_id) s;
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT array_agg(target_type), array_agg(target_id), array_agg(delta)
+      INTO v_types, v_ids, v_deltas
+      FROM (SELECT target_type, target_id, -SUM(value)::int AS delta
+              FROM old_votes GROUP BY target_type, target_id) s;
+  ELSE
+    SELECT array_agg(target_type), array_agg(target_id), array_agg(delta)
+      INTO v_types, v_ids, v_deltas
+      FROM (SELECT target_type, target_id, SUM(value)::int AS delta
+              FROM (SELECT target_type, target_id, value FROM new_votes
+                    UNION ALL
+                    SELECT target_type, target_id, -value FROM old_votes) changes
+             GROUP BY target_type, target_id) s;
+  END IF;
+  IF v_ids IS NOT NULL THEN
+    PERFORM app.apply_vote_deltas(v_types, v_ids, v_deltas);
+  END IF;
+  RETURN NULL;
+END$$;
+
+DROP TRIGGER IF EXISTS trg_votes_after_write ON app.votes;
+DROP TRIGGER IF EXISTS trg_votes_after_insert ON app.votes;
+CREATE TRIGGER trg_votes_after_insert
+AFTER INSERT ON app.votes
+REFERENCING NEW TABLE AS new_votes
+FOR EACH STATEMENT EXECUTE FUNCTION app.votes_apply_deltas();
+DROP TRIGGER IF EXISTS trg_votes_after_update ON app.votes;
+CREATE TRIGGER trg_votes_after_update
+AFTER UPDATE ON app.votes
+REFERENCING OLD TABLE AS old_votes NEW TABLE AS new_votes
+FOR EACH STATEMENT EXECUTE FUNCTION app.votes_apply_deltas();
+DROP TRIGGER IF EXISTS trg_votes_after_delete ON app.votes;
+CREATE TRIGGER trg_votes_after_delete
+AFTER DELETE ON app.votes
+REFERENCING OLD TABLE AS old_votes
+FOR EACH STATEMENT EXECUTE FUNCTION app.votes_apply_deltas();
+DROP FUNCTION IF EXISTS app.vote_after_write();
+
+-- cast_vote used to add the vote to the score on top of the trigger's
+-- recount; resync stored scores once so the deltas start from the truth.
+UPDATE app.posts p
+   SET score = v.s
+  FROM (
+    SELECT p2.id, COALESCE(SUM(vt.value), 0)::int AS s
+      FROM app.posts p2
+      LEFT JOIN app.votes vt ON vt.target_type = 'post' AND vt.target_id = p2.id
+     GROUP BY p2.id
+  ) v
+ WHERE p.id = v.id AND p.score <> v.s;
+UPDATE app.replies r
+   SET score = v.s
+  FROM (
+    SELECT r2.id, COALESCE(SUM(vt.value), 0)::int AS s
+      FROM app.replies r2
+      LEFT JOIN app.votes vt ON vt.target_type = 'reply' AND vt.target_id = r2.id
+     GROUP BY r2.id
+  ) v
+ WHERE r.id = v.id AND r.score <> v.s;
+
+COMMIT;
@@ -33,6 +33,9 @@ CREATE TABLE IF NOT EXISTS app.accounts (
   disabled_at timestamptz
 );
 CREATE INDEX IF NOT EXISTS accounts_handle_idx ON app.accounts (lower(handle));
+-- Trigram indexes for fuzzy admin user search (ILIKE and similarity operators)
+CREATE INDEX IF NOT EXISTS accounts_handle_trgm_idx ON app.accounts USING gin ((handle::text) gin_trgm_ops) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS accounts_email_trgm_idx ON app.accounts USING gin ((email::text) gin_trgm_ops) WHERE deleted_at IS NULL;
 
 ALTER TABLE app.accounts
   ADD COLUMN IF NOT EXISTS password_reset_token text,
@@ -82,6 +85,17 @@ CREATE TABLE IF NOT EXISTS app.user_limits (
   max_replies_per_day integer
 );
 
+-- Feed preview text stored on posts (see posts.excerpt)
+CREATE OR REPLACE FUNCTION app.post_excerpt(body text) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+  SELECT CASE WHEN length(b) > 220 THEN rtrim(left(b, 220)) || '…' ELSE b END
+  FROM (SELECT btrim(regexp_replace(coalesce(body, ''), '\s+', ' ', 'g')) AS b) collapsed
+$$;
+
+-- SQL twin of api.tags.make_slug (auto-tags in create_post)
+CREATE OR REPLACE FUNCTION app.make_slug(label text) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+  SELECT btrim(regexp_replace(lower(btrim(coalesce(label, ''), E' \t\n\r\f\v')), '[^[:alnum:]_.-]', '-', 'g'), '-')
+$$;
+
 -- Posts
 CREATE TABLE IF NOT EXISTS app.posts (
   id            uuid PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -94,10 +108,36 @@ CREATE TABLE IF NOT EXISTS app.posts (
   reply_count   integer NOT NULL DEFAULT 0,
   created_at    timestamptz NOT NULL DEFAULT now(),
   updated_at    timestamptz NOT NULL DEFAULT now(),
-  deleted_at    timestamptz
+  deleted_at    timestamptz,
+  -- Weighted full-text vector: title (A) ranks above body (B)
+  search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(body_md, '')), 'B')
+  ) STORED,
+  -- Feed preview: collapsed whitespace, cut at 220 characters
+  excerpt       text GENERATED ALWAYS AS (app.post_excerpt(body_md)) STORED,
+  -- All / restricted tags on the post, maintained by the post_tags trigger
+  -- below and, once tags.is_restricted exists, the tags trigger of
+  -- patches/20261019_post_restricted_tags.sql (see also
+  -- patches/20261019_post_tag_ids.sql)
+  tag_ids       uuid[] NOT NULL DEFAULT '{}',
+  restricted_tag_ids uuid[] NOT NULL DEFAULT '{}',
+  -- Hot feed rank, set by posts_set_hot_rank (see app.post_hot_rank below)
+  hot_rank      double precision NOT NULL DEFAULT 0
 );
-CREATE INDEX IF NOT EXISTS posts_active_idx ON app.posts (created_at) WHERE deleted_at IS NULL;
+-- Keyset pagination indexes, one per feed sort key (see core/pagination.py)
+CREATE INDEX IF NOT EXISTS posts_newest_keyset_idx ON app.posts (created_at DESC, id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_top_keyset_idx ON app.posts (score DESC, created_at DESC, id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_hot_keyset_idx ON app.posts (hot_rank DESC, created_at DESC, id DESC) WHERE deleted_at IS NULL;
 CREATE INDEX IF NOT EXISTS posts_author_idx ON app.posts (author_id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_search_idx ON app.posts USING gin (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_title_trgm_idx ON app.posts USING gin (title gin_trgm_ops) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_public_newest_idx ON app.posts (created_at DESC, id DESC)
+  WHERE deleted_at IS NULL AND restricted_tag_ids = '{}';
+CREATE INDEX IF NOT EXISTS posts_restricted_tags_idx ON app.posts USING gin (restricted_tag_ids)
+  WHERE deleted_at IS NULL AND restricted_tag_ids <> '{}';
+CREATE INDEX IF NOT EXISTS posts_tag_ids_idx ON app.posts USING gin (tag_ids) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS posts_deleted_at_idx ON app.posts (deleted_at) WHERE deleted_at IS NOT NULL;
 
 -- Replies (threaded)
 CREATE TABLE IF NOT EXISTS app.replies (
@@ -110,9 +150,15 @@ CREATE TABLE IF NOT EXISTS app.replies (
   score         integer NOT NULL DEFAULT 0,
   created_at    timestamptz NOT NULL DEFAULT now(),
   updated_at    timestamptz NOT NULL DEFAULT now(),
-  deleted_at    timestamptz
+  deleted_at    timestamptz,
+  search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', coalesce(body_md, ''))) STORED
 );
 CREATE INDEX IF NOT EXISTS replies_post_created ON app.replies (post_id, created_at) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS replies_parent_created ON app.replies (parent_id, created_at, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS replies_search_idx ON app.replies USING gin (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS replies_deleted_at_idx ON app.replies (deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS replies_post_idx ON app.replies (post_id);
+CREATE INDEX IF NOT EXISTS replies_parent_idx ON app.replies (parent_id);
 
 -- Votes (polymorphic target)
 CREATE TABLE IF NOT EXISTS app.votes (
@@ -158,12 +204,15 @@ CREATE TABLE IF NOT EXISTS app.tags (
 );
 CREATE INDEX IF NOT EXISTS tags_slug_idx ON app.tags (slug);
 CREATE INDEX IF NOT EXISTS tags_domain_idx ON app.tags (domain);
+CREATE INDEX IF NOT EXISTS tags_slug_trgm_idx ON app.tags USING gin ((slug::text) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS tags_label_trgm_idx ON app.tags USING gin (label gin_trgm_ops);
 
 CREATE TABLE IF NOT EXISTS app.post_tags (
   post_id   uuid NOT NULL REFERENCES app.posts(id) ON DELETE CASCADE,
   tag_id    uuid NOT NULL REFERENCES app.tags(id) ON DELETE CASCADE,
   PRIMARY KEY (post_id, tag_id)
 );
+CREATE INDEX IF NOT EXISTS post_tags_tag_idx ON app.post_tags (tag_id, post_id);
 
 -- Bookmarks
 CREATE TABLE IF NOT EXISTS app.bookmarks (
@@ -175,6 +224,7 @@ CREATE TABLE IF NOT EXISTS app.bookmarks (
   UNIQUE (account_id, target_type, target_id)
 );
 CREATE INDEX IF NOT EXISTS bookmarks_account_idx ON app.bookmarks (account_id, target_type);
+CREATE INDEX IF NOT EXISTS bookmarks_target_idx ON app.bookmarks (target_type, target_id);
 
 CREATE TABLE IF NOT EXISTS app.bookmark_tags (
   bookmark_id uuid NOT NULL REFERENCES app.bookmarks(id) ON DELETE CASCADE,
@@ -232,17 +282,114 @@ CREATE TABLE IF NOT EXISTS app.moderation_actions (
   created_at  timestamptz NOT NULL DEFAULT now()
 );
 
+-- Monthly range partitions, created ahead and retired by
+-- workers/retention_maintenance.py. Partitions are named <table>_pYYYY_MM
+-- and cover one UTC month of the partition key. Rows of a missing month that
+-- already landed in the default partition (e.g. the job did not run for a
+-- while) are moved into the new partition.
+CREATE OR REPLACE FUNCTION app.ensure_month_partitions(p_parent regclass, p_from date, p_months_ahead int)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  parent_schema text;
+  parent_name text;
+  part_key text := substring(pg_get_partkeydef(p_parent) from '\((.*)\)');
+  default_part regclass;
+  month_start date := date_trunc('month', p_from)::date;
+  last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => p_months_ahead))::date;
+  range_start timestamptz;
+  range_end timestamptz;
+  part_name text;
+  stranded boolean;
+  created int := 0;
+BEGIN
+  SELECT n.nspname, c.relname INTO parent_schema, parent_name
+  FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+  WHERE c.oid = p_parent;
+  SELECT c.oid::regclass INTO default_part
+  FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+  WHERE i.inhparent = p_parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+  WHILE month_start <= last_month LOOP
+    part_name := parent_name || '_p' || to_char(month_start, 'YYYY_MM');
+    IF to_regclass(format('%I.%I', parent_schema, part_name)) IS NULL THEN
+      range_start := month_start::timestamp AT TIME ZONE 'UTC';
+      range_end := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+      stranded := false;
+      IF default_part IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE %I >= %L AND %I < %L)',
+                       default_part, part_key, range_start, part_key, range_end)
+          INTO stranded;
+      END IF;
+      IF stranded THEN
+        -- Creating the partition fails while the default partition holds rows
+        -- of its range: park them, create the partition, put them back.
+        EXECUTE format('CREATE TEMP TABLE partition_move (LIKE %s) ON COMMIT DROP', p_parent);
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM %s WHERE %I >= %L AND %I < %L RETURNING *) INSERT INTO partition_move SELECT * FROM moved',
+          default_part, part_key, range_start, part_key, range_end
+        );
+      END IF;
+      EXECUTE format(
+        'CREATE TABLE %I.%I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+        parent_schema, part_name, p_parent, range_start, range_end
+      );
+      IF stranded THEN
+        EXECUTE format('INSERT INTO %s SELECT * FROM partition_move', p_parent);
+        DROP TABLE partition_move;
+      END IF;
+      created := created + 1;
+    END IF;
+    month_start := (month_start + interval '1 month')::date;
+  END LOOP;
+  RETURN created;
+END;
+$$;
+
+-- Detach (and with p_drop, drop) the month partitions that ended more than
+-- p_keep_months before the current month; returns their names. Detached
+-- partitions stay as plain tables for archiving.
+CREATE OR REPLACE FUNCTION app.retire_month_partitions(p_parent regclass, p_keep_months int, p_drop boolean)
+RETURNS SETOF text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  cutoff date := (date_trunc('month', now() AT TIME ZONE 'UTC') - make_interval(months => p_keep_months))::date;
+  part_name text;
+BEGIN
+  FOR part_name IN
+    SELECT c.oid::regclass::text
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = p_parent
+      AND c.relname ~ '_p[0-9]{4}_[0-9]{2}$'
+      AND to_date(right(c.relname, 7), 'YYYY_MM') < cutoff
+    ORDER BY c.relname
+  LOOP
+    EXECUTE format('ALTER TABLE %s DETACH PARTITION %s', p_parent, part_name);
+    IF p_drop THEN
+      EXECUTE format('DROP TABLE %s', part_name);
+    END IF;
+    RETURN NEXT part_name;
+  END LOOP;
+END;
+$$;
+
+-- Notifications, partitioned by created_at month
 CREATE TABLE IF NOT EXISTS app.notifications (
-  id            uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  id            uuid NOT NULL DEFAULT gen_random_uuid(),
   recipient_id  uuid NOT NULL REFERENCES app.accounts(id) ON DELETE CASCADE,
   kind          text NOT NULL,
   ref_type      text NOT NULL,
   ref_id        uuid,
   payload       jsonb NOT NULL DEFAULT '{}'::jsonb,
   is_read       boolean NOT NULL DEFAULT false,
-  created_at    timestamptz NOT NULL DEFAULT now()
-);
+  created_at    timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE IF NOT EXISTS app.notifications_default PARTITION OF app.notifications DEFAULT;
+SELECT app.ensure_month_partitions('app.notifications', now()::date, 3);
 CREATE INDEX IF NOT EXISTS notifications_idx ON app.notifications (recipient_id, is_read);
+CREATE INDEX IF NOT EXISTS notifications_recipient_created_idx ON app.notifications (recipient_id, created_at DESC);
 
 -- Score recompute functions
 CREATE OR REPLACE FUNCTION app.recompute_post_score(p_id uuid) RETURNS void LANGUAGE sql AS $$
@@ -269,29 +416,68 @@ CREATE OR REPLACE FUNCTION app.recompute_reply_score(r_id uuid) RETURNS void LAN
    WHERE r.id = r_id;
 $$;
 
-CREATE OR REPLACE FUNCTION app.vote_after_write() RETURNS trigger LANGUAGE plpgsql AS $$
-BEGIN
-  IF TG_OP = 'DELETE' THEN
-    IF OLD.target_type = 'post' THEN
-      PERFORM app.recompute_post_score(OLD.target_id);
-    ELSE
-      PERFORM app.recompute_reply_score(OLD.target_id);
-    END IF;
-    RETURN NULL;
-  END IF;
+-- Vote triggers apply per-target deltas, aggregated per statement; the
+-- recompute functions above remain for repairs.
+CREATE OR REPLACE FUNCTION app.apply_vote_deltas(p_types text[], p_ids uuid[], p_deltas int[])
+RETURNS void
+LANGUAGE sql
+AS $$
+  UPDATE app.posts p
+     SET score = p.score + d.delta, updated_at = now()
+    FROM unnest(p_types, p_ids, p_deltas) AS d(target_type, target_id, delta)
+   WHERE d.target_type = 'post' AND p.id = d.target_id AND d.delta <> 0;
+  UPDATE app.replies r
+     SET score = r.score + d.delta, updated_at = now()
+    FROM unnest(p_types, p_ids, p_deltas) AS d(target_type, target_id, delta)
+   WHERE d.target_type = 'reply' AND r.id = d.target_id AND d.delta <> 0;
+$$;
 
-  IF NEW.target_type = 'post' THEN
-    PERFORM app.recompute_post_score(NEW.target_id);
+CREATE OR REPLACE FUNCTION app.votes_apply_deltas() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+  v_types text[];
+  v_ids uuid[];
+  v_deltas int[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT array_agg(target_type), array_agg(target_id), array_agg(delta)
+      INTO v_types, v_ids, v_deltas
+      FROM (SELECT target_type, target_id, SUM(value)::int AS delta
+              FROM new_votes GROUP BY target_type, target_id) s;
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT array_agg(target_type), array_agg(target_id), array_agg(delta)
+      INTO v_types, v_ids, v_deltas
+      FROM (SELECT target_type, target_id, -SUM(value)::int AS delta
+              FROM old_votes GROUP BY target_type, target_id) s;
   ELSE
-    PERFORM app.recompute_reply_score(NEW.target_id);
+    SELECT array_agg(target_type), array_agg(target_id), array_agg(delta)
+      INTO v_types, v_ids, v_deltas
+      FROM (SELECT target_type, target_id, SUM(value)::int AS delta
+              FROM (SELECT target_type, target_id, value FROM new_votes
+                    UNION ALL
+                    SELECT target_type, target_id, -value FROM old_votes) changes
+             GROUP BY target_type, target_id) s;
+  END IF;
+  IF v_ids IS NOT NULL THEN
+    PERFORM app.apply_vote_deltas(v_types, v_ids, v_deltas);
   END IF;
   RETURN NULL;
 END$$;
 
-DROP TRIGGER IF EXISTS trg_votes_after_write ON app.votes;
-CREATE TRIGGER trg_votes_after_write
-AFTER INSERT OR UPDATE OR DELETE ON app.votes
-FOR EACH ROW EXECUTE FUNCTION app.vote_after_write();
+DROP TRIGGER IF EXISTS trg_votes_after_insert ON app.votes;
+CREATE TRIGGER trg_votes_after_insert
+AFTER INSERT ON app.votes
+REFERENCING NEW TABLE AS new_votes
+FOR EACH STATEMENT EXECUTE FUNCTION app.votes_apply_deltas();
+DROP TRIGGER IF EXISTS trg_votes_after_update ON app.votes;
+CREATE TRIGGER trg_votes_after_update
+AFTER UPDATE ON app.votes
+REFERENCING OLD TABLE AS old_votes NEW TABLE AS new_votes
+FOR EACH STATEMENT EXECUTE FUNCTION app.votes_apply_deltas();
+DROP TRIGGER IF EXISTS trg_votes_after_delete ON app.votes;
+CREATE TRIGGER trg_votes_after_delete
+AFTER DELETE ON app.votes
+REFERENCING OLD TABLE AS old_votes
+FOR EACH STATEMENT EXECUTE FUNCTION app.votes_apply_deltas();
 
 -- Reply counters
 CREATE OR REPLACE FUNCTION app.bump_reply_count() RETURNS trigger LANGUAGE plpgsql AS $$
@@ -314,6 +500,69 @@ CREATE TRIGGER trg_reply_count_del
 AFTER DELETE ON app.replies
 FOR EACH ROW EXECUTE FUNCTION app.bump_reply_count();
 
+-- Post tag arrays: tag_ids as read by the ?tag= feed filter. The patches
+-- replace refresh_post_tag_arrays with a version that also fills
+-- restricted_tag_ids; it is only created here when missing so re-running this
+-- file keeps that version.
+DO $$
+BEGIN
+  IF to_regprocedure('app.refresh_post_tag_arrays(uuid[])') IS NULL THEN
+    CREATE FUNCTION app.refresh_post_tag_arrays(target_post_ids uuid[])
+    RETURNS void
+    LANGUAGE sql
+    AS $body$
+      UPDATE app.posts p
+      SET tag_ids = agg.tag_ids
+      FROM (
+        SELECT p2.id,
+               COALESCE(array_agg(pt.tag_id ORDER BY pt.tag_id) FILTER (WHERE pt.tag_id IS NOT NULL), '{}') AS tag_ids
+        FROM app.posts p2
+        LEFT JOIN app.post_tags pt ON pt.post_id = p2.id
+        WHERE p2.id = ANY(target_post_ids)
+        GROUP BY p2.id
+      ) agg
+      WHERE p.id = agg.id
+        AND p.tag_ids IS DISTINCT FROM agg.tag_ids;
+    $body$;
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION app.post_tags_refresh_arrays() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    PERFORM app.refresh_post_tag_arrays(ARRAY[OLD.post_id]);
+  ELSE
+    PERFORM app.refresh_post_tag_arrays(ARRAY[NEW.post_id]);
+  END IF;
+  RETURN NULL;
+END$$;
+
+DROP TRIGGER IF EXISTS post_tags_refresh_arrays ON app.post_tags;
+CREATE TRIGGER post_tags_refresh_arrays
+AFTER INSERT OR DELETE ON app.post_tags
+FOR EACH ROW EXECUTE FUNCTION app.post_tags_refresh_arrays();
+
+-- Hot rank: log-scaled score + replies plus a creation-time term (45000 s per
+-- 10x engagement), so ordering decays with age without rewriting old rows.
+CREATE OR REPLACE FUNCTION app.post_hot_rank(score integer, reply_count integer, created_at timestamptz)
+RETURNS double precision LANGUAGE sql IMMUTABLE AS $$
+  SELECT sign(score + reply_count)::double precision
+           * log(greatest(abs(score + reply_count), 1)::double precision)
+         + (extract(epoch FROM created_at)::double precision - 1704067200) / 45000
+$$;
+
+CREATE OR REPLACE FUNCTION app.posts_set_hot_rank() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  NEW.hot_rank := app.post_hot_rank(NEW.score, NEW.reply_count, NEW.created_at);
+  RETURN NEW;
+END$$;
+
+DROP TRIGGER IF EXISTS posts_set_hot_rank ON app.posts;
+CREATE TRIGGER posts_set_hot_rank
+BEFORE INSERT OR UPDATE OF score, reply_count, created_at ON app.posts
+FOR EACH ROW EXECUTE FUNCTION app.posts_set_hot_rank();
+
 -- Audit log
 CREATE TABLE IF NOT EXISTS app.audit_log (
   id          bigserial PRIMARY KEY,
@@ -10,7 +10,7 @@ from starlette.responses import RedirectResponse, FileResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import get_settings
-from .core.db import init_pool, close_pool
+from .core.db import init_pool, close_pool, track_round_trips
 from .core.cache import init_redis, close_redis
 from .core.errors import register_exception_handlers
 from .core.deps import get_current_account_id
@@ -85,6 +85,15 @@ async def security_headers(request, call_next):
     return response
 
 
+@app.middleware("http")
+async def db_round_trips(request, call_next):
+    # Statements outside a pipeline, pipeline batches and commits each count once.
+    with track_round_trips() as round_trips:
+        response = await call_next(request)
+    response.headers["X-DB-Round-Trips"] = str(round_trips[0])
+    return response
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
@@ -1,13 +1,19 @@
+import asyncio
 import os
 import shutil
 import subprocess
 import json
+import time
 import logging
+from dataclasses import asdict, dataclass
 from functools import lru_cache
 from pathlib import Path
+from typing import Awaitable, Callable
 
 from ..core.config import get_settings
 from .language_utils import language_label as _shared_language_label
+from .llm_backends import Backend, get_backend_pool
+from .model_routing import select_model
 
 
 logger = logging.getLogger(__name__)
@@ -27,6 +33,12 @@ if not any(isinstance(h, logging.FileHandler) and getattr(h, "baseFilename", "")
     _FILE_LOGGER.setLevel(logging.INFO)
 
 
+# Receives each partial piece of completion text as it streams in.
+DeltaCallback = Callable[[str], Awaitable[None]]
+# Streaming reads fail when the backend sends nothing for this long.
+STREAM_IDLE_TIMEOUT_SECONDS = 60
+
+
 _CLI_PATH = Path(__file__).resolve().parent.parent.parent / "js" / "ollama_cli.mjs"
 if not _CLI_PATH.exists():
     candidate = Path(__file__).resolve().parents[3] / "backend" / "js" / "ollama_cli.mjs"
@@ -59,6 +71,175 @@ def _resolve_node_command() -> str:
     )
 
 
+def _cli_env(model: str | None = None, backend: Backend | None = None) -> dict[str, str]:
+    settings = get_settings()
+    env = os.environ.copy()
+    base_url = backend.url if backend else settings.ollama_base_url
+    api_key = backend.api_key if backend and backend.api_key else settings.ollama_api_key
+    if base_url:
+        env['OLLAMA_BASE'] = base_url
+    if api_key:
+        env['OLLAMA_API_KEY'] = api_key
+    model = model or settings.ollama_model
+    if model:
+        env['OLLAMA_MODEL'] = model
+    return env
+
+
+@dataclass
+class CompletionUsage:
+    """Accumulates model, latency and token counts over one or more completions."""
+
+    model: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    calls: int = 0
+
+    def add(self, model: str, latency_ms: float, usage: dict | None) -> None:
+        self.model = self.model or model
+        self.latency_ms += latency_ms
+        self.calls += 1
+        usage = usage or {}
+        self.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+        self.completion_tokens += int(usage.get("completion_tokens") or 0)
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["latency_ms"] = round(self.latency_ms, 1)
+        return data
+
+
+async def _run_cli(
+    node_command: str,
+    sequence: list[str],
+    model: str | None,
+    backend: Backend | None,
+) -> tuple[dict, float]:
+    started = time.perf_counter()
+    result = await asyncio.to_thread(
+        subprocess.run,
+        [node_command, str(_CLI_PATH), '--json', json.dumps(sequence)],
+        capture_output=True,
+        text=True,
+        env=_cli_env(model, backend),
+        timeout=60,
+    )
+    latency_ms = (time.perf_counter() - started) * 1000
+
+    if result.returncode != 0:
+        raise Exception(f'CLI error: {result.stderr}')
+
+    try:
+        data = json.loads(result.stdout)
+    except json.JSONDecodeError as exc:
+        raise Exception(f'CLI returned invalid JSON: {result.stdout[:200]}') from exc
+    return data, latency_ms
+
+
+async def _run_cli_stream(
+    node_command: str,
+    sequence: list[str],
+    model: str | None,
+    backend: Backend | None,
+    on_delta: DeltaCallback,
+) -> tuple[dict, float]:
+    """Run the CLI in ``--stream`` mode, forwarding each delta as it is read."""
+    started = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        node_command,
+        str(_CLI_PATH),
+        '--stream',
+        json.dumps(sequence),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_cli_env(model, backend),
+    )
+    data: dict | None = None
+    try:
+        while True:
+            line = await asyncio.wait_for(proc.stdout.readline(), STREAM_IDLE_TIMEOUT_SECONDS)
+            if not line:
+                break
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("done"):
+                data = event
+            elif event.get("delta"):
+                await on_delta(event["delta"])
+        stderr = await proc.stderr.read()
+        returncode = await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    latency_ms = (time.perf_counter() - started) * 1000
+
+    if returncode != 0:
+        raise Exception(f'CLI error: {stderr.decode("utf-8", "replace")}')
+    if data is None:
+        raise Exception('CLI stream ended without a final result')
+    return data, latency_ms
+
+
+async def _run_completion(
+    node_command: str,
+    sequence: list[str],
+    model: str | None,
+    usage: CompletionUsage | None = None,
+    backend_url: str | None = None,
+    on_delta: DeltaCallback | None = None,
+) -> str:
+    """Run one chat completion through the Node CLI in JSON mode and return its text.
+
+    With several ``OLLAMA_BACKENDS`` the request goes to the least loaded healthy
+    backend and is retried once on another backend if it fails. ``backend_url``
+    pins the request to one backend (used by keep-warm). With ``on_delta`` the
+    completion is streamed and each partial piece is passed to it; a request
+    that already streamed output is not retried.
+    """
+    emitted = False
+
+    async def _forward(delta: str) -> None:
+        nonlocal emitted
+        emitted = True
+        await on_delta(delta)
+
+    async def _call(backend: Backend | None) -> tuple[dict, float]:
+        if on_delta is None:
+            return await _run_cli(node_command, sequence, model, backend)
+        return await _run_cli_stream(node_command, sequence, model, backend, _forward)
+
+    pool = get_backend_pool()
+    if pool is None:
+        data, latency_ms = await _call(None)
+    else:
+        pinned = [b for b in pool.backends if b.url == backend_url] if backend_url else []
+        tried: tuple[str, ...] = ()
+        attempts = 1 if pinned else pool.attempts()
+        for attempt in range(attempts):
+            try:
+                if pinned:
+                    async with pool.acquire_backend(pinned[0]) as backend:
+                        data, latency_ms = await _call(backend)
+                else:
+                    async with pool.acquire(exclude=tried) as backend:
+                        tried += (backend.url,)
+                        data, latency_ms = await _call(backend)
+                break
+            except Exception as exc:
+                if attempt + 1 >= attempts or emitted:
+                    raise
+                logger.warning("LLM backend %s failed, retrying on another backend: %s", tried[-1], exc)
+
+    if usage is not None:
+        usage.add(model or get_settings().ollama_model, latency_ms, data.get("usage"))
+    return (data.get("content") or "").strip()
+
+
 def _language_label(code: str) -> str:
     return _shared_language_label(code)
 
@@ -98,13 +279,19 @@ async def translate_text(
     target_language: str,
     return_prompt: bool = False,
     extra_rules: str | None = None,
+    model: str | None = None,
+    usage: CompletionUsage | None = None,
+    on_delta: DeltaCallback | None = None,
 ):
-    settings = get_settings()
-    base_url = settings.ollama_base_url
-    api_key = settings.ollama_api_key
-    model = settings.ollama_model
+    """Translate ``text`` chunk by chunk.
 
+    ``model`` overrides the routing table; pass a ``CompletionUsage`` to
+    collect the model name, latency and token counts of the calls made.
+    ``on_delta`` streams the translation and receives it piece by piece,
+    including the newline that joins consecutive chunks.
+    """
     target_language = (target_language or "en").strip()
+    model = model or select_model("translate", len(text or ""), target_language)
     language_label = _language_label(target_language)
     language_spec = language_label
     if language_label.lower() != target_language.lower():
@@ -125,14 +312,6 @@ async def translate_text(
         rules.append(extra_rules)
 
     try:
-        env = os.environ.copy()
-        if base_url:
-            env['OLLAMA_BASE'] = base_url
-        if api_key:
-            env['OLLAMA_API_KEY'] = api_key
-        if model:
-            env['OLLAMA_MODEL'] = model
-
         translated_chunks: list[str] = []
         first_prompt: str | None = None
         chunks = split_text_into_chunks(text or "")
@@ -159,18 +338,9 @@ async def translate_text(
                 f'user: {prompt}'
             ]
 
-            result = subprocess.run(
-                [node_command, str(_CLI_PATH), json.dumps(sequence)],
-                capture_output=True,
-                text=True,
-                env=env,
-                timeout=60,
-            )
-
-            if result.returncode != 0:
-                raise Exception(f'CLI error: {result.stderr}')
-
-            output = result.stdout.strip()
+            if on_delta is not None and idx > 0:
+                await on_delta("\n")
+            output = await _run_completion(node_command, sequence, model, usage, on_delta=on_delta)
             translated_chunks.append(output)
             # logger.debug(
             #     "Received translation for chunk %d/%d (chars=%d)",
@@ -196,13 +366,20 @@ async def translate_text(
         raise Exception(f'Failed to translate text: {str(e)}')
 
 
-async def summarize_text(text: str, language: str) -> str:
-    settings = get_settings()
-    base_url = settings.ollama_base_url
-    api_key = settings.ollama_api_key
-    model = settings.ollama_model
-
+async def summarize_text(
+    text: str,
+    language: str,
+    model: str | None = None,
+    usage: CompletionUsage | None = None,
+    on_delta: DeltaCallback | None = None,
+) -> str:
+    """Summarize ``text`` in ``language``.
+
+    ``on_delta`` streams the step that produces the final text; for
+    non-English summaries that is the translation pass.
+    """
     language = (language or "en").strip()
+    model = model or select_model("summarize", len(text or ""), language)
     language_label = _language_label(language)
     language_spec = language_label
     if language_label.lower() != language.lower():
@@ -222,34 +399,32 @@ async def summarize_text(text: str, language: str) -> str:
     ]
 
     try:
-        env = os.environ.copy()
-        if base_url:
-            env['OLLAMA_BASE'] = base_url
-        if api_key:
-            env['OLLAMA_API_KEY'] = api_key
-        if model:
-            env['OLLAMA_MODEL'] = model
-
         try:
             node_command = _resolve_node_command()
         except FileNotFoundError as resolve_exc:
             _FILE_LOGGER.error("node resolution failed during summarize: %s", str(resolve_exc), exc_info=True)
             raise Exception(str(resolve_exc)) from resolve_exc
 
-        result = subprocess.run(
-            [node_command, str(_CLI_PATH), json.dumps(sequence)],
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=60,
+        needs_translation = language.lower() not in ("en", "english")
+        summary = await _run_completion(
+            node_command, sequence, model, usage, on_delta=None if needs_translation else on_delta
         )
-
-        if result.returncode != 0:
-            raise Exception(f'CLI error: {result.stderr}')
-
-        summary = result.stdout.strip()
-        if language.lower() not in ("en", "english"):
-            summary = await translate_text(summary, language)
+        if needs_translation:
+            summary = await translate_text(summary, language, usage=usage, on_delta=on_delta)
         return summary
     except Exception as e:
         raise Exception(f'Failed to summarize text: {str(e)}')
+
+
+async def warm_model(model: str | None = None, backend_url: str | None = None) -> float:
+    """Send a minimal completion so the backend keeps ``model`` loaded.
+
+    ``backend_url`` targets one specific backend. Returns the round-trip time in milliseconds.
+    """
+    sequence = [
+        'system: Reply with OK.',
+        'user: ping',
+    ]
+    usage = CompletionUsage()
+    await _run_completion(_resolve_node_command(), sequence, model, usage, backend_url=backend_url)
+    return usage.latency_ms
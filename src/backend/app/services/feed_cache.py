@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_PREFIX = "posts:feed:"
+FEED_GENERATION_KEY = "posts:feed:generation"
+FEED_STATS_KEY = "posts:feed:stats"
+# Short on purpose: the generation counter handles writes, the TTL only bounds
+# how long an unreferenced page lingers after its generation moved on.
+FEED_CACHE_TTL_SECONDS = 60
+
+PUBLIC_LATEST_PREFIX = "posts:public:latest:"
+PUBLIC_LATEST_GENERATION_KEY = "posts:public:generation"
+# The generation handles invalidation; the TTL only clears orphaned bodies.
+PUBLIC_LATEST_TTL_SECONDS = 600
+# The anonymous landing list only changes when posts appear or disappear.
+PUBLIC_LATEST_REASONS = frozenset({"post_created", "post_deleted", "content_imported"})
+
+
+async def feed_generation(redis: Redis) -> int:
+    value = await redis.get(FEED_GENERATION_KEY)
+    return int(value) if value is not None else 0
+
+
+def feed_cache_key(generation: int, filters: dict[str, Any], fingerprint: str) -> str:
+    """Key for one cached feed page.
+
+    ``filters`` holds every request parameter that shapes the page; the access
+    fingerprint stands in for the viewer, so accounts that see the same tags
+    share entries. Bumping the generation orphans every existing key at once.
+    """
+    digest = hashlib.sha1(
+        json.dumps(filters, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()[:20]
+    return f"{FEED_CACHE_PREFIX}{generation}:{digest}:{fingerprint}"
+
+
+async def read_feed_page(redis: Redis, key: str) -> Optional[dict[str, Any]]:
+    """Return the cached page under ``key`` and count the hit or miss."""
+    try:
+        cached = await redis.get(key)
+        await redis.hincrby(FEED_STATS_KEY, "hits" if cached is not None else "misses", 1)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Feed cache read failed", exc_info=True)
+        return None
+    if cached is None:
+        return None
+    try:
+        return json.loads(cached)
+    except ValueError:
+        return None
+
+
+async def store_feed_page(redis: Redis, key: str, page: dict[str, Any]) -> None:
+    try:
+        await redis.set(key, json.dumps(page, default=str), ex=FEED_CACHE_TTL_SECONDS)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Feed cache write failed", exc_info=True)
+
+
+async def public_latest_cache_key(redis: Redis, limit: int) -> Optional[str]:
+    """Key of the cached /posts/public/latest body for ``limit``, or None if Redis failed."""
+    try:
+        generation = await redis.get(PUBLIC_LATEST_GENERATION_KEY)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Public latest generation read failed", exc_info=True)
+        return None
+    return f"{PUBLIC_LATEST_PREFIX}{int(generation or 0)}:{limit}"
+
+
+async def read_public_latest(redis: Redis, key: str) -> Optional[str]:
+    try:
+        return await redis.get(key)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Public latest cache read failed", exc_info=True)
+        return None
+
+
+async def store_public_latest(redis: Redis, key: str, body: str) -> None:
+    try:
+        await redis.set(key, body, ex=PUBLIC_LATEST_TTL_SECONDS)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Public latest cache write failed", exc_info=True)
+
+
+async def bump_feed_generation(redis: Optional[Redis], reason: str) -> None:
+    """Invalidate every cached feed page after a write that can change one.
+
+    Called on post create/delete, reply create and purge, tag attach/detach,
+    tag visibility changes and post votes. Post create/delete also retire the
+    cached public latest list.
+    """
+    if redis is None:
+        return
+    try:
+        await redis.incr(FEED_GENERATION_KEY)
+        if reason in PUBLIC_LATEST_REASONS:
+            await redis.incr(PUBLIC_LATEST_GENERATION_KEY)
+        await redis.hincrby(FEED_STATS_KEY, f"invalidations:{reason}", 1)
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Feed cache invalidation failed", exc_info=True)
+
+
+async def get_feed_cache_metrics(redis: Redis) -> dict[str, Any]:
+    stats = await redis.hgetall(FEED_STATS_KEY) or {}
+    hits = int(stats.get("hits", 0))
+    misses = int(stats.get("misses", 0))
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "generation": await feed_generation(redis),
+        "invalidations": {
+            field.split(":", 1)[1]: int(value)
+            for field, value in stats.items()
+            if field.startswith("invalidations:")
+        },
+    }
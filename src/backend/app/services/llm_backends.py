@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Consecutive request or health-check failures before a backend is taken out.
+FAILURE_THRESHOLD = 3
+# How long an ejected backend is skipped before a request may probe it again.
+EJECT_COOLDOWN_SECONDS = 30
+HEALTH_TIMEOUT_SECONDS = 5
+
+
+@dataclass
+class Backend:
+    url: str
+    weight: float = 1.0
+    api_key: str = ""
+    healthy: bool = True
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    latency_ms_total: float = 0.0
+    last_error: Optional[str] = None
+    _published: dict[str, float] = field(default_factory=dict, repr=False)
+
+    def available(self, now: float) -> bool:
+        # Ejected backends become eligible again after the cooldown (half-open),
+        # so processes without a health loop still recover them.
+        return self.healthy or now >= self.ejected_until
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.weight
+
+
+class BackendPool:
+    """Weighted least-outstanding-requests balancing over LLM endpoints."""
+
+    def __init__(self, backends: list[Backend], health_path: str = "/") -> None:
+        if not backends:
+            raise ValueError("at least one LLM backend is required")
+        self.backends = backends
+        self.health_path = health_path or "/"
+
+    def pick(self, exclude: tuple[str, ...] = ()) -> Backend:
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b.url not in exclude and b.available(now)]
+        if not candidates:
+            # Everything is down: still try the least loaded rather than failing outright.
+            candidates = [b for b in self.backends if b.url not in exclude] or self.backends
+        return min(candidates, key=lambda b: (b.load(), b.consecutive_failures))
+
+    def attempts(self) -> int:
+        now = time.monotonic()
+        return max(1, min(2, sum(1 for b in self.backends if b.available(now))))
+
+    def acquire(self, exclude: tuple[str, ...] = ()):
+        """Reserve the best backend for one request and account its outcome."""
+        return self.acquire_backend(self.pick(exclude))
+
+    @asynccontextmanager
+    async def acquire_backend(self, backend: Backend) -> AsyncIterator[Backend]:
+        backend.outstanding += 1
+        started = time.perf_counter()
+        try:
+            yield backend
+        except Exception as exc:
+            self.mark_failure(backend, str(exc))
+            raise
+        else:
+            self.mark_success(backend, (time.perf_counter() - started) * 1000)
+        finally:
+            backend.outstanding -= 1
+
+    def mark_success(self, backend: Backend, latency_ms: float) -> None:
+        backend.requests += 1
+        backend.latency_ms_total += latency_ms
+        backend.consecutive_failures = 0
+        if not backend.healthy:
+            logger.info("LLM backend %s is healthy again", backend.url)
+        backend.healthy = True
+
+    def mark_failure(self, backend: Backend, error: str) -> None:
+        backend.requests += 1
+        backend.errors += 1
+        backend.last_error = error[:500]
+        self._failed(backend)
+
+    def _failed(self, backend: Backend) -> None:
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= FAILURE_THRESHOLD or not backend.healthy:
+            if backend.healthy:
+                logger.warning("Taking LLM backend %s out of rotation: %s", backend.url, backend.last_error)
+            backend.healthy = False
+            backend.ejected_until = time.monotonic() + EJECT_COOLDOWN_SECONDS
+
+    async def check(self, client: Optional[httpx.AsyncClient] = None) -> None:
+        """Probe every backend once; any HTTP answer below 500 counts as alive."""
+        own_client = client is None
+        client = client or httpx.AsyncClient(timeout=HEALTH_TIMEOUT_SECONDS)
+        try:
+            await asyncio.gather(*(self._check_one(client, backend) for backend in self.backends))
+        finally:
+            if own_client:
+                await client.aclose()
+
+    async def _check_one(self, client: httpx.AsyncClient, backend: Backend) -> None:
+        headers = {"Authorization": f"Bearer {backend.api_key}"} if backend.api_key else {}
+        try:
+            response = await client.get(backend.url.rstrip("/") + self.health_path, headers=headers)
+            if response.status_code >= 500:
+                raise RuntimeError(f"health check returned {response.status_code}")
+        except Exception as exc:  # pylint: disable=broad-except
+            backend.last_error = f"health: {exc}"[:500]
+            self._failed(backend)
+        else:
+            backend.consecutive_failures = 0
+            if not backend.healthy:
+                logger.info("LLM backend %s passed health check; back in rotation", backend.url)
+            backend.healthy = True
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "url": b.url,
+                "weight": b.weight,
+                "healthy": b.healthy,
+                "outstanding": b.outstanding,
+                "requests": b.requests,
+                "errors": b.errors,
+                "avg_latency_ms": round(b.latency_ms_total / (b.requests - b.errors), 1)
+                if b.requests > b.errors
+                else None,
+                "last_error": b.last_error,
+            }
+            for b in self.backends
+        ]
+
+    def drain_counters(self) -> list[tuple[Backend, dict[str, float]]]:
+        """Counter increments since the previous call, for publishing to shared storage."""
+        drained: list[tuple[Backend, dict[str, float]]] = []
+        for backend in self.backends:
+            current = {
+                "requests": backend.requests,
+                "errors": backend.errors,
+                "latency_ms_total": backend.latency_ms_total,
+            }
+            delta = {key: value - backend._published.get(key, 0) for key, value in current.items()}
+            backend._published = current
+            drained.append((backend, delta))
+        return drained
+
+
+def parse_backends(raw: str, default_url: str = "", default_api_key: str = "") -> list[Backend]:
+    """Parse ``OLLAMA_BACKENDS``: a JSON list of URLs or ``{"url", "weight", "api_key"}`` objects."""
+    backends: list[Backend] = []
+    if raw and raw.strip():
+        entries = json.loads(raw)
+        if not isinstance(entries, list):
+            raise ValueError("OLLAMA_BACKENDS must be a JSON list")
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"url": entry}
+            if not isinstance(entry, dict) or not entry.get("url"):
+                raise ValueError(f"Invalid LLM backend: {entry!r}")
+            weight = float(entry["weight"]) if entry.get("weight") is not None else 1.0
+            if weight <= 0:
+                raise ValueError(f"LLM backend weight must be positive: {entry!r}")
+            backends.append(
+                Backend(
+                    url=str(entry["url"]).rstrip("/"),
+                    weight=weight,
+                    api_key=str(entry.get("api_key") or default_api_key),
+                )
+            )
+    elif default_url:
+        backends.append(Backend(url=default_url.rstrip("/"), api_key=default_api_key))
+    return backends
+
+
+@lru_cache(maxsize=1)
+def get_backend_pool() -> Optional[BackendPool]:
+    settings = get_settings()
+    try:
+        backends = parse_backends(settings.ollama_backends, settings.ollama_base_url, settings.ollama_api_key)
+    except (ValueError, TypeError) as exc:
+        logger.error("Ignoring invalid OLLAMA_BACKENDS: %s", exc)
+        backends = parse_backends("", settings.ollama_base_url, settings.ollama_api_key)
+    if not backends:
+        return None
+    return BackendPool(backends, health_path=settings.ollama_health_path)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from ..core.config import get_settings
+from .language_utils import normalize_code
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """One routing rule; ``None`` fields match anything. The first matching rule wins."""
+
+    model: str
+    mode: Optional[str] = None
+    min_chars: int = 0
+    max_chars: Optional[int] = None
+    langs: Optional[frozenset[str]] = None
+
+    def matches(self, mode: str, text_length: int, target_lang: str) -> bool:
+        if self.mode and self.mode != mode:
+            return False
+        if text_length < self.min_chars:
+            return False
+        if self.max_chars is not None and text_length > self.max_chars:
+            return False
+        if self.langs and target_lang not in self.langs:
+            return False
+        return True
+
+
+def parse_routes(raw: str) -> tuple[ModelRoute, ...]:
+    """Parse the ``OLLAMA_MODEL_ROUTES`` JSON list.
+
+    Example::
+
+        [{"mode": "translate", "max_chars": 200, "model": "gemma3:1b"},
+         {"langs": ["ja", "zh", "ko"], "model": "qwen2.5:14b"},
+         {"mode": "summarize", "model": "llama3:8b-instruct"}]
+    """
+    if not raw or not raw.strip():
+        return ()
+    entries = json.loads(raw)
+    if not isinstance(entries, list):
+        raise ValueError("OLLAMA_MODEL_ROUTES must be a JSON list")
+    routes: list[ModelRoute] = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("model"):
+            raise ValueError(f"Invalid model route: {entry!r}")
+        mode = entry.get("mode")
+        langs = entry.get("langs")
+        max_chars = entry.get("max_chars")
+        routes.append(
+            ModelRoute(
+                model=str(entry["model"]),
+                mode=None if mode in (None, "", "*") else str(mode),
+                min_chars=int(entry.get("min_chars") or 0),
+                max_chars=int(max_chars) if max_chars is not None else None,
+                langs=frozenset(normalize_code(code) for code in langs) if langs else None,
+            )
+        )
+    return tuple(routes)
+
+
+@lru_cache(maxsize=1)
+def get_routes() -> tuple[ModelRoute, ...]:
+    raw = get_settings().ollama_model_routes
+    try:
+        return parse_routes(raw)
+    except (ValueError, TypeError) as exc:
+        logger.error("Ignoring invalid OLLAMA_MODEL_ROUTES: %s", exc)
+        return ()
+
+
+def select_model(mode: str, text_length: int, target_lang: str | None) -> str:
+    """Pick the model for a job by mode, source length and target language."""
+    lang = normalize_code(target_lang)
+    for route in get_routes():
+        if route.matches(mode, text_length, lang):
+            return route.model
+    return get_settings().ollama_model
+
+
+def routed_models() -> list[str]:
+    """Every model a request may be routed to, default model first."""
+    models = [get_settings().ollama_model] + [route.model for route in get_routes()]
+    return list(dict.fromkeys(m for m in models if m))
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any, Optional, Sequence
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+POSTS_COUNT_PREFIX = "posts:count:"
+COUNT_CACHE_TTL_SECONDS = 30
+# Below this planner estimate an exact count is cheap enough to run instead.
+ESTIMATE_EXACT_BELOW = 5000
+
+
+def posts_count_cache_key(
+    *,
+    tags: Optional[Sequence[str]],
+    bookmarked_by: Optional[str],
+    query: Optional[str],
+    fingerprint: str,
+    window: Optional[str] = None,
+) -> str:
+    """Cache key for a feed total: the filter plus the viewer's access fingerprint.
+
+    Bookmark feeds are per account, so the account id is part of their filter.
+    """
+    filters = json.dumps(
+        {"tags": sorted(tags or []), "bookmarked_by": bookmarked_by, "q": query or "", "window": window},
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha1(filters.encode("utf-8")).hexdigest()[:20]
+    return f"{POSTS_COUNT_PREFIX}{digest}:{fingerprint}"
+
+
+async def _exact_count(pool, inner_sql: str, params: Sequence[Any]) -> int:
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(f"SELECT COUNT(*) FROM ({inner_sql}) x", tuple(params))
+            return int((await cur.fetchone())[0])
+
+
+async def _estimated_count(pool, inner_sql: str, params: Sequence[Any]) -> int:
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(f"EXPLAIN (FORMAT JSON) {inner_sql}", tuple(params))
+            plan = (await cur.fetchone())[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def resolve_posts_total(
+    pool,
+    redis: Optional[Redis],
+    inner_sql: str,
+    params: Sequence[Any],
+    *,
+    mode: str = "cached",
+    cache_key: Optional[str] = None,
+) -> tuple[int, bool]:
+    """Return ``(total, is_estimate)`` for the rows selected by ``inner_sql``.
+
+    ``exact`` always counts; ``cached`` serves a count shared for
+    ``COUNT_CACHE_TTL_SECONDS`` under ``cache_key``; ``estimated`` uses the
+    planner's row estimate when it is large and counts otherwise.
+    """
+    if mode == "estimated":
+        estimate = await _estimated_count(pool, inner_sql, params)
+        if estimate >= ESTIMATE_EXACT_BELOW:
+            return estimate, True
+        return await _exact_count(pool, inner_sql, params), False
+
+    if mode == "cached" and redis is not None and cache_key:
+        try:
+            cached = await redis.get(cache_key)
+            if cached is not None:
+                return int(cached), False
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Post count cache read failed", exc_info=True)
+        total = await _exact_count(pool, inner_sql, params)
+        try:
+            await redis.set(cache_key, total, ex=COUNT_CACHE_TTL_SECONDS)
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Post count cache write failed", exc_info=True)
+        return total, False
+
+    return await _exact_count(pool, inner_sql, params), False
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_PREFIX = "ratelimit:"
+# Day buckets outlive their day so the writeback can still settle yesterday.
+RATE_LIMIT_COUNTER_TTL_SECONDS = 2 * 86400
+# How long a user_limits override (or the default) is trusted before re-reading it.
+RATE_LIMIT_LIMIT_TTL_SECONDS = 300
+
+# Quota kinds and their app.user_limits / app.rate_limits columns.
+QUOTA_COLUMNS = {
+    "posts": ("max_posts_per_day", "posts_count"),
+    "replies": ("max_replies_per_day", "replies_count"),
+}
+
+# KEYS[1] counter; ARGV limit, ttl, seed. A missing counter is created from
+# ``seed`` (today's app.rate_limits count) or reported with -2 when no seed
+# was given. Returns -1 at the limit, otherwise the new count.
+_CONSUME_QUOTA_LUA = """
+local count = redis.call('GET', KEYS[1])
+if not count then
+  if ARGV[3] == '' then
+    return -2
+  end
+  redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[2], 'NX')
+  count = redis.call('GET', KEYS[1])
+end
+if tonumber(count) >= tonumber(ARGV[1]) then
+  return -1
+end
+return redis.call('INCR', KEYS[1])
+"""
+
+QUOTA_SQL = """
+  SELECT COALESCE((SELECT ul.{limit_column} FROM app.user_limits ul WHERE ul.account_id = %s), %s),
+         COALESCE((SELECT rl.{count_column} FROM app.rate_limits rl
+                   WHERE rl.account_id = %s AND rl.day_utc = %s::date), 0)
+"""
+
+
+def utc_day() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def quota_counter_key(kind: str, day: str, account_id: str) -> str:
+    return f"{RATE_LIMIT_PREFIX}{kind}:{day}:{account_id}"
+
+
+def quota_limit_key(kind: str, account_id: str) -> str:
+    return f"{RATE_LIMIT_PREFIX}limit:{kind}:{account_id}"
+
+
+async def consume_daily_quota(
+    redis: Optional[Redis], pool, account_id: str, kind: str, default_max: int
+) -> Optional[bool]:
+    """Count one post or reply against today's limit, atomically in Redis.
+
+    Returns False at the limit (nothing counted) and None when Redis is not
+    available; the caller then enforces the limit in SQL instead.
+    """
+    if redis is None:
+        return None
+    day = utc_day()
+    counter_key = quota_counter_key(kind, day, account_id)
+    limit_key = quota_limit_key(kind, account_id)
+    try:
+        limit = await redis.get(limit_key)
+        if limit is not None:
+            result = await redis.eval(_CONSUME_QUOTA_LUA, 1, counter_key, limit, RATE_LIMIT_COUNTER_TTL_SECONDS, "")
+            if int(result) != -2:
+                return int(result) >= 0
+        limit_column, count_column = QUOTA_COLUMNS[kind]
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    QUOTA_SQL.format(limit_column=limit_column, count_column=count_column),
+                    (account_id, default_max, account_id, day),
+                )
+                limit, used = await cur.fetchone()
+        await redis.set(limit_key, int(limit), ex=RATE_LIMIT_LIMIT_TTL_SECONDS)
+        result = await redis.eval(
+            _CONSUME_QUOTA_LUA, 1, counter_key, int(limit), RATE_LIMIT_COUNTER_TTL_SECONDS, int(used)
+        )
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Redis rate limit failed; falling back to SQL", exc_info=True)
+        return None
+    return int(result) >= 0
+
+
+async def release_daily_quota(redis: Redis, account_id: str, kind: str) -> None:
+    """Give back a unit taken by consume_daily_quota when the write did not happen."""
+    try:
+        await redis.decr(quota_counter_key(kind, utc_day(), account_id))
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Rate limit release failed", exc_info=True)
+
+
+WRITEBACK_SQL = """
+  INSERT INTO app.rate_limits (account_id, day_utc, posts_count, replies_count)
+  SELECT c.* FROM unnest(%s::uuid[], %s::date[], %s::int[], %s::int[]) AS c(account_id, day_utc, posts, replies)
+  WHERE EXISTS (SELECT 1 FROM app.accounts a WHERE a.id = c.account_id)
+  ON CONFLICT (account_id, day_utc) DO UPDATE
+  SET posts_count = GREATEST(app.rate_limits.posts_count, EXCLUDED.posts_count),
+      replies_count = GREATEST(app.rate_limits.replies_count, EXCLUDED.replies_count)
+"""
+
+
+async def write_back_counters(pool, redis: Redis, days: list[str]) -> int:
+    """Copy the Redis day counters of ``days`` into app.rate_limits; returns rows written.
+
+    Counts only ever grow here, so writes made by the SQL fallback are kept.
+    """
+    counts: dict[tuple[str, str], list[int]] = {}
+    for day in days:
+        for index, kind in enumerate(QUOTA_COLUMNS):
+            keys = [key async for key in redis.scan_iter(match=quota_counter_key(kind, day, "*"), count=500)]
+            if not keys:
+                continue
+            values = await redis.mget(keys)
+            for key, value in zip(keys, values):
+                if value is None:
+                    continue
+                account_id = key.rsplit(":", 1)[1]
+                counts.setdefault((account_id, day), [0, 0])[index] = int(value)
+    if not counts:
+        return 0
+    rows = [(account_id, day, posts, replies) for (account_id, day), (posts, replies) in counts.items()]
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(WRITEBACK_SQL, [list(column) for column in zip(*rows)])
+    return len(rows)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from redis.asyncio import Redis
+
+METRICS_KEY = "translation_worker:metrics"
+MODELS_KEY = "translation_worker:models"
+MODEL_METRICS_PREFIX = "translation_worker:model:"
+BACKENDS_KEY = "translation_worker:backends"
+BACKEND_METRICS_PREFIX = "translation_worker:backend:"
+_TEXT_FIELDS = {"last_job_at", "last_keep_warm_at", "last_keep_warm_model", "keep_warm_active"}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def record_job(
+    redis: Redis,
+    *,
+    mode: str,
+    latency_ms: float,
+    cold: bool,
+    ok: bool,
+    model: str | None = None,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    llm_latency_ms: float | None = None,
+) -> None:
+    """Account one processed job; ``cold`` marks a model that had been idle long enough to unload."""
+    temperature = "cold" if cold else "warm"
+    pipe = redis.pipeline(transaction=False)
+    if model:
+        model_key = f"{MODEL_METRICS_PREFIX}{model}"
+        pipe.sadd(MODELS_KEY, model)
+        pipe.hincrby(model_key, "jobs", 1)
+        if not ok:
+            pipe.hincrby(model_key, "failed", 1)
+        pipe.hincrbyfloat(model_key, "latency_ms_total", round(llm_latency_ms if llm_latency_ms is not None else latency_ms, 3))
+        pipe.hincrby(model_key, "prompt_tokens", int(prompt_tokens or 0))
+        pipe.hincrby(model_key, "completion_tokens", int(completion_tokens or 0))
+    pipe.hincrby(METRICS_KEY, "jobs_total", 1)
+    pipe.hincrby(METRICS_KEY, f"jobs_{mode}", 1)
+    if not ok:
+        pipe.hincrby(METRICS_KEY, "jobs_failed", 1)
+    pipe.hincrby(METRICS_KEY, f"jobs_{temperature}", 1)
+    pipe.hincrbyfloat(METRICS_KEY, f"latency_ms_{temperature}_total", round(latency_ms, 3))
+    pipe.hset(METRICS_KEY, "last_job_at", _now_iso())
+    await pipe.execute()
+
+
+async def record_keep_warm(redis: Redis, *, model: str, latency_ms: float | None, ok: bool) -> None:
+    pipe = redis.pipeline(transaction=False)
+    if ok:
+        pipe.hincrby(METRICS_KEY, "keep_warm_pings", 1)
+        pipe.hincrbyfloat(METRICS_KEY, "keep_warm_latency_ms_total", round(latency_ms or 0.0, 3))
+    else:
+        pipe.hincrby(METRICS_KEY, "keep_warm_failures", 1)
+    pipe.hset(METRICS_KEY, mapping={"last_keep_warm_at": _now_iso(), "last_keep_warm_model": model})
+    await pipe.execute()
+
+
+async def set_keep_warm_state(redis: Redis, active: bool) -> None:
+    await redis.hset(METRICS_KEY, "keep_warm_active", "1" if active else "0")
+
+
+async def record_backend_stats(redis: Redis, pool: Any) -> None:
+    """Publish an LLM ``BackendPool``: counter increments since the last call plus current health."""
+    pipe = redis.pipeline(transaction=False)
+    for backend, delta in pool.drain_counters():
+        key = f"{BACKEND_METRICS_PREFIX}{backend.url}"
+        pipe.sadd(BACKENDS_KEY, backend.url)
+        pipe.hincrby(key, "requests", int(delta["requests"]))
+        pipe.hincrby(key, "errors", int(delta["errors"]))
+        pipe.hincrbyfloat(key, "latency_ms_total", round(delta["latency_ms_total"], 3))
+        pipe.hset(
+            key,
+            mapping={
+                "healthy": "1" if backend.healthy else "0",
+                "weight": backend.weight,
+                "outstanding": backend.outstanding,
+                "last_error": backend.last_error or "",
+                "updated_at": _now_iso(),
+            },
+        )
+    await pipe.execute()
+
+
+def _as_number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+async def get_metrics(redis: Redis) -> dict[str, Any]:
+    """Return raw counters plus derived averages for the admin dashboard."""
+    raw = await redis.hgetall(METRICS_KEY)
+    metrics: dict[str, Any] = {}
+    for key, value in raw.items():
+        if key in _TEXT_FIELDS:
+            metrics[key] = value
+        else:
+            number = _as_number(value)
+            metrics[key] = int(number) if number.is_integer() else number
+
+    def _avg(total_key: str, count_key: str) -> float | None:
+        count = _as_number(raw.get(count_key))
+        if not count:
+            return None
+        return round(_as_number(raw.get(total_key)) / count, 1)
+
+    avg_cold = _avg("latency_ms_cold_total", "jobs_cold")
+    avg_warm = _avg("latency_ms_warm_total", "jobs_warm")
+    metrics["avg_latency_ms_cold"] = avg_cold
+    metrics["avg_latency_ms_warm"] = avg_warm
+    metrics["cold_start_penalty_ms"] = (
+        round(avg_cold - avg_warm, 1) if avg_cold is not None and avg_warm is not None else None
+    )
+    metrics["avg_keep_warm_latency_ms"] = _avg("keep_warm_latency_ms_total", "keep_warm_pings")
+    metrics["models"] = await get_model_metrics(redis)
+    metrics["backends"] = await get_backend_metrics(redis)
+    return metrics
+
+
+async def get_model_metrics(redis: Redis) -> dict[str, dict[str, Any]]:
+    models: dict[str, dict[str, Any]] = {}
+    for model in sorted(await redis.smembers(MODELS_KEY)):
+        raw = await redis.hgetall(f"{MODEL_METRICS_PREFIX}{model}")
+        jobs = int(_as_number(raw.get("jobs")))
+        models[model] = {
+            "jobs": jobs,
+            "failed": int(_as_number(raw.get("failed"))),
+            "prompt_tokens": int(_as_number(raw.get("prompt_tokens"))),
+            "completion_tokens": int(_as_number(raw.get("completion_tokens"))),
+            "avg_latency_ms": round(_as_number(raw.get("latency_ms_total")) / jobs, 1) if jobs else None,
+        }
+    return models
+
+
+async def get_backend_metrics(redis: Redis) -> dict[str, dict[str, Any]]:
+    backends: dict[str, dict[str, Any]] = {}
+    for url in sorted(await redis.smembers(BACKENDS_KEY)):
+        raw = await redis.hgetall(f"{BACKEND_METRICS_PREFIX}{url}")
+        requests = int(_as_number(raw.get("requests")))
+        errors = int(_as_number(raw.get("errors")))
+        succeeded = requests - errors
+        backends[url] = {
+            "healthy": raw.get("healthy") == "1",
+            "weight": _as_number(raw.get("weight")) or 1.0,
+            "outstanding": int(_as_number(raw.get("outstanding"))),
+            "requests": requests,
+            "errors": errors,
+            "avg_latency_ms": round(_as_number(raw.get("latency_ms_total")) / succeeded, 1) if succeeded > 0 else None,
+            "last_error": raw.get("last_error") or None,
+            "updated_at": raw.get("updated_at"),
+        }
+    return backends
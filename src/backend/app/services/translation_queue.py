@@ -9,6 +9,7 @@ from redis.asyncio import Redis
 
 QUEUE_NAME = "translation_jobs"
 JOB_HASH_PREFIX = "translation_job:"
+JOB_EVENTS_PREFIX = "translation_job_events:"
 DEFAULT_TTL_SECONDS = 60 * 60  # 1 hour
 
 
@@ -68,6 +69,15 @@ async def enqueue_translation_job(
     return job_id
 
 
+def job_events_channel(job_id: str) -> str:
+    return f"{JOB_EVENTS_PREFIX}{job_id}"
+
+
+async def publish_job_event(redis: Redis, job_id: str, event: Mapping[str, Any]) -> None:
+    """Publish a progress event (``status`` or streamed ``delta``) for ``job_id``."""
+    await redis.publish(job_events_channel(job_id), json.dumps(dict(event)))
+
+
 def _safe_int(value: Any) -> Optional[int]:
     try:
         return int(value)  # type: ignore[arg-type]
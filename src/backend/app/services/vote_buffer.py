@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+VOTE_MARKER_PREFIX = "votes:cast:"
+VOTE_BUFFER_KEY = "votes:buffer"
+# Markers only have to outlive the flush; afterwards app.votes enforces
+# one vote per account through its primary key.
+VOTE_MARKER_TTL_SECONDS = 3600
+
+# Claim the (account, target) marker and queue the vote in one step, so a
+# vote is either buffered with its marker or not at all.
+_BUFFER_VOTE_LUA = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+  redis.call('RPUSH', KEYS[2], ARGV[3])
+  return 1
+end
+return 0
+"""
+
+# Rows that can no longer be inserted (account hard-deleted since the vote,
+# values that fail the table checks) are dropped here; otherwise one of them
+# would fail the batch on every pass and block the rest of the buffer.
+FLUSH_VOTES_SQL = """
+  INSERT INTO app.votes (account_id, target_type, target_id, value, created_at)
+  SELECT v.* FROM unnest(%s::uuid[], %s::text[], %s::uuid[], %s::smallint[], %s::timestamptz[])
+    AS v(account_id, target_type, target_id, value, created_at)
+  WHERE v.target_type IN ('post', 'reply') AND v.value IN (-1, 1)
+    AND EXISTS (SELECT 1 FROM app.accounts a WHERE a.id = v.account_id)
+  ON CONFLICT DO NOTHING
+  RETURNING target_type
+"""
+
+
+def vote_marker_key(target_type: str, target_id: str, account_id: str) -> str:
+    return f"{VOTE_MARKER_PREFIX}{target_type}:{target_id}:{account_id}"
+
+
+async def buffer_vote(
+    redis: Redis, account_id: str, target_type: str, target_id: str, value: int, cast_at: str
+) -> Optional[bool]:
+    """Queue a vote for the flusher.
+
+    Returns False if the account already has a buffered vote on the target and
+    None if Redis failed, in which case the caller writes the vote directly.
+    """
+    entry = json.dumps(
+        {"account_id": account_id, "target_type": target_type, "target_id": target_id, "value": value, "cast_at": cast_at},
+        separators=(",", ":"),
+    )
+    try:
+        queued = await redis.eval(
+            _BUFFER_VOTE_LUA,
+            2,
+            vote_marker_key(target_type, target_id, account_id),
+            VOTE_BUFFER_KEY,
+            str(value),
+            VOTE_MARKER_TTL_SECONDS,
+            entry,
+        )
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Vote buffering failed", exc_info=True)
+        return None
+    return bool(queued)
+
+
+async def pending_vote_value(
+    redis: Optional[Redis], target_type: str, target_id: str, account_id: str
+) -> Optional[int]:
+    """Value of a buffered vote that may not have reached app.votes yet."""
+    if redis is None:
+        return None
+    try:
+        value = await redis.get(vote_marker_key(target_type, target_id, account_id))
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Vote marker read failed", exc_info=True)
+        return None
+    return int(value) if value is not None else None
+
+
+async def pending_vote_values(
+    redis: Optional[Redis], target_type: str, target_ids: list[str], account_id: str
+) -> dict[str, int]:
+    """Buffered votes of ``account_id`` on ``target_ids``, by target id."""
+    if redis is None or not target_ids:
+        return {}
+    try:
+        values = await redis.mget([vote_marker_key(target_type, t, account_id) for t in target_ids])
+    except Exception:  # pylint: disable=broad-except
+        logger.debug("Vote marker read failed", exc_info=True)
+        return {}
+    return {t: int(v) for t, v in zip(target_ids, values) if v is not None}
+
+
+async def flush_vote_buffer(pool, redis: Redis, batch_size: int) -> tuple[int, int, bool]:
+    """Move up to ``batch_size`` buffered votes into app.votes.
+
+    Returns (entries taken, votes inserted, whether any post vote landed). The
+    entries are removed from the buffer only after the insert committed;
+    replaying a batch after a crash is harmless because conflicts are skipped.
+    Run a single flusher at a time.
+    """
+    raw = await redis.lrange(VOTE_BUFFER_KEY, 0, batch_size - 1)
+    if not raw:
+        return 0, 0, False
+    columns: tuple[list, ...] = ([], [], [], [], [])
+    for item in raw:
+        try:
+            entry = json.loads(item)
+            row = (
+                str(uuid.UUID(entry["account_id"])),
+                entry["target_type"],
+                str(uuid.UUID(entry["target_id"])),
+                int(entry["value"]),
+                datetime.fromisoformat(entry["cast_at"]).isoformat(),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.warning("Dropping malformed buffered vote: %r", item)
+            continue
+        for column, value in zip(columns, row):
+            column.append(value)
+    inserted: list = []
+    if columns[0]:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(FLUSH_VOTES_SQL, columns)
+                inserted = await cur.fetchall()
+    await redis.ltrim(VOTE_BUFFER_KEY, len(raw), -1)
+    return len(raw), len(inserted), any(row[0] == "post" for row in inserted)
@@ -0,0 +1,413 @@
+"""Bulk-load posts, replies, tags and votes from NDJSON or CSV files.
+
+For migrations from other forums and benchmark datasets. Run from the project
+root, e.g.::
+
+    python -m src.backend.app.workers.content_import --source oldforum \\
+        --tags tags.ndjson --posts posts.ndjson --replies replies.csv --votes votes.ndjson
+    python -m src.backend.app.workers.content_import --posts posts.csv --dry-run
+    python -m src.backend.app.workers.content_import --replies big.ndjson --suspend-triggers
+
+Files are streamed with COPY into temporary staging tables and merged into
+``app.*`` with a handful of set-based statements, all in one transaction;
+nothing passes through the API, its rate limits or per-post auto-tagging.
+Vote scores come from the statement-level vote triggers, i.e. one update per
+target.
+
+By default the reply_count and tag array row triggers fire for every imported
+row, and the import only locks the rows it writes (plus the posts whose
+reply_count it bumps). With ``--suspend-triggers`` they are disabled for the
+transaction and both are computed once at the end, which is much faster for
+large imports but takes a lock on ``app.replies`` and ``app.post_tags`` that
+blocks every reply and tag attach on the live site until the import commits.
+
+Records (CSV headers or NDJSON keys; ``*`` required):
+
+- tags: ``slug*``, ``label``, ``domain``
+- posts: ``id*``, ``author*``, ``title*``, ``body_md*``, ``lang``,
+  ``visibility``, ``created_at``, ``tags`` (list or comma-separated slugs)
+- replies: ``id*``, ``post_id*``, ``author*``, ``body_md*``, ``parent_id``,
+  ``lang``, ``created_at``
+- votes: ``voter*``, ``target_type*`` (post/reply), ``target_id*``,
+  ``value*`` (1/-1), ``created_at``
+
+``id``/``post_id``/``parent_id``/``target_id`` are ids of the source system.
+UUIDs are kept; other ids map to a UUID derived from ``--source`` and the id,
+so re-running an import skips what is already there. Authors and voters are
+account handles; unknown handles are skipped unless ``--create-accounts`` is
+given (created without email or password). Rows that do not resolve, or
+whose ``created_at`` does not parse as a timestamp, are skipped and reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, Optional
+
+import psycopg
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..services.feed_cache import bump_feed_generation
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Staging columns per record kind, in COPY order; every column is text and
+# cast during the merge, so COPY never rejects a value.
+STAGING_COLUMNS = {
+    "tags": ("slug", "label", "domain"),
+    "posts": ("id", "author", "title", "body_md", "lang", "visibility", "created_at", "tags"),
+    "replies": ("id", "post_id", "parent_id", "author", "body_md", "lang", "created_at"),
+    "votes": ("voter", "target_type", "target_id", "value", "created_at"),
+}
+
+# Row triggers replaced by one set-based recount at the end of the import
+# with --suspend-triggers.
+SUSPENDED_TRIGGERS = (
+    ("replies", "trg_reply_count_ins"),
+    ("post_tags", "post_tags_refresh_arrays"),
+)
+
+# Source ids that are UUIDs are kept, anything else maps to a stable UUID per
+# --source, kind and id.
+IMPORT_ID_FUNCTION_SQL = """
+  CREATE OR REPLACE FUNCTION pg_temp.import_id(kind text, ext text) RETURNS uuid LANGUAGE sql STABLE AS $$
+    SELECT CASE
+      WHEN ext ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN ext::uuid
+      ELSE md5(current_setting('app.import_source') || ':' || kind || ':' || ext)::uuid
+    END
+  $$
+"""
+
+# created_at as timestamptz, or NULL when it does not parse; a direct cast
+# would abort the whole import on one bad value. Rows with a non-empty
+# created_at that does not parse are rejected and counted.
+IMPORT_TS_FUNCTION_SQL = """
+  CREATE OR REPLACE FUNCTION pg_temp.import_ts(value text) RETURNS timestamptz LANGUAGE plpgsql STABLE AS $$
+  BEGIN
+    RETURN value::timestamptz;
+  EXCEPTION WHEN others THEN
+    RETURN NULL;
+  END
+  $$
+"""
+
+COUNT_BAD_TIMESTAMPS_SQL = """
+  SELECT count(*) FROM import_{kind}
+  WHERE NULLIF(created_at, '') IS NOT NULL AND pg_temp.import_ts(created_at) IS NULL
+"""
+
+CREATE_ACCOUNTS_SQL = """
+  INSERT INTO app.accounts (handle, display_name)
+  SELECT DISTINCT ON (lower(h.handle)) h.handle, h.handle
+  FROM (
+    SELECT btrim(author) FROM import_posts
+    UNION ALL SELECT btrim(author) FROM import_replies
+    UNION ALL SELECT btrim(voter) FROM import_votes
+  ) h(handle)
+  WHERE h.handle <> ''
+  ORDER BY lower(h.handle)
+  ON CONFLICT (handle) DO NOTHING
+"""
+
+RESOLVE_POSTS_SQL = """
+  CREATE TEMP TABLE import_post_rows ON COMMIT DROP AS
+  SELECT DISTINCT ON (pg_temp.import_id('post', s.id))
+         pg_temp.import_id('post', s.id) AS id,
+         a.id AS author_id,
+         a.handle::text AS handle,
+         s.title,
+         s.body_md,
+         COALESCE(NULLIF(s.lang, ''), 'en') AS lang,
+         CASE WHEN s.visibility IN ('logged_in', 'private', 'unlisted') THEN s.visibility ELSE 'logged_in' END AS visibility,
+         COALESCE(pg_temp.import_ts(NULLIF(s.created_at, '')), now()) AS created_at,
+         COALESCE(string_to_array(NULLIF(s.tags, ''), ','), '{}') AS tags
+  FROM import_posts s
+  JOIN app.accounts a ON a.handle = btrim(s.author)::citext
+  WHERE NULLIF(s.id, '') IS NOT NULL AND s.title IS NOT NULL AND s.body_md IS NOT NULL
+    AND (NULLIF(s.created_at, '') IS NULL OR pg_temp.import_ts(s.created_at) IS NOT NULL)
+  ORDER BY pg_temp.import_id('post', s.id)
+"""
+
+# Explicit tag records win over slugs only referenced by posts; author handle
+# tags are created as create_post does.
+MERGE_TAGS_SQL = """
+  INSERT INTO app.tags (slug, label, domain)
+  SELECT DISTINCT ON (w.slug) w.slug, w.label, w.domain
+  FROM (
+    SELECT app.make_slug(t.slug), COALESCE(NULLIF(btrim(t.label), ''), btrim(t.slug)),
+           CASE WHEN t.domain IN ('admin', 'user_handle', 'user_created', 'language') THEN t.domain ELSE 'user_created' END,
+           0
+    FROM import_tags t
+    UNION ALL
+    SELECT app.make_slug(tag), btrim(tag), 'user_created', 1 FROM import_post_rows p, unnest(p.tags) tag
+    UNION ALL
+    SELECT DISTINCT app.make_slug(p.handle), p.handle, 'user_handle', 2 FROM import_post_rows p
+  ) w(slug, label, domain, preference)
+  WHERE w.slug <> ''
+  ORDER BY w.slug, w.preference
+  ON CONFLICT (slug) DO NOTHING
+"""
+
+MERGE_POSTS_SQL = """
+  WITH inserted AS (
+    INSERT INTO app.posts (id, author_id, title, body_md, lang, visibility, created_at, updated_at)
+    SELECT id, author_id, title, body_md, lang, visibility, created_at, created_at FROM import_post_rows
+    ON CONFLICT (id) DO NOTHING
+    RETURNING id
+  )
+  INSERT INTO import_new_posts SELECT id FROM inserted
+"""
+
+MERGE_POST_TAGS_SQL = """
+  INSERT INTO app.post_tags (post_id, tag_id)
+  SELECT DISTINCT p.id, t.id
+  FROM import_post_rows p
+  JOIN import_new_posts n ON n.id = p.id
+  CROSS JOIN LATERAL (
+    SELECT app.make_slug(tag) FROM unnest(p.tags) tag
+    UNION SELECT app.make_slug(p.handle)
+  ) s(slug)
+  JOIN app.tags t ON t.slug = s.slug::citext AND NOT t.is_banned
+  ON CONFLICT DO NOTHING
+"""
+
+RESOLVE_REPLIES_SQL = """
+  CREATE TEMP TABLE import_reply_rows ON COMMIT DROP AS
+  SELECT DISTINCT ON (pg_temp.import_id('reply', s.id))
+         pg_temp.import_id('reply', s.id) AS id,
+         pg_temp.import_id('post', s.post_id) AS post_id,
+         CASE WHEN NULLIF(s.parent_id, '') IS NOT NULL THEN pg_temp.import_id('reply', s.parent_id) END AS parent_id,
+         a.id AS author_id,
+         s.body_md,
+         COALESCE(NULLIF(s.lang, ''), 'en') AS lang,
+         COALESCE(pg_temp.import_ts(NULLIF(s.created_at, '')), now()) AS created_at
+  FROM import_replies s
+  JOIN app.accounts a ON a.handle = btrim(s.author)::citext
+  WHERE NULLIF(s.id, '') IS NOT NULL AND NULLIF(s.post_id, '') IS NOT NULL AND s.body_md IS NOT NULL
+    AND (NULLIF(s.created_at, '') IS NULL OR pg_temp.import_ts(s.created_at) IS NOT NULL)
+    AND EXISTS (SELECT 1 FROM app.posts p WHERE p.id = pg_temp.import_id('post', s.post_id))
+  ORDER BY pg_temp.import_id('reply', s.id)
+"""
+
+# Only replies whose whole parent chain resolves (to this import or to
+# existing replies of the same post) are inserted.
+MERGE_REPLIES_SQL = """
+  WITH RECURSIVE tree AS (
+    SELECT r.* FROM import_reply_rows r
+    WHERE r.parent_id IS NULL
+       OR EXISTS (SELECT 1 FROM app.replies x WHERE x.id = r.parent_id AND x.post_id = r.post_id)
+    UNION
+    SELECT r.* FROM import_reply_rows r JOIN tree ON r.parent_id = tree.id AND r.post_id = tree.post_id
+  ), inserted AS (
+    INSERT INTO app.replies (id, post_id, parent_id, author_id, body_md, lang, created_at, updated_at)
+    SELECT id, post_id, parent_id, author_id, body_md, lang, created_at, created_at FROM tree
+    ON CONFLICT (id) DO NOTHING
+    RETURNING id, post_id
+  )
+  INSERT INTO import_new_replies SELECT id, post_id FROM inserted
+"""
+
+MERGE_VOTES_SQL = """
+  INSERT INTO app.votes (account_id, target_type, target_id, value, created_at)
+  SELECT v.account_id, v.target_type, v.target_id, v.value, v.created_at
+  FROM (
+    SELECT DISTINCT ON (a.id, s.target_type, pg_temp.import_id(s.target_type, s.target_id))
+           a.id AS account_id, s.target_type, pg_temp.import_id(s.target_type, s.target_id) AS target_id,
+           s.value::smallint AS value, COALESCE(pg_temp.import_ts(NULLIF(s.created_at, '')), now()) AS created_at
+    FROM import_votes s
+    JOIN app.accounts a ON a.handle = btrim(s.voter)::citext
+    WHERE s.target_type IN ('post', 'reply') AND NULLIF(s.target_id, '') IS NOT NULL AND s.value IN ('1', '-1')
+      AND (NULLIF(s.created_at, '') IS NULL OR pg_temp.import_ts(s.created_at) IS NOT NULL)
+    ORDER BY a.id, s.target_type, pg_temp.import_id(s.target_type, s.target_id)
+  ) v
+  WHERE (v.target_type = 'post' AND EXISTS (SELECT 1 FROM app.posts p WHERE p.id = v.target_id))
+     OR (v.target_type = 'reply' AND EXISTS (SELECT 1 FROM app.replies r WHERE r.id = v.target_id))
+  ON CONFLICT DO NOTHING
+"""
+
+# Same count the reply_count trigger keeps: every reply row of the post.
+RECOUNT_REPLIES_SQL = """
+  UPDATE app.posts p
+  SET reply_count = c.replies
+  FROM (
+    SELECT r.post_id, count(*)::int AS replies
+    FROM app.replies r
+    WHERE r.post_id IN (SELECT DISTINCT post_id FROM import_new_replies)
+    GROUP BY r.post_id
+  ) c
+  WHERE p.id = c.post_id AND p.reply_count <> c.replies
+"""
+
+REFRESH_TAG_ARRAYS_SQL = "SELECT app.refresh_post_tag_arrays(ARRAY(SELECT id FROM import_new_posts))"
+
+
+def read_records(path: Path, columns: tuple[str, ...]) -> Iterator[tuple[Optional[str], ...]]:
+    """Yield staging rows from a CSV (by extension) or NDJSON file."""
+
+    def text(value) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, list):
+            return ",".join(str(item) for item in value)
+        return str(value)
+
+    with path.open(newline="", encoding="utf-8") as stream:
+        if path.suffix.lower() == ".csv":
+            for record in csv.DictReader(stream):
+                yield tuple(text(record.get(column)) for column in columns)
+            return
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{line_number}: {exc}") from exc
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object")
+            yield tuple(text(record.get(column)) for column in columns)
+
+
+async def copy_records(cur, kind: str, path: Path) -> int:
+    columns = STAGING_COLUMNS[kind]
+    staged = 0
+    async with cur.copy(f"COPY import_{kind} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in read_records(path, columns):
+            await copy.write_row(row)
+            staged += 1
+    return staged
+
+
+async def run_import(
+    conn, files: dict[str, Path], *, source: str, create_accounts: bool, suspend_triggers: bool, dry_run: bool
+) -> dict[str, int]:
+    """Stage and merge ``files`` (kind -> path) in one transaction; returns counts.
+
+    ``suspend_triggers`` locks ``app.replies`` and ``app.post_tags`` against
+    writes until the transaction ends (see the module docstring).
+    """
+    counts: dict[str, int] = {}
+    async with conn.cursor() as cur:
+        await cur.execute("SELECT set_config('app.import_source', %s, true)", (source,))
+        await cur.execute(IMPORT_ID_FUNCTION_SQL)
+        await cur.execute(IMPORT_TS_FUNCTION_SQL)
+        for kind, columns in STAGING_COLUMNS.items():
+            await cur.execute(
+                f"CREATE TEMP TABLE import_{kind} ({', '.join(f'{c} text' for c in columns)}) ON COMMIT DROP"
+            )
+        await cur.execute("CREATE TEMP TABLE import_new_posts (id uuid PRIMARY KEY) ON COMMIT DROP")
+        await cur.execute("CREATE TEMP TABLE import_new_replies (id uuid PRIMARY KEY, post_id uuid) ON COMMIT DROP")
+
+        for kind, path in files.items():
+            counts[f"{kind}_staged"] = await copy_records(cur, kind, path)
+            logger.info("Staged %d %s from %s", counts[f"{kind}_staged"], kind, path)
+            await cur.execute(f"ANALYZE import_{kind}")
+            if "created_at" in STAGING_COLUMNS[kind]:
+                await cur.execute(COUNT_BAD_TIMESTAMPS_SQL.format(kind=kind))
+                counts[f"{kind}_bad_timestamps"] = (await cur.fetchone())[0]
+
+        if create_accounts:
+            await cur.execute(CREATE_ACCOUNTS_SQL)
+            counts["accounts_created"] = cur.rowcount
+
+        suspended: list[tuple[str, str]] = []
+        if suspend_triggers:
+            await cur.execute(
+                """
+                SELECT c.relname, t.tgname FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'app' AND NOT t.tgisinternal AND (c.relname, t.tgname) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+                """,
+                ([table for table, _ in SUSPENDED_TRIGGERS], [trigger for _, trigger in SUSPENDED_TRIGGERS]),
+            )
+            suspended = [tuple(row) for row in await cur.fetchall()]
+        for table, trigger in suspended:
+            await cur.execute(f"ALTER TABLE app.{table} DISABLE TRIGGER {trigger}")
+
+        await cur.execute(RESOLVE_POSTS_SQL)
+        await cur.execute(MERGE_TAGS_SQL)
+        counts["tags_created"] = cur.rowcount
+        await cur.execute(MERGE_POSTS_SQL)
+        counts["posts_inserted"] = cur.rowcount
+        await cur.execute(MERGE_POST_TAGS_SQL)
+        counts["post_tags_inserted"] = cur.rowcount
+        await cur.execute(RESOLVE_REPLIES_SQL)
+        await cur.execute(MERGE_REPLIES_SQL)
+        counts["replies_inserted"] = cur.rowcount
+        await cur.execute(MERGE_VOTES_SQL)
+        counts["votes_inserted"] = cur.rowcount
+
+        if ("replies", "trg_reply_count_ins") in suspended:
+            await cur.execute(RECOUNT_REPLIES_SQL)
+            counts["posts_recounted"] = cur.rowcount
+        if ("post_tags", "post_tags_refresh_arrays") in suspended:
+            await cur.execute(REFRESH_TAG_ARRAYS_SQL)
+        for table, trigger in suspended:
+            await cur.execute(f"ALTER TABLE app.{table} ENABLE TRIGGER {trigger}")
+
+    if dry_run:
+        await conn.rollback()
+    else:
+        await conn.commit()
+    return counts
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load posts, replies, tags and votes via COPY.")
+    for kind in STAGING_COLUMNS:
+        parser.add_argument(f"--{kind}", type=Path, default=None, help=f"NDJSON or .csv file of {kind}")
+    parser.add_argument("--source", default="import", help="Namespace for mapping non-UUID source ids (default: import)")
+    parser.add_argument("--create-accounts", action="store_true", help="Create accounts for unknown author/voter handles")
+    parser.add_argument(
+        "--suspend-triggers",
+        action="store_true",
+        help="Disable the reply_count/tag array triggers and recompute once; faster, but blocks all replies "
+        "and tag changes on the site until the import commits",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Merge, report the counts and roll back")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    settings = get_settings()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+    files = {kind: getattr(args, kind) for kind in STAGING_COLUMNS if getattr(args, kind) is not None}
+    if not files:
+        raise SystemExit("nothing to import: pass at least one of --tags, --posts, --replies, --votes")
+
+    async with await psycopg.AsyncConnection.connect(settings.database_url) as conn:
+        counts = await run_import(
+            conn,
+            files,
+            source=args.source,
+            create_accounts=args.create_accounts,
+            suspend_triggers=args.suspend_triggers,
+            dry_run=args.dry_run,
+        )
+        if not args.dry_run:
+            await conn.set_autocommit(True)
+            await conn.execute("ANALYZE app.posts, app.replies, app.votes, app.post_tags, app.tags")
+    for name, value in counts.items():
+        logger.info("%s: %d", name, value)
+    if args.dry_run:
+        logger.info("Dry run: rolled back")
+        return
+
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        await bump_feed_generation(redis, "content_imported")
+    finally:
+        await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Periodic maintenance of derived post columns.
+
+Run from the project root, e.g.::
+
+    python -m src.backend.app.workers.post_maintenance --interval 300
+    python -m src.backend.app.workers.post_maintenance --once
+
+Each pass recomputes ``posts.hot_rank`` for recent posts in primary-key
+batches. The ``posts_set_hot_rank`` trigger already keeps the rank current on
+votes and replies; the pass repairs rows written with triggers disabled or
+under an older formula, and only touches rows whose rank actually differs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..services.feed_cache import bump_feed_generation
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+HOT_RANK_BATCH_SIZE = 1000
+HOT_RANK_WINDOW_DAYS = 30
+_MIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+REFRESH_HOT_RANK_SQL = """
+  WITH batch AS (
+    SELECT id FROM app.posts
+    WHERE deleted_at IS NULL
+      AND created_at >= now() - make_interval(days => %s)
+      AND id > %s::uuid
+    ORDER BY id
+    LIMIT %s
+  ), updated AS (
+    UPDATE app.posts p
+    SET hot_rank = app.post_hot_rank(p.score, p.reply_count, p.created_at)
+    FROM batch
+    WHERE p.id = batch.id
+      AND p.hot_rank IS DISTINCT FROM app.post_hot_rank(p.score, p.reply_count, p.created_at)
+    RETURNING 1
+  )
+  SELECT (SELECT id::text FROM batch ORDER BY id DESC LIMIT 1), (SELECT COUNT(*) FROM updated)
+"""
+
+
+async def refresh_hot_ranks(
+    pool,
+    *,
+    window_days: int = HOT_RANK_WINDOW_DAYS,
+    batch_size: int = HOT_RANK_BATCH_SIZE,
+) -> int:
+    """Recompute stale hot ranks of posts from the last ``window_days``; returns rows changed.
+
+    Every batch commits on its own so row locks are held briefly.
+    """
+    last_id = _MIN_UUID
+    changed = 0
+    while True:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(REFRESH_HOT_RANK_SQL, (window_days, last_id, batch_size))
+                batch_last_id, batch_changed = await cur.fetchone()
+        if batch_last_id is None:
+            return changed
+        changed += int(batch_changed)
+        last_id = batch_last_id
+
+
+async def run_pass(pool, redis: Optional[Redis], *, window_days: int, batch_size: int) -> None:
+    changed = await refresh_hot_ranks(pool, window_days=window_days, batch_size=batch_size)
+    if changed:
+        logger.info("Refreshed hot_rank of %d posts", changed)
+        await bump_feed_generation(redis, "hot_rank_refresh")
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh derived post columns periodically.")
+    parser.add_argument("--interval", type=int, default=300, help="Seconds between passes")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--window-days", type=int, default=HOT_RANK_WINDOW_DAYS, help="Refresh posts created this many days back")
+    parser.add_argument("--batch-size", type=int, default=HOT_RANK_BATCH_SIZE, help="Posts per UPDATE batch")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    settings = get_settings()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+
+    redis: Optional[Redis] = Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None
+    pool = AsyncConnectionPool(conninfo=settings.database_url, max_size=2, open=False)
+    await pool.open()
+    try:
+        while True:
+            try:
+                await run_pass(pool, redis, window_days=args.window_days, batch_size=args.batch_size)
+            except Exception:  # pylint: disable=broad-except
+                if args.once:
+                    raise
+                logger.exception("Post maintenance pass failed")
+            if args.once:
+                break
+            await asyncio.sleep(args.interval)
+    finally:
+        await pool.close()
+        if redis is not None:
+            await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
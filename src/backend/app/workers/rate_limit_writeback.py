@@ -0,0 +1,73 @@
+"""Copy the Redis daily post/reply counters into ``app.rate_limits``.
+
+While Redis enforces the daily limits, ``app.rate_limits`` is only updated by
+this worker (and by the SQL fallback while Redis is down), so reports read
+counts at most one interval old. Run from the project root, e.g.::
+
+    python -m src.backend.app.workers.rate_limit_writeback --interval 60
+    python -m src.backend.app.workers.rate_limit_writeback --once
+
+Each pass writes today's and yesterday's buckets, so the last minutes of a day
+are settled after midnight.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..services.rate_limits import utc_day, write_back_counters
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+async def run_pass(pool, redis: Redis) -> int:
+    today = date.fromisoformat(utc_day())
+    written = await write_back_counters(pool, redis, [(today - timedelta(days=1)).isoformat(), today.isoformat()])
+    if written:
+        logger.info("Wrote back %d rate limit counters", written)
+    return written
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write Redis rate limit counters back to Postgres.")
+    parser.add_argument("--interval", type=int, default=60, help="Seconds between passes")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    settings = get_settings()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    pool = AsyncConnectionPool(conninfo=settings.database_url, max_size=2, open=False)
+    await pool.open()
+    try:
+        while True:
+            try:
+                await run_pass(pool, redis)
+            except Exception:  # pylint: disable=broad-except
+                if args.once:
+                    raise
+                logger.exception("Rate limit writeback pass failed")
+            if args.once:
+                break
+            await asyncio.sleep(args.interval)
+    finally:
+        await pool.close()
+        await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,215 @@
+"""Partition upkeep and retention.
+
+Run from the project root, e.g.::
+
+    python -m src.backend.app.workers.retention_maintenance --interval 3600
+    python -m src.backend.app.workers.retention_maintenance --once --drop-expired
+
+Each pass:
+
+- creates the monthly partitions of ``app.notifications`` for the next
+  ``--months-ahead`` months,
+- detaches partitions older than ``--notification-retention-months`` (kept as
+  plain ``app.notifications_pYYYY_MM`` tables for archiving, or dropped with
+  ``--drop-expired``),
+- hard-deletes posts and replies soft-deleted more than ``--purge-after-days``
+  ago, in batches, together with their votes, bookmarks and translations.
+
+Posts, replies and votes stay unpartitioned: their ids are referenced by
+foreign keys and upserts, and a partitioned table can only enforce unique keys
+that include the partition key.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..services.feed_cache import bump_feed_generation
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+PARTITIONED_TABLES = ("app.notifications",)
+PARTITION_MONTHS_AHEAD = 3
+NOTIFICATION_RETENTION_MONTHS = 6
+PURGE_AFTER_DAYS = 30
+PURGE_BATCH_SIZE = 500
+
+ENSURE_PARTITIONS_SQL = "SELECT app.ensure_month_partitions(%s::regclass, (now() AT TIME ZONE 'UTC')::date, %s)"
+RETIRE_PARTITIONS_SQL = "SELECT app.retire_month_partitions(%s::regclass, %s, %s)"
+
+# Rows that point at purged content without a foreign key.
+_PURGE_DEPENDENTS = """
+  votes_gone AS (
+    DELETE FROM app.votes v USING targets t WHERE v.target_type = t.type AND v.target_id = t.id
+  ), bookmarks_gone AS (
+    DELETE FROM app.bookmarks b USING targets t WHERE b.target_type = t.type AND b.target_id = t.id
+  ), translations_gone AS (
+    DELETE FROM app.translations x USING targets t WHERE x.source_type = t.type AND x.source_id = t.id
+  )
+"""
+
+# Purging a post cascades to its replies (and post_tags/post_media).
+PURGE_POSTS_SQL = """
+  WITH batch AS (
+    SELECT id FROM app.posts
+    WHERE deleted_at < now() - make_interval(days => %s)
+    ORDER BY deleted_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+  ), targets AS (
+    SELECT 'post' AS type, id FROM batch
+    UNION ALL
+    SELECT 'reply', r.id FROM app.replies r WHERE r.post_id IN (SELECT id FROM batch)
+  ), """ + _PURGE_DEPENDENTS + """, purged AS (
+    DELETE FROM app.posts p USING batch WHERE p.id = batch.id RETURNING 1
+  )
+  SELECT COUNT(*) FROM purged
+"""
+
+# Only leaf replies: deleting a reply cascades to its children, which may be
+# live. Parents become leaves once their children are gone and go in a later
+# batch or pass.
+PURGE_REPLIES_SQL = """
+  WITH batch AS (
+    SELECT r.id FROM app.replies r
+    WHERE r.deleted_at < now() - make_interval(days => %s)
+      AND NOT EXISTS (SELECT 1 FROM app.replies c WHERE c.parent_id = r.id)
+    ORDER BY r.deleted_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+  ), targets AS (
+    SELECT 'reply' AS type, id FROM batch
+  ), """ + _PURGE_DEPENDENTS + """, purged AS (
+    DELETE FROM app.replies r USING batch WHERE r.id = batch.id RETURNING 1
+  )
+  SELECT COUNT(*) FROM purged
+"""
+
+
+async def maintain_partitions(pool, *, months_ahead: int, retention_months: int, drop_expired: bool) -> None:
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            for table in PARTITIONED_TABLES:
+                await cur.execute(ENSURE_PARTITIONS_SQL, (table, months_ahead))
+                created = (await cur.fetchone())[0]
+                if created:
+                    logger.info("Created %d partitions of %s", created, table)
+                if retention_months <= 0:
+                    continue
+                await cur.execute(RETIRE_PARTITIONS_SQL, (table, retention_months, drop_expired))
+                for (name,) in await cur.fetchall():
+                    logger.info("%s partition %s", "Dropped" if drop_expired else "Detached", name)
+
+
+async def purge_deleted(pool, sql: str, *, after_days: int, batch_size: int) -> int:
+    """Run a purge statement batch by batch until it comes up short; returns rows purged.
+
+    Every batch commits on its own so locks are held briefly.
+    """
+    purged = 0
+    while True:
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, (after_days, batch_size))
+                batch_purged = int((await cur.fetchone())[0])
+        purged += batch_purged
+        if batch_purged < batch_size:
+            return purged
+
+
+async def run_pass(
+    pool,
+    redis: Optional[Redis],
+    *,
+    months_ahead: int,
+    retention_months: int,
+    drop_expired: bool,
+    purge_after_days: int,
+    batch_size: int,
+) -> None:
+    # A partition problem must not stop the purge; it is re-raised afterwards.
+    partition_error: Optional[Exception] = None
+    try:
+        await maintain_partitions(
+            pool, months_ahead=months_ahead, retention_months=retention_months, drop_expired=drop_expired
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        partition_error = exc
+    if purge_after_days > 0:
+        posts = await purge_deleted(pool, PURGE_POSTS_SQL, after_days=purge_after_days, batch_size=batch_size)
+        replies = await purge_deleted(pool, PURGE_REPLIES_SQL, after_days=purge_after_days, batch_size=batch_size)
+        if posts or replies:
+            logger.info("Purged %d posts and %d replies deleted over %d days ago", posts, replies, purge_after_days)
+        if replies:
+            # Purged replies lower their post's reply_count and hot_rank.
+            await bump_feed_generation(redis, "reply_purged")
+    if partition_error is not None:
+        raise partition_error
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain partitions and purge old deleted content.")
+    parser.add_argument("--interval", type=int, default=3600, help="Seconds between passes")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD, help="Monthly partitions to keep ready")
+    parser.add_argument(
+        "--notification-retention-months",
+        type=int,
+        default=NOTIFICATION_RETENTION_MONTHS,
+        help="Full months of notifications to keep before the current one (0 = keep all)",
+    )
+    parser.add_argument("--drop-expired", action="store_true", help="Drop expired partitions instead of detaching them")
+    parser.add_argument(
+        "--purge-after-days",
+        type=int,
+        default=PURGE_AFTER_DAYS,
+        help="Hard-delete posts/replies soft-deleted this many days ago (0 = never)",
+    )
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE, help="Posts or replies per DELETE batch")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    settings = get_settings()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+
+    redis: Optional[Redis] = Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None
+    pool = AsyncConnectionPool(conninfo=settings.database_url, max_size=2, open=False)
+    await pool.open()
+    try:
+        while True:
+            try:
+                await run_pass(
+                    pool,
+                    redis,
+                    months_ahead=args.months_ahead,
+                    retention_months=args.notification_retention_months,
+                    drop_expired=args.drop_expired,
+                    purge_after_days=args.purge_after_days,
+                    batch_size=args.batch_size,
+                )
+            except Exception:  # pylint: disable=broad-except
+                if args.once:
+                    raise
+                logger.exception("Retention maintenance pass failed")
+            if args.once:
+                break
+            await asyncio.sleep(args.interval)
+    finally:
+        await pool.close()
+        if redis is not None:
+            await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
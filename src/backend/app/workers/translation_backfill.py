@@ -0,0 +1,438 @@
+"""Backfill translations of every live post and reply into one language.
+
+Run from the project root, e.g.::
+
+    python -m src.backend.app.workers.translation_backfill --lang de --concurrency 4
+
+Source ids are read in primary-key order, one keyset page at a time, and
+anything already present in ``app.translations`` is skipped. Progress is
+checkpointed to a JSON file so an interrupted run resumes where it stopped.
+Failed ids are recorded in the checkpoint too and retried at the end of their
+phase, and again by the next run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..services.ai_service import split_text_into_chunks
+from ..services.language_utils import SUPPORTED_LANG_CODES, normalize_code
+from ..services.translation_queue import QUEUE_NAME, enqueue_translation_job
+from .translation_worker import SOURCE_TABLES, translate_source
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+SOURCE_ORDER = ("post", "reply")
+CHECKPOINT_DIR = Path(__file__).resolve().parents[4] / "dev" / "logs"
+PAGE_SIZE = 500
+PROGRESS_INTERVAL_SECONDS = 10
+QUEUE_POLL_SECONDS = 1
+
+
+class Checkpoint:
+    """Low-watermark of processed ids, persisted after every completed item.
+
+    Items finish out of order when running concurrently, so the stored
+    position only advances past an id once every id before it is done.
+    Failed items do not hold the position back; their ids are kept in
+    ``failed_ids`` (per source type) until a retry succeeds.
+    """
+
+    def __init__(self, path: Path, target_lang: str) -> None:
+        self.path = path
+        self.target_lang = target_lang
+        self.source_type: Optional[str] = None
+        self.last_id: Optional[str] = None
+        self.done = 0
+        self.failed = 0
+        self.failed_ids: dict[str, list[str]] = {}
+        self._pending: deque[str] = deque()
+        self._finished: set[str] = set()
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("target_lang") != self.target_lang:
+            raise RuntimeError(
+                f"Checkpoint {self.path} belongs to language {data.get('target_lang')!r}; use --restart or another --checkpoint"
+            )
+        self.source_type = data.get("source_type")
+        self.last_id = data.get("last_id")
+        self.done = int(data.get("done") or 0)
+        self.failed = int(data.get("failed") or 0)
+        self.failed_ids = {k: list(v) for k, v in (data.get("failed_ids") or {}).items() if v}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "target_lang": self.target_lang,
+                    "source_type": self.source_type,
+                    "last_id": self.last_id,
+                    "done": self.done,
+                    "failed": self.failed,
+                    "failed_ids": self.failed_ids,
+                    "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                }
+            ),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
+
+    def start_phase(self, source_type: str) -> None:
+        """Switch to ``source_type``, keeping the resume position if it is unchanged."""
+        if self.source_type != source_type:
+            self.source_type = source_type
+            self.last_id = None
+        self._pending.clear()
+        self._finished.clear()
+
+    def resume_after(self, source_type: str) -> Optional[str]:
+        return self.last_id if self.source_type == source_type else None
+
+    def dispatched(self, source_id: str) -> None:
+        self._pending.append(source_id)
+
+    def finished(self, source_id: str, ok: bool) -> None:
+        if ok:
+            self.done += 1
+        else:
+            self.failed += 1
+            self.failed_ids.setdefault(self.source_type, []).append(source_id)
+        self._finished.add(source_id)
+        advanced = False
+        while self._pending and self._pending[0] in self._finished:
+            head = self._pending.popleft()
+            self._finished.discard(head)
+            self.last_id = head
+            advanced = True
+        if advanced or not ok:
+            self.save()
+
+    def pending_retries(self) -> int:
+        return sum(len(ids) for ids in self.failed_ids.values())
+
+    def retried(self, source_type: str, source_id: str, ok: bool) -> None:
+        """Record a retry; an id leaves ``failed_ids`` once it succeeds."""
+        if not ok:
+            return
+        self.done += 1
+        self.failed = max(self.failed - 1, 0)
+        self.drop_failed(source_type, {source_id})
+
+    def drop_failed(self, source_type: str, source_ids: set[str]) -> None:
+        remaining = [i for i in self.failed_ids.get(source_type, []) if i not in source_ids]
+        if remaining:
+            self.failed_ids[source_type] = remaining
+        else:
+            self.failed_ids.pop(source_type, None)
+        self.save()
+
+
+class RateBudget:
+    """Spaces out item starts so no more than ``per_minute`` begin each minute."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class Progress:
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.processed = 0
+        self.started = time.monotonic()
+        self._last_report = 0.0
+
+    def tick(self, checkpoint: Checkpoint) -> None:
+        self.processed += 1
+        if time.monotonic() - self._last_report >= PROGRESS_INTERVAL_SECONDS:
+            self.report(checkpoint)
+
+    def report(self, checkpoint: Checkpoint) -> None:
+        now = time.monotonic()
+        self._last_report = now
+        elapsed = max(now - self.started, 1e-6)
+        rate = self.processed / elapsed
+        remaining = max(self.total - self.processed, 0)
+        eta = remaining / rate if rate > 0 else float("inf")
+        logger.info(
+            "backfill %d/%d (done=%d failed=%d) %.2f items/s, ETA %s",
+            self.processed,
+            self.total,
+            checkpoint.done,
+            checkpoint.failed,
+            rate,
+            _format_duration(eta),
+        )
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "unknown"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:d}h{minutes:02d}m{secs:02d}s"
+
+
+def _remaining_phases(checkpoint: Checkpoint) -> tuple[str, ...]:
+    if checkpoint.source_type in SOURCE_ORDER:
+        return SOURCE_ORDER[SOURCE_ORDER.index(checkpoint.source_type):]
+    return SOURCE_ORDER
+
+
+def _missing_sql(
+    source_type: str,
+    target_lang: str,
+    resume_after: Optional[str],
+    model: Optional[str],
+    source_ids: Optional[list[str]] = None,
+) -> tuple[str, list[object]]:
+    table = SOURCE_TABLES[source_type]
+    resume_condition = ""
+    model_condition = ""
+    params: list[object] = []
+    if resume_after:
+        resume_condition = " AND s.id > %s"
+        params.append(resume_after)
+    if source_ids is not None:
+        resume_condition += " AND s.id = ANY(%s::uuid[])"
+        params.append(source_ids)
+    params.extend([source_type, target_lang])
+    if model:
+        model_condition = " AND tr.model_name = %s"
+        params.append(model)
+    sql = f"""
+        SELECT s.id, s.body_md
+        FROM {table} s
+        WHERE s.deleted_at IS NULL{resume_condition}
+          AND NOT EXISTS (
+            SELECT 1 FROM app.translations tr
+            WHERE tr.source_type = %s AND tr.source_id = s.id AND tr.target_lang = %s{model_condition}
+          )
+        ORDER BY s.id
+    """
+    return sql, params
+
+
+async def count_missing(pool, target_lang: str, checkpoint: Checkpoint, model: Optional[str]) -> int:
+    total = 0
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            for source_type in _remaining_phases(checkpoint):
+                sql, params = _missing_sql(source_type, target_lang, checkpoint.resume_after(source_type), model)
+                await cur.execute(f"SELECT COUNT(*) FROM ({sql}) missing", tuple(params))
+                total += (await cur.fetchone())[0]
+    return total
+
+
+async def fetch_retries(pool, source_type: str, target_lang: str, source_ids: list[str], model: Optional[str]):
+    """Return ``(id, body_md)`` of the given ids that are still live and untranslated."""
+    sql, params = _missing_sql(source_type, target_lang, None, model, source_ids)
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(sql, tuple(params))
+            return [(str(row[0]), row[1] or "") for row in await cur.fetchall()]
+
+
+async def stream_missing(pool, source_type: str, target_lang: str, resume_after: Optional[str], model: Optional[str]):
+    """Yield ``(id, body_md)`` of untranslated rows, a keyset page at a time.
+
+    Each page is a short query of its own, so no transaction stays open while
+    the items are translated; the next page starts after the last id yielded.
+    """
+    last_id = resume_after
+    while True:
+        sql, params = _missing_sql(source_type, target_lang, last_id, model)
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql + " LIMIT %s", (*params, PAGE_SIZE))
+                rows = await cur.fetchall()
+        for row in rows:
+            last_id = str(row[0])
+            yield last_id, row[1] or ""
+        if len(rows) < PAGE_SIZE:
+            return
+
+
+async def _wait_for_queue_room(redis: Redis, max_pending: int) -> None:
+    while await redis.llen(QUEUE_NAME) >= max_pending:
+        await asyncio.sleep(QUEUE_POLL_SECONDS)
+
+
+async def run_backfill(
+    pool,
+    redis: Optional[Redis],
+    *,
+    target_lang: str,
+    checkpoint: Checkpoint,
+    concurrency: int,
+    rate_per_minute: float,
+    enqueue: bool,
+    max_pending: int,
+    model: Optional[str],
+) -> None:
+    total = await count_missing(pool, target_lang, checkpoint, model) + checkpoint.pending_retries()
+    logger.info("backfill %s: %d item(s) to process", target_lang, total)
+    progress = Progress(total)
+    budget = RateBudget(rate_per_minute)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def process(source_type: str, source_id: str, body_md: str, retry: bool = False) -> None:
+        ok = True
+        try:
+            if enqueue:
+                await _wait_for_queue_room(redis, max_pending)
+                await enqueue_translation_job(
+                    redis,
+                    source_type=source_type,
+                    source_id=source_id,
+                    target_lang=target_lang,
+                    mode="translate",
+                    metadata={
+                        "requested_by": "backfill",
+                        "chunk_count": len(split_text_into_chunks(body_md)),
+                    },
+                )
+            else:
+                await translate_source(pool, source_type, source_id, target_lang)
+        except Exception as exc:  # pylint: disable=broad-except
+            ok = False
+            logger.error("backfill failed for %s %s: %s", source_type, source_id, exc)
+        finally:
+            if retry:
+                checkpoint.retried(source_type, source_id, ok)
+            else:
+                checkpoint.finished(source_id, ok)
+            progress.tick(checkpoint)
+            semaphore.release()
+
+    async def retry_failed(source_type: str) -> None:
+        failed_ids = list(checkpoint.failed_ids.get(source_type, []))
+        if not failed_ids:
+            return
+        rows = await fetch_retries(pool, source_type, target_lang, failed_ids, model)
+        # Deleted or translated in the meantime: nothing left to retry.
+        checkpoint.drop_failed(source_type, set(failed_ids) - {source_id for source_id, _ in rows})
+        logger.info("backfill %s: retrying %d failed %s item(s)", target_lang, len(rows), source_type)
+        tasks: set[asyncio.Task] = set()
+        for source_id, body_md in rows:
+            await semaphore.acquire()
+            await budget.acquire()
+            task = asyncio.create_task(process(source_type, source_id, body_md, retry=True))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    remaining_phases = _remaining_phases(checkpoint)
+    for source_type in SOURCE_ORDER:
+        if source_type in remaining_phases:
+            checkpoint.start_phase(source_type)
+            tasks: set[asyncio.Task] = set()
+            async for source_id, body_md in stream_missing(pool, source_type, target_lang, checkpoint.last_id, model):
+                await semaphore.acquire()
+                await budget.acquire()
+                checkpoint.dispatched(source_id)
+                task = asyncio.create_task(process(source_type, source_id, body_md))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        # Phases finished by an earlier run only retry what failed there.
+        await retry_failed(source_type)
+        checkpoint.save()
+
+    progress.report(checkpoint)
+    logger.info("backfill %s finished: done=%d failed=%d", target_lang, checkpoint.done, checkpoint.failed)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Translate every live post and reply into a language.")
+    parser.add_argument("--lang", required=True, help="Target language code, e.g. de")
+    parser.add_argument("--concurrency", type=int, default=2, help="Items translated or enqueued in parallel")
+    parser.add_argument("--rate", type=float, default=0, help="Maximum items started per minute (0 = unlimited)")
+    parser.add_argument("--enqueue", action="store_true", help="Push jobs onto the Redis queue instead of translating in-process")
+    parser.add_argument("--max-pending", type=int, default=100, help="With --enqueue, pause while the queue holds this many jobs")
+    parser.add_argument("--model", default=None, help="Only treat translations produced by this model as done")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: dev/logs/translation-backfill-<lang>.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint and start over")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    target_lang = normalize_code(args.lang)
+    if target_lang not in SUPPORTED_LANG_CODES:
+        raise SystemExit(f"Unsupported language: {args.lang}")
+
+    settings = get_settings()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+    if args.enqueue and not settings.redis_url:
+        raise RuntimeError("REDIS_URL is not configured")
+
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else CHECKPOINT_DIR / f"translation-backfill-{target_lang}.json"
+    checkpoint = Checkpoint(checkpoint_path, target_lang)
+    if not args.restart:
+        checkpoint.load()
+        if checkpoint.last_id:
+            logger.info("Resuming %s after %s %s", target_lang, checkpoint.source_type, checkpoint.last_id)
+
+    redis: Optional[Redis] = None
+    if args.enqueue:
+        redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    pool = AsyncConnectionPool(
+        conninfo=settings.database_url,
+        max_size=max(args.concurrency, 1) + 2,
+        num_workers=3,
+        open=False,
+    )
+    await pool.open()
+    try:
+        await run_backfill(
+            pool,
+            redis,
+            target_lang=target_lang,
+            checkpoint=checkpoint,
+            concurrency=args.concurrency,
+            rate_per_minute=args.rate,
+            enqueue=args.enqueue,
+            max_pending=max(args.max_pending, 1),
+            model=args.model,
+        )
+    finally:
+        await pool.close()
+        if redis is not None:
+            await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
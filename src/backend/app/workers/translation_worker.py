@@ -3,21 +3,100 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Iterable, Optional
 
 from redis.asyncio import Redis
 
 from psycopg_pool import AsyncConnectionPool
 
 from ..core.config import get_settings
-from ..services.ai_service import summarize_text, translate_text
+from ..services.ai_service import CompletionUsage, DeltaCallback, summarize_text, translate_text, warm_model
+from ..services.llm_backends import BackendPool, get_backend_pool
+from ..services.model_routing import routed_models
 from ..services.translation_cache import store_translation
-from ..services.translation_queue import JOB_HASH_PREFIX, QUEUE_NAME
+from ..services.translation_metrics import (
+    record_backend_stats,
+    record_job,
+    record_keep_warm,
+    set_keep_warm_state,
+)
+from ..services.translation_queue import JOB_HASH_PREFIX, QUEUE_NAME, publish_job_event
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 SLEEP_ON_EMPTY_SECONDS = 2
+SOURCE_TABLES = {
+    "post": "app.posts",
+    "reply": "app.replies",
+}
+# Ollama unloads a model after 5 minutes without requests (its default keep_alive).
+MODEL_UNLOAD_SECONDS = 300
+
+
+class ModelActivity:
+    """Tracks queue traffic and when each model was last exercised."""
+
+    def __init__(self) -> None:
+        self.last_job_at = 0.0
+        self._last_used: Dict[str, float] = {}
+
+    def job_started(self) -> None:
+        self.last_job_at = time.monotonic()
+
+    def touch(self, model: str) -> None:
+        self._last_used[model] = time.monotonic()
+
+    def snapshot(self) -> Dict[str, float]:
+        return dict(self._last_used)
+
+    @staticmethod
+    def was_cold(snapshot: Dict[str, float], model: str, at: float) -> bool:
+        """Whether ``model`` had gone unused long enough to unload at time ``at``."""
+        last_used = snapshot.get(model)
+        return last_used is None or at - last_used > MODEL_UNLOAD_SECONDS
+
+    def has_recent_traffic(self, idle_seconds: int) -> bool:
+        return bool(self.last_job_at) and time.monotonic() - self.last_job_at <= idle_seconds
+
+
+class PartialResult:
+    """Collects streamed completion text and mirrors it to the job hash and event channel.
+
+    Writes are batched every ``FLUSH_SECONDS`` so a fast stream does not turn
+    into one Redis round trip per token.
+    """
+
+    FLUSH_SECONDS = 0.25
+
+    def __init__(self, redis: Redis, job_key: str) -> None:
+        self.redis = redis
+        self.job_key = job_key
+        self.job_id = job_key[len(JOB_HASH_PREFIX):]
+        self.text = ""
+        self._pending = ""
+        self._last_flush = 0.0
+
+    async def __call__(self, delta: str) -> None:
+        self.text += delta
+        self._pending += delta
+        if time.monotonic() - self._last_flush >= self.FLUSH_SECONDS:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, ""
+        self._last_flush = time.monotonic()
+        try:
+            await self.redis.hset(
+                self.job_key, mapping={"partial_text": self.text, "partial_chars": len(self.text)}
+            )
+            await publish_job_event(self.redis, self.job_id, {"type": "delta", "text": pending})
+        except Exception:  # pylint: disable=broad-except
+            # Progress is best effort; the final result is still stored.
+            logger.warning("Failed to publish partial result for %s", self.job_key, exc_info=True)
 
 
 async def update_job_status(
@@ -34,9 +113,17 @@ async def update_job_status(
     if extra:
         mapping.update({k: v for k, v in extra.items() if v is not None})
     await redis.hset(job_key, mapping=mapping)
+    if status == "completed":
+        # The full result replaces the streamed preview.
+        await redis.hdel(job_key, "partial_text")
+    event = {"type": "status", **{k: v for k, v in mapping.items() if k != "partial_text"}}
+    try:
+        await publish_job_event(redis, job_key[len(JOB_HASH_PREFIX):], event)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Failed to publish status for %s", job_key, exc_info=True)
 
 
-async def process_job(redis: Redis, pool, job_json: str) -> None:
+async def process_job(redis: Redis, pool, job_json: str, activity: Optional[ModelActivity] = None) -> None:
     try:
         job = json.loads(job_json)
     except json.JSONDecodeError:
@@ -63,27 +150,61 @@ async def process_job(redis: Redis, pool, job_json: str) -> None:
 
     await update_job_status(redis, job_key, status="in_progress")
 
+    # The model is only known once the handler has routed the job, so keep the
+    # pre-job view of model activity to decide afterwards whether it ran cold.
+    last_used = activity.snapshot() if activity else {}
+    if activity:
+        activity.job_started()
+    started_monotonic = time.monotonic()
+    started = time.perf_counter()
+    usage = CompletionUsage()
+    partial = PartialResult(redis, job_key)
+    ok = True
     try:
         if mode == "translate":
-            await handle_translate(redis, pool, job_key, source_type, source_id, target_lang, payload)
+            await handle_translate(redis, pool, job_key, source_type, source_id, target_lang, payload, usage, partial)
         elif mode == "summarize":
-            await handle_summarize(redis, pool, job_key, source_type, source_id, target_lang, payload)
+            await handle_summarize(redis, pool, job_key, source_type, source_id, target_lang, payload, usage, partial)
         else:
             raise ValueError(f"Unsupported job mode: {mode}")
     except Exception as exc:  # pylint: disable=broad-except
+        ok = False
         logger.exception("Translation job failed", exc_info=exc)
+        await partial.flush()
         await update_job_status(redis, job_key, status="failed", error=str(exc))
     else:
         await update_job_status(redis, job_key, status="completed")
+    finally:
+        model = usage.model or get_settings().ollama_model
+        cold = bool(activity) and ModelActivity.was_cold(last_used, model, started_monotonic)
+        if activity and model:
+            activity.touch(model)
+        try:
+            await record_job(
+                redis,
+                mode=mode,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                cold=cold,
+                ok=ok,
+                model=model,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                llm_latency_ms=usage.latency_ms if usage.calls else None,
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to record worker metrics", exc_info=True)
 
 
-async def handle_translate(redis: Redis, pool, job_key: str, source_type: str, source_id: str, target_lang: str, payload: Dict[str, Any]) -> None:
+async def load_source_text(pool, source_type: str, source_id: str) -> str:
+    table = SOURCE_TABLES.get(source_type)
+    if not table:
+        raise ValueError(f"Unsupported source type: {source_type}")
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
-                """
+                f"""
                 SELECT body_md
-                FROM app.posts
+                FROM {table}
                 WHERE id = %s AND deleted_at IS NULL
                 """,
                 (source_id,),
@@ -91,9 +212,25 @@ async def handle_translate(redis: Redis, pool, job_key: str, source_type: str, s
             row = await cur.fetchone()
             if not row:
                 raise ValueError("source not found")
-            body_md = row[0]
+            return row[0]
+
 
-    translated_text = await translate_text(body_md, target_lang)
+async def translate_source(
+    pool,
+    source_type: str,
+    source_id: str,
+    target_lang: str,
+    usage: Optional[CompletionUsage] = None,
+    on_delta: Optional[DeltaCallback] = None,
+) -> str:
+    """Translate a post or reply body and store it in ``app.translations``.
+
+    ``on_delta`` receives the translation while it streams; only the complete
+    text is written to the database, in a single transaction.
+    """
+    usage = usage if usage is not None else CompletionUsage()
+    body_md = await load_source_text(pool, source_type, source_id)
+    translated_text = await translate_text(body_md, target_lang, usage=usage, on_delta=on_delta)
     async with pool.connection() as conn:
         await store_translation(
             conn,
@@ -101,12 +238,56 @@ async def handle_translate(redis: Redis, pool, job_key: str, source_type: str, s
             source_id=source_id,
             target_lang=target_lang,
             body_trans_md=translated_text,
+            model_name=usage.model or None,
         )
         await conn.commit()
-    await update_job_status(redis, job_key, status="completed", extra={"body_trans_md": translated_text})
+    return translated_text
+
+
+def _usage_fields(usage: CompletionUsage) -> Dict[str, Any]:
+    return {
+        "model_name": usage.model or None,
+        "llm_latency_ms": round(usage.latency_ms, 1) if usage.calls else None,
+        "prompt_tokens": usage.prompt_tokens if usage.calls else None,
+        "completion_tokens": usage.completion_tokens if usage.calls else None,
+    }
 
 
-async def handle_summarize(redis: Redis, pool, job_key: str, source_type: str, source_id: str, target_lang: str, payload: Dict[str, Any]) -> None:
+async def handle_translate(
+    redis: Redis,
+    pool,
+    job_key: str,
+    source_type: str,
+    source_id: str,
+    target_lang: str,
+    payload: Dict[str, Any],
+    usage: Optional[CompletionUsage] = None,
+    partial: Optional[PartialResult] = None,
+) -> None:
+    usage = usage if usage is not None else CompletionUsage()
+    translated_text = await translate_source(pool, source_type, source_id, target_lang, usage, partial)
+    if partial is not None:
+        await partial.flush()
+    await update_job_status(
+        redis,
+        job_key,
+        status="completed",
+        extra={"body_trans_md": translated_text, **_usage_fields(usage)},
+    )
+
+
+async def handle_summarize(
+    redis: Redis,
+    pool,
+    job_key: str,
+    source_type: str,
+    source_id: str,
+    target_lang: str,
+    payload: Dict[str, Any],
+    usage: Optional[CompletionUsage] = None,
+    partial: Optional[PartialResult] = None,
+) -> None:
+    usage = usage if usage is not None else CompletionUsage()
     source_text = payload.get("source_text")
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
@@ -126,7 +307,9 @@ async def handle_summarize(redis: Redis, pool, job_key: str, source_type: str, s
                     raise ValueError("source not found")
                 body_md = row[0]
 
-    summary = await summarize_text(body_md, target_lang)
+    summary = await summarize_text(body_md, target_lang, usage=usage, on_delta=partial)
+    if partial is not None:
+        await partial.flush()
     async with pool.connection() as conn:
         existing_body_trans: str | None = None
         async with conn.cursor() as cur:
@@ -152,12 +335,80 @@ async def handle_summarize(redis: Redis, pool, job_key: str, source_type: str, s
             target_lang=target_lang,
             body_trans_md=body_for_storage,
             summary_md=summary,
+            model_name=usage.model or None,
         )
         await conn.commit()
-    await update_job_status(redis, job_key, status="completed", extra={"summary_md": summary})
+    await update_job_status(
+        redis,
+        job_key,
+        status="completed",
+        extra={"summary_md": summary, **_usage_fields(usage)},
+    )
+
+
+def keep_warm_models() -> list[str]:
+    return routed_models()
+
+
+async def keep_warm_loop(
+    redis: Redis,
+    activity: ModelActivity,
+    *,
+    interval_seconds: int,
+    idle_seconds: int,
+    models: Iterable[str],
+) -> None:
+    """Ping each model every ``interval_seconds`` while jobs arrived within ``idle_seconds``."""
+    models = list(dict.fromkeys(m for m in models if m))
+    active = False
+    while True:
+        await asyncio.sleep(interval_seconds)
+        should_run = activity.has_recent_traffic(idle_seconds)
+        if should_run != active:
+            active = should_run
+            logger.info("Keep-warm %s", "resumed" if active else "paused: queue idle")
+            try:
+                await set_keep_warm_state(redis, active)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Failed to record keep-warm state", exc_info=True)
+        if not active:
+            continue
+        # Every backend loads models independently, so each healthy one is pinged.
+        backend_pool = get_backend_pool()
+        backend_urls: list[Optional[str]] = (
+            [b.url for b in backend_pool.backends if b.healthy] if backend_pool else []
+        ) or [None]
+        for model in models:
+            for backend_url in backend_urls:
+                latency_ms: Optional[float] = None
+                try:
+                    latency_ms = await warm_model(model, backend_url=backend_url)
+                    activity.touch(model)
+                    ok = True
+                except Exception as exc:  # pylint: disable=broad-except
+                    ok = False
+                    logger.warning("Keep-warm ping for %s on %s failed: %s", model, backend_url or "default backend", exc)
+                try:
+                    await record_keep_warm(redis, model=model, latency_ms=latency_ms, ok=ok)
+                except Exception:  # pylint: disable=broad-except
+                    logger.warning("Failed to record keep-warm metrics", exc_info=True)
 
 
-async def worker_loop(redis: Redis, pool: AsyncConnectionPool) -> None:
+async def backend_health_loop(redis: Redis, backend_pool: BackendPool, *, interval_seconds: int) -> None:
+    """Probe LLM backends so failed ones leave and recovered ones rejoin the rotation."""
+    while True:
+        try:
+            await backend_pool.check()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("LLM backend health check failed", exc_info=True)
+        try:
+            await record_backend_stats(redis, backend_pool)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to record LLM backend metrics", exc_info=True)
+        await asyncio.sleep(interval_seconds)
+
+
+async def worker_loop(redis: Redis, pool: AsyncConnectionPool, activity: Optional[ModelActivity] = None) -> None:
     while True:
         try:
             result = await redis.brpop(QUEUE_NAME, timeout=10)
@@ -165,7 +416,7 @@ async def worker_loop(redis: Redis, pool: AsyncConnectionPool) -> None:
                 await asyncio.sleep(SLEEP_ON_EMPTY_SECONDS)
                 continue
             _, job_json = result
-            await process_job(redis, pool, job_json)
+            await process_job(redis, pool, job_json, activity)
         except Exception as exc:  # pylint: disable=broad-except
             logger.exception("Worker error", exc_info=exc)
             await asyncio.sleep(5)
@@ -182,10 +433,34 @@ async def main() -> None:
     pool = AsyncConnectionPool(conninfo=settings.database_url, max_size=10, num_workers=3, open=False)
     await pool.open()
 
+    activity = ModelActivity()
+    keep_warm_task: Optional[asyncio.Task] = None
+    if settings.ollama_keep_warm_seconds > 0:
+        keep_warm_task = asyncio.create_task(
+            keep_warm_loop(
+                redis,
+                activity,
+                interval_seconds=settings.ollama_keep_warm_seconds,
+                idle_seconds=settings.ollama_keep_warm_idle_seconds,
+                models=keep_warm_models(),
+            )
+        )
+
+    health_task: Optional[asyncio.Task] = None
+    backend_pool = get_backend_pool()
+    if backend_pool is not None and settings.ollama_health_interval_seconds > 0:
+        health_task = asyncio.create_task(
+            backend_health_loop(redis, backend_pool, interval_seconds=settings.ollama_health_interval_seconds)
+        )
+
     # logger.info("Translation worker started")
     try:
-        await worker_loop(redis, pool)
+        await worker_loop(redis, pool, activity)
     finally:
+        if keep_warm_task is not None:
+            keep_warm_task.cancel()
+        if health_task is not None:
+            health_task.cancel()
         await pool.close()
 
 
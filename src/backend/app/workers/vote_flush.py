@@ -0,0 +1,84 @@
+"""Flush votes buffered in Redis into ``app.votes``.
+
+Only needed with ``VOTE_BUFFER_ENABLED=true``. Run from the project root, e.g.::
+
+    python -m src.backend.app.workers.vote_flush --interval 2
+    python -m src.backend.app.workers.vote_flush --once
+
+Each batch is one multi-row INSERT; the statement-level vote triggers turn it
+into one score update per voted target, so scores trail the votes by about
+one interval. Run a single instance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..services.feed_cache import bump_feed_generation
+from ..services.vote_buffer import flush_vote_buffer
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+VOTE_FLUSH_BATCH_SIZE = 500
+
+
+async def run_pass(pool, redis: Redis, *, batch_size: int) -> int:
+    """Drain the buffer batch by batch; returns votes inserted."""
+    inserted_total = 0
+    post_voted = False
+    while True:
+        taken, inserted, batch_post_voted = await flush_vote_buffer(pool, redis, batch_size)
+        inserted_total += inserted
+        post_voted = post_voted or batch_post_voted
+        if taken < batch_size:
+            break
+    if inserted_total:
+        logger.info("Flushed %d buffered votes", inserted_total)
+    if post_voted:
+        await bump_feed_generation(redis, "post_voted")
+    return inserted_total
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Flush buffered votes into Postgres.")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between passes")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--batch-size", type=int, default=VOTE_FLUSH_BATCH_SIZE, help="Votes per INSERT")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    settings = get_settings()
+    if not settings.database_url:
+        raise RuntimeError("DATABASE_URL is not configured")
+
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    pool = AsyncConnectionPool(conninfo=settings.database_url, max_size=2, open=False)
+    await pool.open()
+    try:
+        while True:
+            try:
+                await run_pass(pool, redis, batch_size=args.batch_size)
+            except Exception:  # pylint: disable=broad-except
+                if args.once:
+                    raise
+                logger.exception("Vote flush pass failed")
+            if args.once:
+                break
+            await asyncio.sleep(args.interval)
+    finally:
+        await pool.close()
+        await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
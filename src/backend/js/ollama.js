@@ -1,59 +1,151 @@
 // ollama.js – OpenAI-kompatibler API-Aufruf für Open-WebUI
 
-export async function checkWithOllama(sequence) {
+const SYSTEM_PROMPT = "You are the SoulTribe Match Annotator. Given compact match details (users, score, and a short breakdown), write a concise, friendly, plain-text comment (1–2 sentences) that explains the compatibility in simple terms. Mention strong points first. If the score is modest, be encouraging. Do not include JSON or additional formatting—just the comment.";
+
+function resolveEndpoint(base) {
+    const normalizedBase = base.replace(/\/$/, "");
+    if (/\/api\/openai$/i.test(normalizedBase)) {
+        return `${normalizedBase}/v1/chat/completions`;
+    }
+    if (/\/api$/i.test(normalizedBase)) {
+        return `${normalizedBase}/chat/completions`;
+    }
+    return `${normalizedBase}/api/chat/completions`;
+}
+
+function buildRequest(sequence, stream) {
     const prompt = sequence.join(" ");
 
     const BASE = process.env.OLLAMA_BASE || process.env.OPENAI_BASE_URL || "https://at1.dynproxy.net";
     const API_KEY = process.env.OLLAMA_API_KEY || process.env.OPENAI_API_KEY || "";
     const MODEL = process.env.OLLAMA_MODEL || "gemma3:1b";
 
-    try {
-        const normalizedBase = BASE.replace(/\/$/, "");
-        let endpoint;
-        if (/\/api\/openai$/i.test(normalizedBase)) {
-            endpoint = `${normalizedBase}/v1/chat/completions`;
-        } else if (/\/api$/i.test(normalizedBase)) {
-            endpoint = `${normalizedBase}/chat/completions`;
-        } else {
-            endpoint = `${normalizedBase}/api/chat/completions`;
-        }
-        const response = await fetch(endpoint, {
+    const endpoint = resolveEndpoint(BASE);
+    const body = {
+        model: MODEL,
+        messages: [
+          { role: "system", content: SYSTEM_PROMPT },
+          { role: "user", content: prompt }
+        ],
+        stream
+    };
+    if (stream) {
+        // OpenAI-kompatible Server senden die Token-Zahlen sonst nicht im Stream
+        body.stream_options = { include_usage: true };
+    }
+    return {
+        endpoint,
+        model: MODEL,
+        init: {
             method: "POST",
             headers: {
                 "Content-Type": "application/json",
                 ...(API_KEY ? { "Authorization": `Bearer ${API_KEY}` } : {})
             },
-            body: JSON.stringify({
-                model: MODEL,
-                messages: [
-                  {
-                    role: "system",
-                    content: "You are the SoulTribe Match Annotator. Given compact match details (users, score, and a short breakdown), write a concise, friendly, plain-text comment (1–2 sentences) that explains the compatibility in simple terms. Mention strong points first. If the score is modest, be encouraging. Do not include JSON or additional formatting—just the comment."
-                  },
-                  { role: "user", content: prompt }
-                ],
-                stream: false
-            })
-        });
-
-        if (!response.ok) {
-            let errorText = "";
-            try {
-                errorText = await response.text();
-            } catch (readErr) {
-                errorText = String(readErr);
-            }
-        console.error(`Ollama API Error (${response.status} @ ${endpoint}):`, errorText);
-            const detail = errorText ? ` ${errorText}` : "";
-            return `(Fehler beim LLM-Request: ${response.status}${detail})`;
+            body: JSON.stringify(body)
+        }
+    };
+}
+
+async function ensureOk(response, endpoint) {
+    if (response.ok) {
+        return;
+    }
+    let errorText = "";
+    try {
+        errorText = await response.text();
+    } catch (readErr) {
+        errorText = String(readErr);
+    }
+    console.error(`Ollama API Error (${response.status} @ ${endpoint}):`, errorText);
+    const error = new Error(`Ollama API Error (${response.status} @ ${endpoint}): ${errorText}`);
+    error.status = response.status;
+    error.detail = errorText;
+    throw error;
+}
+
+// Führt eine Chat-Completion aus und liefert { content, model, usage }.
+// Wirft bei HTTP- oder Verbindungsfehlern, damit Aufrufer sie erkennen können.
+export async function chatCompletion(sequence) {
+    const { endpoint, model, init } = buildRequest(sequence, false);
+    const response = await fetch(endpoint, init);
+    await ensureOk(response, endpoint);
+
+    const data = await response.json();
+    return {
+        content: data.choices?.[0]?.message?.content?.trim() || "",
+        model: data.model || model,
+        usage: {
+            prompt_tokens: data.usage?.prompt_tokens ?? null,
+            completion_tokens: data.usage?.completion_tokens ?? null,
+        },
+    };
+}
+
+// Gestreamte Variante: ruft onDelta(text) für jedes empfangene Token-Stück auf
+// und liefert am Ende dasselbe { content, model, usage } wie chatCompletion.
+// Versteht SSE ("data: {...}") der OpenAI-API und NDJSON der nativen Ollama-API.
+export async function chatCompletionStream(sequence, onDelta) {
+    const { endpoint, model, init } = buildRequest(sequence, true);
+    const response = await fetch(endpoint, init);
+    await ensureOk(response, endpoint);
+
+    const result = {
+        content: "",
+        model,
+        usage: { prompt_tokens: null, completion_tokens: null },
+    };
+    const handleLine = (rawLine) => {
+        let line = rawLine.trim();
+        if (!line || line.startsWith(":")) return;
+        if (line.startsWith("data:")) line = line.slice(5).trim();
+        if (line === "[DONE]") return;
+        let event;
+        try {
+            event = JSON.parse(line);
+        } catch (e) {
+            return;
+        }
+        const delta = event.choices?.[0]?.delta?.content ?? event.message?.content ?? "";
+        if (event.model) result.model = event.model;
+        if (event.usage) {
+            result.usage.prompt_tokens = event.usage.prompt_tokens ?? result.usage.prompt_tokens;
+            result.usage.completion_tokens = event.usage.completion_tokens ?? result.usage.completion_tokens;
+        } else if (event.done && event.eval_count !== undefined) {
+            result.usage.prompt_tokens = event.prompt_eval_count ?? null;
+            result.usage.completion_tokens = event.eval_count ?? null;
+        }
+        if (delta) {
+            result.content += delta;
+            onDelta(delta);
         }
+    };
 
-        const data = await response.json();
-        return data.choices?.[0]?.message?.content?.trim() || "(keine Antwort vom Modell)";
+    const decoder = new TextDecoder();
+    let buffered = "";
+    for await (const part of response.body) {
+        buffered += decoder.decode(part, { stream: true });
+        let newline;
+        while ((newline = buffered.indexOf("\n")) >= 0) {
+            handleLine(buffered.slice(0, newline));
+            buffered = buffered.slice(newline + 1);
+        }
+    }
+    handleLine(buffered + decoder.decode());
+    result.content = result.content.trim();
+    return result;
+}
 
+export async function checkWithOllama(sequence) {
+    try {
+        const result = await chatCompletion(sequence);
+        return result.content || "(keine Antwort vom Modell)";
     } catch (error) {
+        if (error?.status) {
+            const detail = error.detail ? ` ${error.detail}` : "";
+            return `(Fehler beim LLM-Request: ${error.status}${detail})`;
+        }
         console.error("LLM-Request fehlgeschlagen:", error);
         return `(Verbindungsfehler mit Ollama: ${error?.message || error})`;
     }
 }
-
@@ -1,11 +1,14 @@
 #!/usr/bin/env node
-import { checkWithOllama } from './ollama.js';
+import { chatCompletion, chatCompletionStream, checkWithOllama } from './ollama.js';
 
 async function main() {
   try {
-    const arg = process.argv[2];
+    const args = process.argv.slice(2);
+    const streamOutput = args[0] === '--stream';
+    const jsonOutput = args[0] === '--json' || streamOutput;
+    const arg = jsonOutput ? args[1] : args[0];
     if (!arg) {
-      console.error('Usage: node dev/ollama_cli.mjs <json_sequence_array>');
+      console.error('Usage: node dev/ollama_cli.mjs [--json|--stream] <json_sequence_array>');
       process.exit(2);
     }
     let seq;
@@ -16,6 +19,31 @@ async function main() {
       console.error('Invalid sequence JSON:', e.message);
       process.exit(2);
     }
+    if (streamOutput) {
+      // NDJSON mode: one {"delta": "..."} line per received token chunk, then
+      // {"done": true, content, model, usage}; non-zero exit on failure
+      try {
+        const result = await chatCompletionStream(seq, (delta) => {
+          process.stdout.write(JSON.stringify({ delta }) + '\n');
+        });
+        process.stdout.write(JSON.stringify({ done: true, ...result }) + '\n');
+      } catch (e) {
+        console.error(e?.message || String(e));
+        process.exit(1);
+      }
+      return;
+    }
+    if (jsonOutput) {
+      // Machine-readable mode: content plus model and token usage, non-zero exit on failure
+      try {
+        const result = await chatCompletion(seq);
+        process.stdout.write(JSON.stringify(result) + '\n');
+      } catch (e) {
+        console.error(e?.message || String(e));
+        process.exit(1);
+      }
+      return;
+    }
     const out = await checkWithOllama(seq);
     process.stdout.write(String(out).trim() + '\n');
   } catch (e) {
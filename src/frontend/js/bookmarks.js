@@ -3,6 +3,7 @@ import { showToast } from './toast.js';
 
 const toggleRegistry = new Map(); // key -> Set<HTMLButtonElement>
 const bookmarkState = new Map(); // key -> { bookmarkId, tags, createdAt }
+const seededKeys = new Set(); // keys whose state came with the page; not looked up
 let listenerBound = false;
 
 const KEY_DELIMITER = '::';
@@ -170,6 +171,23 @@ async function fetchStateForType(targetType, ids) {
   }
 }
 
+// Preload the state of one target (e.g. from GET /posts/{id}/full) so
+// initBookmarkToggles does not look it up. `bookmark` is null when not bookmarked.
+export function seedBookmarkState(targetType, targetId, bookmark) {
+  const key = keyFrom(String(targetType).toLowerCase(), targetId);
+  if (bookmark) {
+    bookmarkState.set(key, {
+      bookmarkId: bookmark.bookmark_id || '',
+      tags: Array.isArray(bookmark.tags) ? bookmark.tags : [],
+      createdAt: bookmark.created_at || null,
+    });
+  } else {
+    bookmarkState.delete(key);
+  }
+  seededKeys.add(key);
+  applyStateToToggles(key);
+}
+
 export async function initBookmarkToggles(root = document) {
   ensureListener();
   const toggles = Array.from(root.querySelectorAll('.bookmark-toggle'));
@@ -180,6 +198,7 @@ export async function initBookmarkToggles(root = document) {
     const info = registerToggle(btn);
     if (!info) return;
     applyStateToToggles(info.key);
+    if (seededKeys.has(info.key)) return;
     if (!grouped.has(info.type)) {
       grouped.set(info.type, new Set());
     }